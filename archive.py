@@ -0,0 +1,208 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import array
+import math
+import multiprocessing
+import os
+import sys
+import time
+from clientraw import ClientRaw
+from schema import parse_value
+
+# Columns hold each field's number in clientraw's own units (knots, celsius, hectopascals, millimetres) rather than
+# measure objects, so int fields go into 64 bit int arrays and everything else into double arrays
+TYPECODES = {int: "q", float: "d"}
+MISSING_VALUES = {int: 0, float: math.nan}
+MINIMUM_INT = -2 ** 63
+MAXIMUM_INT = 2 ** 63 - 1
+
+# Snapshots are ordered by the station's own clock, packed as YYYYMMDDhhmmss
+TIMESTAMP_FIELDS = [(ClientRaw.YEAR, 10000000000), (ClientRaw.MONTH, 100000000), (ClientRaw.DAY, 1000000),
+                    (ClientRaw.HOUR, 10000), (ClientRaw.MINUTE, 100), (ClientRaw.SECOND, 1)]
+
+FILES_PER_TASK = 500
+
+
+class ClientRawColumns:
+
+    def __init__(self, fields=None):
+        if fields is None:
+            fields = ClientRaw.get_fields()
+        self.__fields = list(fields)
+        self.__columns = {field: array.array(TYPECODES[field.value_type]) for field in self.__fields}
+        self.__masks = {field: bytearray() for field in self.__fields}
+        self.__timestamps = array.array("q")
+        self.__length = 0
+        self.__rejected = 0
+
+    def get_fields(self):
+        return list(self.__fields)
+
+    def get_length(self):
+        return self.__length
+
+    def get_rejected(self):
+        return self.__rejected
+
+    def get_timestamps(self):
+        return self.__timestamps
+
+    def get_column(self, field):
+        return self.__columns[field]
+
+    def get_mask(self, field):
+        # 1 where the snapshot held a usable value for the field, 0 where it was missing or malformed
+        return self.__masks[field]
+
+    def add(self, content):
+        if isinstance(content, str):
+            content = content.encode("UTF-8")
+        # Snapshots are judged exactly as the display judges clientraw.txt, once the line ending is dropped
+        clientraw = ClientRaw(content.rstrip(b"\r\n"))
+        if not clientraw.is_valid():
+            self.__rejected += 1
+            return False
+
+        # Everything is parsed before anything is appended so a bad snapshot can never leave the columns out of step
+        values = [self.__parse(field, clientraw) for field in self.__fields]
+        timestamp = self.__get_timestamp(clientraw)
+        for field, value in zip(self.__fields, values):
+            if value is None:
+                self.__columns[field].append(MISSING_VALUES[field.value_type])
+                self.__masks[field].append(0)
+            else:
+                self.__columns[field].append(value)
+                self.__masks[field].append(1)
+        self.__timestamps.append(timestamp)
+        self.__length += 1
+        return True
+
+    def extend(self, other):
+        for field in self.__fields:
+            self.__columns[field].extend(other.__columns[field])
+            self.__masks[field].extend(other.__masks[field])
+        self.__timestamps.extend(other.__timestamps)
+        self.__length += other.__length
+        self.__rejected += other.__rejected
+
+    def sort(self):
+        # Stable so snapshots sharing a timestamp keep the order they were loaded in
+        order = sorted(range(self.__length), key=self.__timestamps.__getitem__)
+        for field in self.__fields:
+            column = self.__columns[field]
+            mask = self.__masks[field]
+            self.__columns[field] = array.array(column.typecode, [column[index] for index in order])
+            self.__masks[field] = bytearray([mask[index] for index in order])
+        self.__timestamps = array.array("q", [self.__timestamps[index] for index in order])
+
+    def add_stream(self, stream):
+        # Each snapshot is a single line so a stream may hold any number of them back to back
+        for line in stream:
+            if line.strip():
+                self.add(line)
+
+    def add_files(self, file_paths):
+        for file_path in file_paths:
+            with open(file_path, "rb") as archive_file:
+                self.add_stream(archive_file)
+
+    def add_directory(self, path):
+        self.add_files(list_files(path))
+
+    def __parse(self, field, clientraw):
+        # Parsed without the field's measure since the columns hold plain numbers
+        value = parse_value(clientraw.get_raw_field(field), field.value_type, missing=field.missing)
+        # Anything too big for an int column is as unusable as a malformed value
+        if value is not None and field.value_type is int and not MINIMUM_INT <= value <= MAXIMUM_INT:
+            return None
+        return value
+
+    def __get_timestamp(self, clientraw):
+        timestamp = 0
+        for field, scale in TIMESTAMP_FIELDS:
+            value = parse_value(clientraw.get_raw_field(field), int)
+            if value is not None:
+                timestamp += value * scale
+        if not MINIMUM_INT <= timestamp <= MAXIMUM_INT:
+            return 0
+        return timestamp
+
+
+def list_files(path):
+    file_paths = [os.path.join(path, file_name) for file_name in sorted(os.listdir(path))]
+    return [file_path for file_path in file_paths if os.path.isfile(file_path)]
+
+
+def load_stream(stream, fields=None):
+    columns = ClientRawColumns(fields)
+    columns.add_stream(stream)
+    return columns
+
+
+def load_directory(path, fields=None):
+    columns = ClientRawColumns(fields)
+    columns.add_directory(path)
+    return columns
+
+
+def load_files(file_paths, fields=None):
+    columns = ClientRawColumns(fields)
+    columns.add_files(file_paths)
+    return columns
+
+
+def load_directory_parallel(path, fields=None, processes=None, progress=None, files_per_task=FILES_PER_TASK):
+    # Files are handed out in batches so each worker process builds up its own columns and only the finished
+    # columns are sent back, which are then merged and put back into timestamp order
+    file_paths = list_files(path)
+    tasks = [(file_paths[start:start + files_per_task], fields) for start in range(0, len(file_paths), files_per_task)]
+    columns = ClientRawColumns(fields)
+    loaded_files = 0
+    with multiprocessing.Pool(processes) as pool:
+        for task, partial_columns in zip(tasks, pool.imap(load_files_task, tasks)):
+            columns.extend(partial_columns)
+            loaded_files += len(task[0])
+            if progress is not None:
+                progress(loaded_files, len(file_paths))
+    columns.sort()
+    return columns
+
+
+def load_files_task(task):
+    return load_files(*task)
+
+
+class ProgressReport:
+
+    def __init__(self, output=sys.stderr, clock=time.monotonic):
+        self.__output = output
+        self.__clock = clock
+        self.__start_time = clock()
+
+    def __call__(self, loaded_files, total_files):
+        print(str(loaded_files) + "/" + str(total_files) + " files, " +
+              "{:.0f}".format(self.get_rate(loaded_files)) + " files/s", file=self.__output)
+
+    def get_rate(self, loaded_files):
+        elapsed_secs = self.__clock() - self.__start_time
+        if elapsed_secs <= 0:
+            return 0.0
+        return loaded_files / elapsed_secs
+
+
+if __name__ == '__main__':
+
+    # Back-fills an archive directory of clientraw snapshots, e.g. python3 archive.py /mnt/weather/archive 4
+    if len(sys.argv) < 2:
+        print("usage: archive.py [archive directory] [processes]")
+        sys.exit(1)
+
+    progress_report = ProgressReport()
+    archive_columns = load_directory_parallel(sys.argv[1], processes=int(sys.argv[2]) if len(sys.argv) > 2 else None,
+                                              progress=progress_report)
+    archive_timestamps = archive_columns.get_timestamps()
+    print(str(archive_columns.get_length()) + " snapshots loaded, " + str(archive_columns.get_rejected()) +
+          " rejected")
+    if len(archive_timestamps) > 0:
+        print("from " + str(archive_timestamps[0]) + " to " + str(archive_timestamps[-1]))
@@ -7,170 +7,225 @@ from measures import Temperature
 from measures import Trend
 from measures import WindDirection
 from measures import WindSpeed
+from schema import ClientRawField
+from schema import get_fields
+from schema import get_series
+from tokenizer import ClientRawTokenizer
 
 
-class ClientRaw:
+def to_trend(trend):
+    if trend < 0:
+        return Trend.FALLING
+    elif trend > 0:
+        return Trend.RISING
+    else:
+        return Trend.STEADY
 
-    VALID_HEADER_VALUE = "12345"
-    HEADER = 0
-    AVERAGE_WIND_SPEED_KNOTS = 1
-    GUST_SPEED_KNOTS = 2
-    WIND_DIRECTION_COMPASS_DEGREES = 3
-    OUTDOOR_TEMPERATURE_CELSIUS = 4
-    OUTDOOR_HUMIDITY = 5
-    SURFACE_PRESSURE_HECTOPASCALS = 6
-    DAILY_RAINFALL_MILLIMETRES = 7
-    RAINFALL_RATE_MILLIMETRES_PER_MINUTE = 10
-    INDOOR_TEMPERATURE_CELSIUS = 12
-    INDOOR_HUMIDITY = 13
-    FORECAST = 15
-    HOUR = 29
-    MINUTE = 30
-    WIND_CHILL_CELSIUS = 44
-    HUMIDEX_CELSIUS = 45
-    SURFACE_PRESSURE_TREND = 50
-    DEW_POINT_CELSIUS = 72
-    UV_INDEX = 79
-    HEAT_INDEX_CELSIUS = 112
-    OUTDOOR_TEMPERATURE_TREND = 143
-    OUTDOOR_HUMIDITY_TREND = 144
 
-    FORECASTS = ["Sunny", "Clear Night", "Cloudy", "Cloudy", "Cloudy Night", "Dry Clear", "Fog", "Hazy", "Heavy Rain",
-                 "Mainly Fine", "Misty", "Night Fog", "Night Heavy Rain", "Night Overcast", "Night Rain",
-                 "Night Showers", "Night Snow", "Night Thunder", "Overcast", "Partly Cloudy", "Rain", "Hard Rain",
-                 "Showers", "Sleet", "Sleet Showers", "Snow", "Snow Melt", "Snow Showers", "Sunny", "Thunder Showers",
-                 "Thunder Showers", "Thunderstorms", "Tornado Warning", "Windy", "Stopped Raining", "Windy Rain"]
+def to_forecast(forecast_icon):
+    if forecast_icon < len(ClientRaw.FORECASTS):
+        return ClientRaw.FORECASTS[forecast_icon]
+
+
+class ClientRawFile:
+
+    # Common to clientraw.txt and its sibling files, which all share the same header, separator and trailer
+
+    VALID_HEADER_VALUE = b"12345"
+    TRAILER_MARKER = b"!!"
+    HEADER = 0
 
     def __init__(self, clientraw):
-        if len(clientraw) == 0:
-            self.__fields = []
-        else:
-            self.__fields = clientraw.split(' ')
+        # Fields are located and converted on demand rather than splitting all of the fields up front
+        self.__tokenizer = ClientRawTokenizer(clientraw)
+        self.__values = {}
+
+    @classmethod
+    def get_fields(cls):
+        return get_fields(cls)
+
+    @classmethod
+    def get_series(cls):
+        return get_series(cls)
 
     def is_empty(self):
-        return len(self.__fields) == 0
+        return not self.__tokenizer.has_field(0)
 
     def is_valid(self):
-        if len(self.__fields) > self.HEADER:
-            return self.__get_field_value_as_string(self.HEADER) == self.VALID_HEADER_VALUE
+        return self.__tokenizer.get_raw_field(self.HEADER) == self.VALID_HEADER_VALUE
+
+    def is_complete(self):
+        # Weather Display ends each file with its version wrapped in markers, e.g. !!C10.37S142!!, so a file
+        # read while it is being rewritten is missing them
+        trailer = self.__tokenizer.get_last_raw_field()
+        if trailer is not None:
+            trailer = bytes(trailer).rstrip()
+            return len(trailer) >= 2 * len(self.TRAILER_MARKER) and\
+                trailer.startswith(self.TRAILER_MARKER) and trailer.endswith(self.TRAILER_MARKER)
         else:
             return False
 
+    def diff(self, other, fields=None):
+        # Compares the raw text of each field so nothing needs to be parsed to find out what changed
+        if fields is None:
+            fields = range(0, max(self.__tokenizer.get_field_count(), other.__tokenizer.get_field_count()))
+        return {int(field) for field in fields
+                if self.__tokenizer.get_raw_field(field) != other.__tokenizer.get_raw_field(field)}
+
+    def get_raw_field(self, field):
+        return self.__tokenizer.get_raw_field(field)
+
+    def get_value(self, field):
+        # Each field is parsed at most once per snapshot since every page render asks for the same few again
+        try:
+            return self.__values[field]
+        except KeyError:
+            value = field.parse(self.__tokenizer.get_raw_field(field))
+            self.__values[field] = value
+            return value
+
+    def get_values(self, series):
+        try:
+            return self.__values[series]
+        except KeyError:
+            values = series.parse(self.__tokenizer.iter_raw_fields(series.start, series.length))
+            self.__values[series] = values
+            return values
+
+
+class ClientRaw(ClientRawFile):
+
+    AVERAGE_WIND_SPEED_KNOTS = ClientRawField(1, float, WindSpeed.interned)
+    GUST_SPEED_KNOTS = ClientRawField(2, float, WindSpeed.interned)
+    WIND_DIRECTION_COMPASS_DEGREES = ClientRawField(3, int, WindDirection.interned)
+    OUTDOOR_TEMPERATURE_CELSIUS = ClientRawField(4, float, Temperature.interned)
+    OUTDOOR_HUMIDITY = ClientRawField(5, int)
+    SURFACE_PRESSURE_HECTOPASCALS = ClientRawField(6, float, Pressure.interned)
+    DAILY_RAINFALL_MILLIMETRES = ClientRawField(7, float, Rainfall.interned)
+    MONTHLY_RAINFALL_MILLIMETRES = ClientRawField(8, float, Rainfall.interned)
+    YEARLY_RAINFALL_MILLIMETRES = ClientRawField(9, float, Rainfall.interned)
+    RAINFALL_RATE_MILLIMETRES_PER_MINUTE = ClientRawField(10, float, Rainfall.interned)
+    MAXIMUM_RAINFALL_RATE_MILLIMETRES_PER_MINUTE = ClientRawField(11, float, Rainfall.interned)
+    INDOOR_TEMPERATURE_CELSIUS = ClientRawField(12, float, Temperature.interned)
+    INDOOR_HUMIDITY = ClientRawField(13, int)
+    FORECAST = ClientRawField(15, int, to_forecast)
+    YESTERDAY_RAINFALL_MILLIMETRES = ClientRawField(19, float, Rainfall.interned)
+    HOUR = ClientRawField(29, int)
+    MINUTE = ClientRawField(30, int)
+    SECOND = ClientRawField(31, int)
+    DAY = ClientRawField(35, int)
+    MONTH = ClientRawField(36, int)
+    WIND_CHILL_CELSIUS = ClientRawField(44, float, Temperature.interned)
+    HUMIDEX_CELSIUS = ClientRawField(45, float, Temperature.interned)
+    MAXIMUM_OUTDOOR_TEMPERATURE_CELSIUS = ClientRawField(46, float, Temperature.interned)
+    MINIMUM_OUTDOOR_TEMPERATURE_CELSIUS = ClientRawField(47, float, Temperature.interned)
+    SURFACE_PRESSURE_TREND = ClientRawField(50, float, to_trend)
+    MAXIMUM_GUST_SPEED_KNOTS = ClientRawField(71, float, WindSpeed.interned)
+    DEW_POINT_CELSIUS = ClientRawField(72, float, Temperature.interned)
+    UV_INDEX = ClientRawField(79, float)
+    HEAT_INDEX_CELSIUS = ClientRawField(112, float, Temperature.interned)
+    YEAR = ClientRawField(141, int)
+    OUTDOOR_TEMPERATURE_TREND = ClientRawField(143, float, to_trend)
+    OUTDOOR_HUMIDITY_TREND = ClientRawField(144, float, to_trend)
+
+    FORECASTS = ["Sunny", "Clear Night", "Cloudy", "Cloudy", "Cloudy Night", "Dry Clear", "Fog", "Hazy", "Heavy Rain",
+                 "Mainly Fine", "Misty", "Night Fog", "Night Heavy Rain", "Night Overcast", "Night Rain",
+                 "Night Showers", "Night Snow", "Night Thunder", "Overcast", "Partly Cloudy", "Rain", "Hard Rain",
+                 "Showers", "Sleet", "Sleet Showers", "Snow", "Snow Melt", "Snow Showers", "Sunny", "Thunder Showers",
+                 "Thunder Showers", "Thunderstorms", "Tornado Warning", "Windy", "Stopped Raining", "Windy Rain"]
+
     def get_average_wind_speed(self):
-        return self.__get_field_value_as_wind_speed(self.AVERAGE_WIND_SPEED_KNOTS)
+        return self.get_value(self.AVERAGE_WIND_SPEED_KNOTS)
 
     def get_gust_speed(self):
-        return self.__get_field_value_as_wind_speed(self.GUST_SPEED_KNOTS)
+        return self.get_value(self.GUST_SPEED_KNOTS)
+
+    def get_maximum_gust_speed(self):
+        return self.get_value(self.MAXIMUM_GUST_SPEED_KNOTS)
 
     def get_wind_direction(self):
-        return self.__get_field_value_as_wind_direction(self.WIND_DIRECTION_COMPASS_DEGREES)
+        return self.get_value(self.WIND_DIRECTION_COMPASS_DEGREES)
 
     def get_outdoor_temperature(self):
-        return self.__get_field_value_as_temperature(self.OUTDOOR_TEMPERATURE_CELSIUS)
+        return self.get_value(self.OUTDOOR_TEMPERATURE_CELSIUS)
+
+    def get_maximum_outdoor_temperature(self):
+        return self.get_value(self.MAXIMUM_OUTDOOR_TEMPERATURE_CELSIUS)
+
+    def get_minimum_outdoor_temperature(self):
+        return self.get_value(self.MINIMUM_OUTDOOR_TEMPERATURE_CELSIUS)
 
     def get_outdoor_humidity(self):
-        return self.__get_field_value_as_int(self.OUTDOOR_HUMIDITY)
+        return self.get_value(self.OUTDOOR_HUMIDITY)
 
     def get_surface_pressure(self):
-        return self.__get_field_value_as_pressure(self.SURFACE_PRESSURE_HECTOPASCALS)
+        return self.get_value(self.SURFACE_PRESSURE_HECTOPASCALS)
 
     def get_daily_rainfall(self):
-        return self.__get_field_value_as_rainfall(self.DAILY_RAINFALL_MILLIMETRES)
+        return self.get_value(self.DAILY_RAINFALL_MILLIMETRES)
+
+    def get_monthly_rainfall(self):
+        return self.get_value(self.MONTHLY_RAINFALL_MILLIMETRES)
+
+    def get_yearly_rainfall(self):
+        return self.get_value(self.YEARLY_RAINFALL_MILLIMETRES)
+
+    def get_yesterday_rainfall(self):
+        return self.get_value(self.YESTERDAY_RAINFALL_MILLIMETRES)
 
     def get_rainfall_rate(self):
-        return self.__get_field_value_as_rainfall(self.RAINFALL_RATE_MILLIMETRES_PER_MINUTE)
+        return self.get_value(self.RAINFALL_RATE_MILLIMETRES_PER_MINUTE)
+
+    def get_maximum_rainfall_rate(self):
+        return self.get_value(self.MAXIMUM_RAINFALL_RATE_MILLIMETRES_PER_MINUTE)
 
     def get_indoor_temperature(self):
-        return self.__get_field_value_as_temperature(self.INDOOR_TEMPERATURE_CELSIUS)
+        return self.get_value(self.INDOOR_TEMPERATURE_CELSIUS)
 
     def get_indoor_humidity(self):
-        return self.__get_field_value_as_int(self.INDOOR_HUMIDITY)
+        return self.get_value(self.INDOOR_HUMIDITY)
 
     def get_forecast(self):
-        forecast_icon = self.__get_field_value_as_int(self.FORECAST)
-        if forecast_icon is not None:
-            if forecast_icon < len(self.FORECASTS):
-                return self.FORECASTS[forecast_icon]
+        return self.get_value(self.FORECAST)
 
     def get_hour(self):
-        return self.__get_field_value_as_int(self.HOUR)
+        return self.get_value(self.HOUR)
 
     def get_minute(self):
-        return self.__get_field_value_as_int(self.MINUTE)
+        return self.get_value(self.MINUTE)
+
+    def get_second(self):
+        return self.get_value(self.SECOND)
+
+    def get_day(self):
+        return self.get_value(self.DAY)
+
+    def get_month(self):
+        return self.get_value(self.MONTH)
+
+    def get_year(self):
+        return self.get_value(self.YEAR)
 
     def get_wind_chill(self):
-        return self.__get_field_value_as_temperature(self.WIND_CHILL_CELSIUS)
+        return self.get_value(self.WIND_CHILL_CELSIUS)
 
     def get_humidex(self):
-        return self.__get_field_value_as_temperature(self.HUMIDEX_CELSIUS)
+        return self.get_value(self.HUMIDEX_CELSIUS)
 
     def get_surface_pressure_trend(self):
-        return self.__get_field_value_as_trend(self.SURFACE_PRESSURE_TREND)
+        return self.get_value(self.SURFACE_PRESSURE_TREND)
 
     def get_dew_point(self):
-        return self.__get_field_value_as_temperature(self.DEW_POINT_CELSIUS)
+        return self.get_value(self.DEW_POINT_CELSIUS)
 
     def get_uv_index(self):
-        return self.__get_field_value_as_float(self.UV_INDEX)
+        return self.get_value(self.UV_INDEX)
 
     def get_heat_index(self):
-        return self.__get_field_value_as_temperature(self.HEAT_INDEX_CELSIUS)
+        return self.get_value(self.HEAT_INDEX_CELSIUS)
 
     def get_outdoor_temperature_trend(self):
-        return self.__get_field_value_as_trend(self.OUTDOOR_TEMPERATURE_TREND)
+        return self.get_value(self.OUTDOOR_TEMPERATURE_TREND)
 
     def get_outdoor_humidity_trend(self):
-        return self.__get_field_value_as_trend(self.OUTDOOR_HUMIDITY_TREND)
-
-    def __get_field_value_as_pressure(self, field_position):
-        hectopascals = self.__get_field_value_as_float(field_position)
-        if hectopascals is not None:
-            return Pressure(hectopascals)
-
-    def __get_field_value_as_rainfall(self, field_position):
-        millimetres = self.__get_field_value_as_float(field_position)
-        if millimetres is not None:
-            return Rainfall(millimetres)
-
-    def __get_field_value_as_temperature(self, field_position):
-        celsius = self.__get_field_value_as_float(field_position)
-        if celsius is not None:
-            return Temperature(celsius)
-
-    def __get_field_value_as_trend(self, field_position):
-        trend = self.__get_field_value_as_float(field_position)
-        if trend is not None:
-            if trend < 0:
-                return Trend.FALLING
-            elif trend > 0:
-                return Trend.RISING
-            else:
-                return Trend.STEADY
-
-    def __get_field_value_as_wind_direction(self, field_position):
-        compass_degrees = self.__get_field_value_as_int(field_position)
-        if compass_degrees is not None:
-            return WindDirection(compass_degrees)
-
-    def __get_field_value_as_wind_speed(self, field_position):
-        knots = self.__get_field_value_as_float(field_position)
-        if knots is not None:
-            return WindSpeed(knots)
-
-    def __get_field_value_as_float(self, field_position):
-        if len(self.__fields) > field_position:
-            try:
-                return float(self.__fields[field_position])
-            except ValueError:
-                return None
-
-    def __get_field_value_as_int(self, field_position):
-        if len(self.__fields) > field_position:
-            try:
-                return int(self.__fields[field_position])
-            except ValueError:
-                return None
-
-    def __get_field_value_as_string(self, field_position):
-        if len(self.__fields) > field_position:
-            return self.__fields[field_position]
+        return self.get_value(self.OUTDOOR_HUMIDITY_TREND)
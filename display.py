@@ -0,0 +1,233 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import abc
+import sys
+from clientraw import ClientRaw
+from lcd import CGRAM_SLOTS
+from lcd import GLYPH_BITMAPS
+from lcd import GLYPH_CODES
+from lcd import GlyphManager
+from lcd import LCD_HEIGHT
+from lcd import LCD_WIDTH
+from lcd import LcdRenderer
+from settings import Settings
+from weatheritems import WeatherItemFactory
+from weatheritems import WeatherItemType
+
+# Each display line has this much character memory, of which only the first LCD_WIDTH cells are visible
+DDRAM_LINE_LENGTH = 40
+BITMAP_ROWS = 8
+
+# Storing a bitmap is one instruction to address the slot then one write per pixel row
+BITMAP_UPLOAD_OPERATIONS = 1 + BITMAP_ROWS
+
+UNKNOWN_GLYPH = "█"
+
+
+class Display(abc.ABC):
+
+    # What the renderer and main loop need from an LCD, so a backend missing any of it fails when created. Character
+    # codes below CGRAM_SLOTS * 2 show the custom bitmaps, with the second eight mirroring the first as they do on the
+    # HD44780
+
+    @abc.abstractmethod
+    def clear(self):
+        pass
+
+    @abc.abstractmethod
+    def set_cursor(self, column, row):
+        pass
+
+    @abc.abstractmethod
+    def write(self, text):
+        pass
+
+    @abc.abstractmethod
+    def store_custom_bitmap(self, slot, bitmap):
+        pass
+
+    @abc.abstractmethod
+    def backlight_on(self):
+        pass
+
+    @abc.abstractmethod
+    def backlight_off(self):
+        pass
+
+    @abc.abstractmethod
+    def blink_off(self):
+        pass
+
+    @abc.abstractmethod
+    def cursor_off(self):
+        pass
+
+
+class PiFaceCadDisplay(Display):
+
+    def __init__(self, lcd):
+        self.__lcd = lcd
+
+    def clear(self):
+        self.__lcd.clear()
+
+    def set_cursor(self, column, row):
+        self.__lcd.set_cursor(column, row)
+
+    def write(self, text):
+        self.__lcd.write(text)
+
+    def store_custom_bitmap(self, slot, bitmap):
+        # pifacecad sends whatever rows it is given, so plain bytes do as well as its own LCDBitmap
+        self.__lcd.store_custom_bitmap(slot, bitmap)
+
+    def backlight_on(self):
+        self.__lcd.backlight_on()
+
+    def backlight_off(self):
+        self.__lcd.backlight_off()
+
+    def blink_off(self):
+        self.__lcd.blink_off()
+
+    def cursor_off(self):
+        self.__lcd.cursor_off()
+
+
+def create_glyph_characters(glyph_codes=GLYPH_CODES, bitmaps=GLYPH_BITMAPS):
+    return {bytes(bitmaps[code]): glyph for glyph, code in glyph_codes.items() if code in bitmaps}
+
+
+class SimulatedDisplay(Display):
+
+    # Behaves like the PiFace CAD's 16x2 HD44780 without any hardware and counts every operation sent to it, so
+    # rendering cost can be measured and regression tested anywhere
+
+    def __init__(self, glyph_characters=None):
+        if glyph_characters is None:
+            glyph_characters = create_glyph_characters()
+        self.__glyph_characters = glyph_characters
+        self.__ddram = [bytearray(b" " * DDRAM_LINE_LENGTH) for row in range(0, LCD_HEIGHT)]
+        self.__cgram = [None] * CGRAM_SLOTS
+        self.__column = 0
+        self.__row = 0
+        self.__backlight = False
+        self.__blink = True
+        self.__cursor = True
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.__clears = 0
+        self.__cursor_moves = 0
+        self.__byte_writes = 0
+        self.__bitmap_uploads = 0
+
+    def get_counts(self):
+        return {"clears": self.__clears, "cursor_moves": self.__cursor_moves, "byte_writes": self.__byte_writes,
+                "bitmap_uploads": self.__bitmap_uploads}
+
+    def get_operation_count(self):
+        # Instructions and data bytes sent to the controller, each of which is a separate SPI transfer
+        return self.__clears + self.__cursor_moves + self.__byte_writes +\
+            self.__bitmap_uploads * BITMAP_UPLOAD_OPERATIONS
+
+    def clear(self):
+        self.__clears += 1
+        for line in self.__ddram:
+            line[:] = b" " * DDRAM_LINE_LENGTH
+        self.__column = 0
+        self.__row = 0
+
+    def set_cursor(self, column, row):
+        if not 0 <= column < DDRAM_LINE_LENGTH or not 0 <= row < LCD_HEIGHT:
+            raise RuntimeError("cursor position " + str(column) + "," + str(row) + " is off the display")
+        self.__cursor_moves += 1
+        self.__column = column
+        self.__row = row
+
+    def write(self, text):
+        for character in text:
+            code = ord(character)
+            if code > 0xFF:
+                raise RuntimeError("character " + repr(character) + " has no display code")
+            self.__byte_writes += 1
+            self.__ddram[self.__row][self.__column] = code
+            # The address counter runs on from the end of one line's memory into the next
+            self.__column += 1
+            if self.__column == DDRAM_LINE_LENGTH:
+                self.__column = 0
+                self.__row = (self.__row + 1) % LCD_HEIGHT
+
+    def store_custom_bitmap(self, slot, bitmap):
+        if not 0 <= slot < CGRAM_SLOTS:
+            raise RuntimeError("custom bitmap slot must be below " + str(CGRAM_SLOTS))
+        self.__bitmap_uploads += 1
+        self.__cgram[slot] = bytes(bitmap)
+
+    def backlight_on(self):
+        self.__backlight = True
+
+    def backlight_off(self):
+        self.__backlight = False
+
+    def blink_off(self):
+        self.__blink = False
+
+    def cursor_off(self):
+        self.__cursor = False
+
+    def is_backlight_on(self):
+        return self.__backlight
+
+    def get_bytes(self):
+        return [bytes(line[:LCD_WIDTH]) for line in self.__ddram]
+
+    def get_bitmap(self, column, row):
+        code = self.__ddram[row][column]
+        if code < CGRAM_SLOTS * 2:
+            return self.__cgram[code % CGRAM_SLOTS]
+        return None
+
+    def get_lines(self):
+        return ["".join(self.__to_character(column, row) for column in range(0, LCD_WIDTH))
+                for row in range(0, LCD_HEIGHT)]
+
+    def __to_character(self, column, row):
+        code = self.__ddram[row][column]
+        if code < CGRAM_SLOTS * 2:
+            return self.__glyph_characters.get(self.get_bitmap(column, row), UNKNOWN_GLYPH)
+        elif code < 0x7E:
+            return chr(code)
+        else:
+            return UNKNOWN_GLYPH
+
+    def __str__(self):
+        border = "+" + "-" * LCD_WIDTH + "+"
+        return "\n".join([border] + ["|" + line + "|" for line in self.get_lines()] + [border])
+
+    def show(self, output=sys.stdout):
+        print(str(self), file=output)
+
+
+if __name__ == '__main__':
+
+    # Measures what a full rotation of pages costs the display, e.g. python3 display.py clientraw.txt
+
+    if len(sys.argv) < 2:
+        print("usage: display.py [clientraw.txt path]")
+        sys.exit(1)
+
+    with open(sys.argv[1], "rb") as clientraw_file:
+        clientraw = ClientRaw(clientraw_file.read())
+
+    simulated_display = SimulatedDisplay()
+    renderer = LcdRenderer(simulated_display, glyph_manager=GlyphManager(simulated_display))
+    settings = Settings()
+    for weather_item_type in WeatherItemType().get_all():
+        weather_item = WeatherItemFactory(clientraw, settings, lcd=True).get_weather_item()
+        renderer.render([weather_item.get_line1(), weather_item.get_line2()])
+        simulated_display.show()
+        settings.next_weather_item_type()
+    print(simulated_display.get_counts())
+    print(str(simulated_display.get_operation_count()) + " operations")
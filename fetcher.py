@@ -0,0 +1,281 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import base64
+import hashlib
+import http.client
+import mmap
+import os
+import urllib.parse
+import urllib.request
+import zlib
+from clientraw import ClientRaw
+
+
+class ClientRawFetcher:
+
+    CONNECT_TIMEOUT_SECS = 5
+    READ_TIMEOUT_SECS = 10
+    READ_CHUNK_SIZE = 4096
+    MAXIMUM_REDIRECTS = 5
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+    PERMANENT_REDIRECT_STATUSES = (301, 308)
+
+    def __init__(self, clientraw_url, connect_timeout_secs=CONNECT_TIMEOUT_SECS, read_timeout_secs=READ_TIMEOUT_SECS,
+                 clientraw_class=ClientRaw):
+        self.__url = clientraw_url
+        self.__connect_timeout_secs = connect_timeout_secs
+        self.__read_timeout_secs = read_timeout_secs
+        self.__connection = None
+        self.__connection_origin = None
+        self.__etag = None
+        self.__last_modified = None
+        self.__parser = ClientRawParser(clientraw_class)
+        self.__clientraw = None
+
+    def fetch(self, conditional=True):
+        # An unconditional fetch is for when the last content turned out to be cut short. HTTP dates only have one
+        # second resolution, so the complete file usually has the same Last-Modified and would come back as a 304
+        try:
+            return self.__fetch(conditional)
+        except (http.client.HTTPException, OSError, zlib.error):
+            self.close()
+            return None
+
+    def close(self):
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+            self.__connection_origin = None
+
+    def __fetch(self, conditional):
+        url = self.__url
+        for redirect in range(0, self.MAXIMUM_REDIRECTS + 1):
+            response = self.__request(url, conditional)
+            content = self.__read_content(response)
+            location = response.getheader("Location")
+            if response.status not in self.REDIRECT_STATUSES or location is None:
+                break
+            # Hosts commonly move clientraw.txt from http to https, so follow the way urlopen used to and stop
+            # asking the old address once it is known to have moved for good
+            url = urllib.parse.urljoin(url, location)
+            if response.status in self.PERMANENT_REDIRECT_STATUSES:
+                self.__url = url
+
+        if response.status == http.client.NOT_MODIFIED and self.__clientraw is not None:
+            return self.__clientraw
+        elif response.status == http.client.OK:
+            self.__etag = response.getheader("ETag")
+            self.__last_modified = response.getheader("Last-Modified")
+            self.__clientraw = self.__parser.parse(content)
+            return self.__clientraw
+        else:
+            self.__etag = None
+            self.__last_modified = None
+            self.__clientraw = None
+            return None
+
+    def __read_content(self, response):
+        content_encoding = (response.getheader("Content-Encoding") or "identity").strip().lower()
+        if content_encoding == "identity":
+            return response.read()
+
+        decompressor = ContentDecompressor(content_encoding)
+        content = bytearray()
+        chunk = response.read(self.READ_CHUNK_SIZE)
+        while chunk:
+            content += decompressor.decompress(chunk)
+            chunk = response.read(self.READ_CHUNK_SIZE)
+        content += decompressor.flush()
+        return bytes(content)
+
+    def __request(self, url, conditional):
+        reused_connection = self.__connect(url)
+        try:
+            return self.__send_request(url, conditional)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # An idle keep-alive connection may have been dropped by the server so retry once on a fresh one
+            self.close()
+            if not reused_connection:
+                raise
+            self.__connect(url)
+            return self.__send_request(url, conditional)
+
+    def __connect(self, url):
+        # The connection is kept for as long as requests go to the same place, through the same proxy
+        target = urllib.parse.urlsplit(url)
+        proxy = get_proxy(url)
+        origin = (target.scheme, target.hostname, target.port, proxy)
+        if self.__connection is not None and origin != self.__connection_origin:
+            self.close()
+        if self.__connection is not None:
+            return True
+        self.__connection = create_connection(target, proxy, self.__connect_timeout_secs)
+        self.__connection_origin = origin
+        return False
+
+    def __send_request(self, url, conditional):
+        if self.__connection.sock is None:
+            self.__connection.connect()
+            self.__connection.sock.settimeout(self.__read_timeout_secs)
+        target = urllib.parse.urlsplit(url)
+        proxy = self.__connection_origin[3]
+        headers = self.__get_request_headers(conditional)
+        if proxy is not None and target.scheme == "http":
+            # A plain HTTP proxy is asked for the whole URL rather than tunnelled through
+            path = urllib.parse.urlunsplit((target.scheme, target.netloc, target.path or "/", target.query, ""))
+            headers.update(get_proxy_headers(proxy))
+        else:
+            path = (target.path or "/") + ("?" + target.query if target.query else "")
+        self.__connection.request("GET", path, headers=headers)
+        return self.__connection.getresponse()
+
+    def __get_request_headers(self, conditional):
+        headers = {"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"}
+        if conditional and self.__clientraw is not None:
+            if self.__etag is not None:
+                headers["If-None-Match"] = self.__etag
+            if self.__last_modified is not None:
+                headers["If-Modified-Since"] = self.__last_modified
+        return headers
+
+
+class ClientRawFileFetcher:
+
+    def __init__(self, clientraw_path, clientraw_class=ClientRaw):
+        self.__clientraw_path = clientraw_path
+        self.__file_version = None
+        self.__parser = ClientRawParser(clientraw_class)
+        self.__clientraw = None
+
+    def fetch(self, conditional=True):
+        try:
+            return self.__fetch(conditional)
+        except OSError:
+            self.__file_version = None
+            self.__clientraw = None
+            return None
+
+    def close(self):
+        pass
+
+    def __fetch(self, conditional):
+        stat = os.stat(self.__clientraw_path)
+        # Weather Display rewrites the file on every upload so only read it again once that has happened
+        file_version = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if not conditional or file_version != self.__file_version or self.__clientraw is None:
+            self.__clientraw = self.__parser.parse(self.__read_content())
+            self.__file_version = file_version
+        return self.__clientraw
+
+    def __read_content(self):
+        with open(self.__clientraw_path, "rb") as clientraw_file:
+            if os.fstat(clientraw_file.fileno()).st_size == 0:
+                return b""
+            # The file can still be emptied by a rewrite after that check, which mmap refuses. That is read as empty
+            # content so the updater retries it like any other partly written file
+            try:
+                content = mmap.mmap(clientraw_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return b""
+            with content:
+                return content[:]
+
+
+class ClientRawParser:
+
+    def __init__(self, clientraw_class=ClientRaw):
+        self.__clientraw_class = clientraw_class
+        self.__digest = None
+        self.__clientraw = None
+
+    def parse(self, content):
+        # Many hosts send no validators and Weather Display may rewrite an unchanged file, so recognise identical
+        # content and hand back the existing ClientRaw instead of parsing and re-rendering it again
+        digest = hashlib.blake2b(content, digest_size=16).digest()
+        if digest != self.__digest:
+            self.__clientraw = self.__clientraw_class(content)
+            self.__digest = digest
+        return self.__clientraw
+
+
+class ContentDecompressor:
+
+    def __init__(self, content_encoding):
+        if content_encoding in ("gzip", "x-gzip"):
+            self.__decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif content_encoding == "deflate":
+            self.__decompressor = None
+        else:
+            raise http.client.HTTPException("Unsupported Content-Encoding: " + content_encoding)
+
+    def decompress(self, data):
+        if self.__decompressor is None:
+            # Servers disagree on whether deflate means zlib wrapped or raw deflate data so look for a zlib header
+            if len(data) > 1 and (data[0] & 0x0F) == 8 and ((data[0] << 8) | data[1]) % 31 == 0:
+                self.__decompressor = zlib.decompressobj(zlib.MAX_WBITS)
+            else:
+                self.__decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self.__decompressor.decompress(data)
+
+    def flush(self):
+        if self.__decompressor is None:
+            return b""
+        return self.__decompressor.flush()
+
+
+def get_proxy(url):
+    # Honours http_proxy, https_proxy and no_proxy the same way urlopen does
+    target = urllib.parse.urlsplit(url)
+    proxy = urllib.request.getproxies().get(target.scheme)
+    if proxy is None or urllib.request.proxy_bypass(target.netloc):
+        return None
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    return proxy
+
+
+def get_proxy_headers(proxy):
+    proxy_url = urllib.parse.urlsplit(proxy)
+    if proxy_url.username is None:
+        return {}
+    credentials = urllib.parse.unquote(proxy_url.username) + ":" + urllib.parse.unquote(proxy_url.password or "")
+    return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode()).decode("ascii")}
+
+
+def create_connection(target, proxy, timeout_secs):
+    if target.scheme == "https":
+        connection_class = http.client.HTTPSConnection
+    else:
+        connection_class = http.client.HTTPConnection
+    if proxy is None:
+        return connection_class(target.hostname, target.port, timeout=timeout_secs)
+
+    proxy_url = urllib.parse.urlsplit(proxy)
+    if target.scheme == "https":
+        # HTTPS goes through the proxy in a CONNECT tunnel so the proxy never sees the request
+        connection = connection_class(proxy_url.hostname, proxy_url.port, timeout=timeout_secs)
+        connection.set_tunnel(target.hostname, target.port, headers=get_proxy_headers(proxy))
+        return connection
+    return http.client.HTTPConnection(proxy_url.hostname, proxy_url.port, timeout=timeout_secs)
+
+
+def create_fetcher(clientraw_source, connect_timeout_secs=ClientRawFetcher.CONNECT_TIMEOUT_SECS,
+                   read_timeout_secs=ClientRawFetcher.READ_TIMEOUT_SECS, clientraw_class=ClientRaw):
+    url = urllib.parse.urlsplit(clientraw_source)
+    if url.scheme in ("http", "https"):
+        return ClientRawFetcher(clientraw_source, connect_timeout_secs, read_timeout_secs, clientraw_class)
+    elif url.scheme == "file":
+        return ClientRawFileFetcher(urllib.request.url2pathname(url.path), clientraw_class)
+    else:
+        return ClientRawFileFetcher(clientraw_source, clientraw_class)
+
+
+def get_sibling_source(clientraw_source, file_name):
+    # The history files sit alongside clientraw.txt, whether that is on a web server or on local disk
+    url = urllib.parse.urlsplit(clientraw_source)
+    if url.scheme in ("http", "https", "file"):
+        path = url.path[:url.path.rfind("/") + 1] + file_name
+        return urllib.parse.urlunsplit((url.scheme, url.netloc, path, url.query, url.fragment))
+    else:
+        return os.path.join(os.path.dirname(clientraw_source), file_name)
@@ -1,14 +1,29 @@
 # Copyright 2015 Wayne D Grant (www.waynedgrant.com)
 # Licensed under the MIT License
 
-from decimal import *
+from lcd import DEGREE_CODE
+from lcd import FALLING_CODE
+from lcd import RISING_CODE
+from lcd import STEADY_CODE
 from measures import Trend
+from scales import UV_INDEX_CATEGORIES
 from units import PressureUnit
 from units import RainfallUnit
 from units import TemperatureUnit
 from units import WindDirectionUnit
 from units import WindSpeedUnit
 
+# Glyphs as shown in text and as the character codes the display holds their bitmaps under. Building LCD output
+# with the codes directly means it never needs translating character by character
+DEGREE = "°"
+TREND_SYMBOLS = {Trend.RISING: "➚", Trend.STEADY: "➙", Trend.FALLING: "➘"}
+LCD_DEGREE = chr(DEGREE_CODE)
+LCD_TREND_SYMBOLS = {Trend.RISING: chr(RISING_CODE), Trend.STEADY: chr(STEADY_CODE), Trend.FALLING: chr(FALLING_CODE)}
+
+
+def to_lcd(text):
+    return text.encode("ascii", "replace")
+
 
 class ForecastFormatter:
 
@@ -21,6 +36,9 @@ class ForecastFormatter:
         else:
             return "-----"
 
+    def format_lcd(self):
+        return to_lcd(self.format())
+
 
 class HumidityFormatter:
 
@@ -33,6 +51,9 @@ class HumidityFormatter:
         else:
             return "--%"
 
+    def format_lcd(self):
+        return to_lcd(self.format())
+
 
 class PressureFormatter:
 
@@ -63,6 +84,9 @@ class PressureFormatter:
             else:
                 return "---.- mmHg"
 
+    def format_lcd(self, pressure_unit):
+        return to_lcd(self.format(pressure_unit))
+
 
 class RainfallFormatter:
 
@@ -82,6 +106,9 @@ class RainfallFormatter:
             else:
                 return "-.-- in"
 
+    def format_lcd(self, rainfall_unit):
+        return to_lcd(self.format(rainfall_unit))
+
 
 class RainfallRateFormatter:
 
@@ -101,6 +128,9 @@ class RainfallRateFormatter:
             else:
                 return "-.--- in/min"
 
+    def format_lcd(self, rainfall_unit):
+        return to_lcd(self.format(rainfall_unit))
+
 
 class TemperatureFormatter:
 
@@ -108,17 +138,20 @@ class TemperatureFormatter:
         self.__temperature = temperature
 
     def format(self, temperature_unit):
+        return self.__format(temperature_unit, DEGREE)
+
+    def format_lcd(self, temperature_unit):
+        return to_lcd(self.__format(temperature_unit, LCD_DEGREE))
+
+    def __format(self, temperature_unit, degree):
+        if temperature_unit is TemperatureUnit.CELSIUS:
+            suffix = degree + "C"
+        else:
+            suffix = degree + "F"
         if self.__temperature is not None:
-            if temperature_unit is TemperatureUnit.CELSIUS:
-                suffix = "°C"
-            else:
-                suffix = "°F"
             return "{:.1f}".format(round(self.__temperature.get_value(temperature_unit), 1)) + suffix
         else:
-            if temperature_unit is TemperatureUnit.CELSIUS:
-                return "--.-°C"
-            else:
-                return "--.-°F"
+            return "--.-" + suffix
 
 
 class TimeFormatter:
@@ -133,6 +166,9 @@ class TimeFormatter:
         else:
             return "--:--"
 
+    def format_lcd(self):
+        return to_lcd(self.format())
+
 
 class TrendFormatter:
 
@@ -140,14 +176,14 @@ class TrendFormatter:
         self.__trend = trend
 
     def format(self):
+        return self.__format(TREND_SYMBOLS)
+
+    def format_lcd(self):
+        return to_lcd(self.__format(LCD_TREND_SYMBOLS))
 
+    def __format(self, symbols):
         if self.__trend is not None:
-            if self.__trend is Trend.RISING:
-                return "➚"
-            elif self.__trend is Trend.STEADY:
-                return "➙"
-            else:
-                return "➘"
+            return symbols[self.__trend]
         else:
             return "-"
 
@@ -160,24 +196,12 @@ class UvIndexFormatter:
     def format(self):
         if self.__uv_index is not None:
             index = "{:.1f}".format(round(self.__uv_index, 1))
-            return index + " " + self.__get_uv_index_description()
+            return index + " " + UV_INDEX_CATEGORIES.classify(self.__uv_index)
         else:
             return "-.- -----"
 
-    def __get_uv_index_description(self):
-        with localcontext() as context:
-            context.rounding = ROUND_HALF_DOWN
-            uv_index_rounded = round(Decimal(self.__uv_index), 0)
-            if uv_index_rounded < 3:
-                return "low"
-            elif 3 <= uv_index_rounded <= 5:
-                return "moderate"
-            elif 6 <= uv_index_rounded <= 7:
-                return "high"
-            elif 8 <= uv_index_rounded <= 10:
-                return "very high"
-            else:
-                return "extreme"
+    def format_lcd(self):
+        return to_lcd(self.format())
 
 
 class WindDirectionFormatter:
@@ -186,14 +210,20 @@ class WindDirectionFormatter:
         self.__wind_direction = wind_direction
 
     def format(self, wind_direction_unit):
+        return self.__format(wind_direction_unit, DEGREE)
+
+    def format_lcd(self, wind_direction_unit):
+        return to_lcd(self.__format(wind_direction_unit, LCD_DEGREE))
+
+    def __format(self, wind_direction_unit, degree):
         if self.__wind_direction is not None:
             if wind_direction_unit is WindDirectionUnit.COMPASS_DEGREES:
-                return str(self.__wind_direction.get_value(wind_direction_unit)) + "°"
+                return str(self.__wind_direction.get_value(wind_direction_unit)) + degree
             else:
                 return self.__wind_direction.get_value(wind_direction_unit)
         else:
             if wind_direction_unit is WindDirectionUnit.COMPASS_DEGREES:
-                return "---°"
+                return "---" + degree
             else:
                 return "---"
 
@@ -227,3 +257,6 @@ class WindSpeedFormatter:
                 return "--.- mph"
             else:
                 return "-- Bft"
+
+    def format_lcd(self, wind_speed_unit):
+        return to_lcd(self.format(wind_speed_unit))
@@ -0,0 +1,81 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+from clientraw import ClientRawFile
+from measures import Pressure
+from measures import Rainfall
+from measures import Temperature
+from measures import WindDirection
+from measures import WindSpeed
+from schema import ClientRawSeries
+
+# Weather Display publishes these next to clientraw.txt and rewrites them far less often than it
+CLIENTRAW_EXTRA = "clientrawextra.txt"
+CLIENTRAW_DAILY = "clientrawdaily.txt"
+CLIENTRAW_HOUR = "clientrawhour.txt"
+
+
+class ClientRawExtra(ClientRawFile):
+
+    # Hourly readings over the last 20 hours, oldest first
+
+    HOURLY_AVERAGE_WIND_SPEED_KNOTS = ClientRawSeries(1, 20, float, WindSpeed.interned)
+    HOURLY_OUTDOOR_TEMPERATURE_CELSIUS = ClientRawSeries(21, 20, float, Temperature.interned)
+
+    def get_hourly_average_wind_speeds(self):
+        return self.get_values(self.HOURLY_AVERAGE_WIND_SPEED_KNOTS)
+
+    def get_hourly_outdoor_temperatures(self):
+        return self.get_values(self.HOURLY_OUTDOOR_TEMPERATURE_CELSIUS)
+
+
+class ClientRawDaily(ClientRawFile):
+
+    # One reading per day of the current month, starting on the 1st
+
+    DAILY_MAXIMUM_OUTDOOR_TEMPERATURE_CELSIUS = ClientRawSeries(1, 31, float, Temperature.interned)
+    DAILY_MINIMUM_OUTDOOR_TEMPERATURE_CELSIUS = ClientRawSeries(32, 31, float, Temperature.interned)
+    DAILY_RAINFALL_MILLIMETRES = ClientRawSeries(63, 31, float, Rainfall.interned)
+
+    def get_daily_maximum_outdoor_temperatures(self):
+        return self.get_values(self.DAILY_MAXIMUM_OUTDOOR_TEMPERATURE_CELSIUS)
+
+    def get_daily_minimum_outdoor_temperatures(self):
+        return self.get_values(self.DAILY_MINIMUM_OUTDOOR_TEMPERATURE_CELSIUS)
+
+    def get_daily_rainfalls(self):
+        return self.get_values(self.DAILY_RAINFALL_MILLIMETRES)
+
+
+class ClientRawHour(ClientRawFile):
+
+    # One reading per minute over the last hour, oldest first
+
+    AVERAGE_WIND_SPEED_KNOTS = ClientRawSeries(1, 60, float, WindSpeed.interned)
+    GUST_SPEED_KNOTS = ClientRawSeries(61, 60, float, WindSpeed.interned)
+    WIND_DIRECTION_COMPASS_DEGREES = ClientRawSeries(121, 60, int, WindDirection.interned)
+    OUTDOOR_TEMPERATURE_CELSIUS = ClientRawSeries(181, 60, float, Temperature.interned)
+    OUTDOOR_HUMIDITY = ClientRawSeries(241, 60, int)
+    SURFACE_PRESSURE_HECTOPASCALS = ClientRawSeries(301, 60, float, Pressure.interned)
+    DAILY_RAINFALL_MILLIMETRES = ClientRawSeries(361, 60, float, Rainfall.interned)
+
+    def get_average_wind_speeds(self):
+        return self.get_values(self.AVERAGE_WIND_SPEED_KNOTS)
+
+    def get_gust_speeds(self):
+        return self.get_values(self.GUST_SPEED_KNOTS)
+
+    def get_wind_directions(self):
+        return self.get_values(self.WIND_DIRECTION_COMPASS_DEGREES)
+
+    def get_outdoor_temperatures(self):
+        return self.get_values(self.OUTDOOR_TEMPERATURE_CELSIUS)
+
+    def get_outdoor_humidities(self):
+        return self.get_values(self.OUTDOOR_HUMIDITY)
+
+    def get_surface_pressures(self):
+        return self.get_values(self.SURFACE_PRESSURE_HECTOPASCALS)
+
+    def get_daily_rainfalls(self):
+        return self.get_values(self.DAILY_RAINFALL_MILLIMETRES)
@@ -0,0 +1,150 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import urllib.parse
+from fetcher import ClientRawParser
+
+MAXIMUM_PAYLOAD_SIZE = 64 * 1024
+RECEIVE_TIMEOUT_SECS = 10
+SHUTDOWN_POLL_INTERVAL_SECS = 0.1
+
+ACCEPTED_REPLY = b"OK\n"
+REJECTED_REPLY = b"INVALID\n"
+
+
+def is_ingest_address(address):
+    return urllib.parse.urlsplit(address).scheme in ("tcp", "unix")
+
+
+def send_clientraw(address, payload, timeout_secs=RECEIVE_TIMEOUT_SECS):
+    url = urllib.parse.urlsplit(address)
+    if url.scheme == "unix":
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout_secs)
+        connection.connect(url.path)
+    else:
+        connection = socket.create_connection((url.hostname, url.port), timeout_secs)
+    with connection:
+        connection.sendall(payload)
+        connection.shutdown(socket.SHUT_WR)
+        return connection.recv(len(REJECTED_REPLY)) == ACCEPTED_REPLY
+
+
+def remove_stale_socket(path):
+    # A socket left behind by an earlier run has to go before the path can be bound again, but anything else there
+    # is most likely a mistyped path and must not be touched
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(path + " already exists and is not a socket")
+    os.remove(path)
+
+
+class ClientRawIngestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        self.request.settimeout(RECEIVE_TIMEOUT_SECS)
+        payload = bytearray()
+        while len(payload) <= MAXIMUM_PAYLOAD_SIZE:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                break
+            payload += chunk
+
+        if len(payload) <= MAXIMUM_PAYLOAD_SIZE and self.server.ingest_server.receive(bytes(payload)):
+            self.request.sendall(ACCEPTED_REPLY)
+        else:
+            self.request.sendall(REJECTED_REPLY)
+
+
+class ThreadingTCPServer(socketserver.ThreadingTCPServer):
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class ThreadingUnixStreamServer(socketserver.ThreadingUnixStreamServer):
+
+    daemon_threads = True
+
+
+class ClientRawIngestServer:
+
+    def __init__(self, address, listener):
+        url = urllib.parse.urlsplit(address)
+        if url.scheme == "unix":
+            self.__unix_path = url.path
+            remove_stale_socket(self.__unix_path)
+            self.__server = ThreadingUnixStreamServer(self.__unix_path, ClientRawIngestHandler)
+        elif url.scheme == "tcp":
+            self.__unix_path = None
+            self.__server = ThreadingTCPServer((url.hostname or "", url.port or 0), ClientRawIngestHandler)
+        else:
+            raise RuntimeError('address must be a tcp:// or unix:// URL')
+        self.__server.ingest_server = self
+        self.__listener = listener
+        self.__parser = ClientRawParser()
+        self.__clientraw = None
+        self.__lock = threading.Lock()
+        # Each connection is handled on its own thread, so pushes are taken one at a time from parsing through to
+        # the listener. Otherwise the parser could pair one push's digest with another's snapshot, or an older push
+        # could reach the listener after a newer one
+        self.__receive_lock = threading.Lock()
+        self.__thread = threading.Thread(target=self.__server.serve_forever, args=(SHUTDOWN_POLL_INTERVAL_SECS,),
+                                         name="clientraw-ingest", daemon=True)
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        if self.__unix_path is not None and os.path.exists(self.__unix_path):
+            os.remove(self.__unix_path)
+
+    def get_address(self):
+        if self.__unix_path is not None:
+            return "unix://" + self.__unix_path
+        host, port = self.__server.server_address[:2]
+        return "tcp://" + host + ":" + str(port)
+
+    def get_clientraw(self):
+        with self.__lock:
+            return self.__clientraw
+
+    def is_stale(self):
+        return False
+
+    def receive(self, payload):
+        with self.__receive_lock:
+            clientraw = self.__parser.parse(payload)
+            if not clientraw.is_valid():
+                return False
+            with self.__lock:
+                unchanged = clientraw is self.__clientraw
+                self.__clientraw = clientraw
+            if not unchanged:
+                self.__listener(clientraw)
+            return True
+
+
+if __name__ == '__main__':
+
+    # Stands in for a station pushing its clientraw.txt, e.g. python3 ingest.py tcp://localhost:5555 clientraw.txt
+    if len(sys.argv) < 3:
+        print("usage: ingest.py [tcp://host:port or unix:///path] [clientraw.txt path]")
+        sys.exit(1)
+
+    with open(sys.argv[2], "rb") as clientraw_file:
+        accepted = send_clientraw(sys.argv[1], clientraw_file.read())
+    print("accepted" if accepted else "rejected")
+    sys.exit(0 if accepted else 1)
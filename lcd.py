@@ -0,0 +1,161 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import collections
+
+LCD_WIDTH = 16
+LCD_HEIGHT = 2
+BLANK = b" "
+
+# The controller has room for this many custom bitmaps, shown by writing their slot number as a character code
+CGRAM_SLOTS = 8
+
+# Glyphs are written with logical codes below 0x20, which are mapped onto whichever slot holds their bitmap.
+# Everything from 0x20 up is the controller's character ROM, which matches ASCII for the characters used here
+GLYPH_CODE_LIMIT = 0x20
+DEGREE_CODE = 0x00
+RISING_CODE = 0x01
+FALLING_CODE = 0x02
+STEADY_CODE = 0x03
+
+GLYPH_CODES = {"°": DEGREE_CODE, "➚": RISING_CODE, "➘": FALLING_CODE, "➙": STEADY_CODE}
+
+# One byte per pixel row, top to bottom, with the low five bits lit
+GLYPH_BITMAPS = {
+    DEGREE_CODE: bytes([0b01110, 0b01010, 0b01110, 0b00000, 0b00000, 0b00000, 0b00000, 0b00000]),
+    RISING_CODE: bytes([0b00000, 0b01111, 0b00011, 0b00101, 0b01001, 0b10000, 0b00000, 0b00000]),
+    FALLING_CODE: bytes([0b00000, 0b10000, 0b01001, 0b00101, 0b00011, 0b01111, 0b00000, 0b00000]),
+    STEADY_CODE: bytes([0b00000, 0b00100, 0b00010, 0b11111, 0b00010, 0b00100, 0b00000, 0b00000])
+}
+
+# Rewriting an unchanged cell costs the same single write as the cursor move needed to skip it
+MAXIMUM_REWRITTEN_GAP = 1
+
+
+def create_encoding_table(glyph_codes):
+    return str.maketrans({glyph: chr(code) for glyph, code in glyph_codes.items()})
+
+
+ENCODING_TABLE = create_encoding_table(GLYPH_CODES)
+
+
+def encode(text, encoding_table=ENCODING_TABLE):
+    # Glyphs become their custom bitmap codes in one pass and anything else the display can't show becomes ?
+    return text.translate(encoding_table).encode("ascii", "replace")
+
+
+class GlyphManager:
+
+    # Shares the few CGRAM slots between any number of glyphs, loading a glyph's bitmap the first time a frame uses
+    # it and reusing the least recently used slot whose glyph isn't part of the frame. A slot is only rewritten when
+    # it has to hold a different glyph, so once the pages in rotation fit nothing more is uploaded
+
+    def __init__(self, lcd, bitmaps=GLYPH_BITMAPS, slots=CGRAM_SLOTS):
+        for code in bitmaps:
+            if not 0 <= code < GLYPH_CODE_LIMIT:
+                raise RuntimeError("glyph code must be below " + hex(GLYPH_CODE_LIMIT))
+        self.__lcd = lcd
+        self.__bitmaps = bitmaps
+        self.__slot_count = slots
+        self.__slots = collections.OrderedDict()  # glyph code -> slot, least recently used first
+        self.__contents = {}  # slot -> bitmap last uploaded to it
+        self.__translation = None
+
+    def get_slots(self):
+        return dict(self.__slots)
+
+    def translate(self, frame):
+        codes = {code for line in frame for code in line if code in self.__bitmaps}
+        if len(codes) > self.__slot_count:
+            raise RuntimeError("frame needs " + str(len(codes)) + " glyphs but only " + str(self.__slot_count) +
+                               " fit on the display")
+
+        changed = False
+        for code in sorted(codes):
+            if code in self.__slots:
+                self.__slots.move_to_end(code)
+            else:
+                self.__load(code, self.__get_free_slot(code, codes))
+                changed = True
+        if changed or self.__translation is None:
+            self.__translation = self.__create_translation()
+
+        # Glyphs that already sit in the slot matching their code need no translating
+        if self.__translation is False:
+            return frame
+        return [line.translate(self.__translation) for line in frame]
+
+    def __get_free_slot(self, code, codes):
+        used = set(self.__slots.values())
+        if code < self.__slot_count and code not in used:
+            return code
+        for slot in range(0, self.__slot_count):
+            if slot not in used:
+                return slot
+        for evicted in self.__slots:
+            if evicted not in codes:
+                return self.__slots.pop(evicted)
+
+    def __load(self, code, slot):
+        bitmap = self.__bitmaps[code]
+        if self.__contents.get(slot) != bitmap:
+            self.__lcd.store_custom_bitmap(slot, bitmap)
+            self.__contents[slot] = bitmap
+        self.__slots[code] = slot
+
+    def __create_translation(self):
+        if all(code == slot for code, slot in self.__slots.items()):
+            return False
+        table = bytearray(range(0, 256))
+        for code, slot in self.__slots.items():
+            table[code] = slot
+        return bytes(table)
+
+
+class LcdRenderer:
+
+    # Keeps a copy of what is on the glass and only sends the cells that differ, so nothing ever needs clearing.
+    # Lines can be text or bytes already encoded for the display, which are sent exactly as they are
+
+    def __init__(self, lcd, glyph_codes=GLYPH_CODES, glyph_manager=None):
+        self.__lcd = lcd
+        self.__encoding_table = create_encoding_table(glyph_codes)
+        self.__glyph_manager = glyph_manager
+        self.__shadow = None
+
+    def invalidate(self):
+        # For when something else has written to the display and its contents are no longer known
+        self.__shadow = None
+
+    def get_lines(self):
+        if self.__shadow is None:
+            return None
+        return list(self.__shadow)
+
+    def render(self, lines):
+        frame = [self.__fit(lines[row] if row < len(lines) else b"") for row in range(0, LCD_HEIGHT)]
+        if self.__glyph_manager is not None:
+            frame = self.__glyph_manager.translate(frame)
+        for row in range(0, LCD_HEIGHT):
+            for start, end in self.__get_changed_runs(frame, row):
+                self.__lcd.set_cursor(start, row)
+                # Each byte goes to the controller as the character code it already is
+                self.__lcd.write(frame[row][start:end].decode("latin-1"))
+        self.__shadow = frame
+
+    def __fit(self, line):
+        if isinstance(line, str):
+            line = encode(line, self.__encoding_table)
+        return line[:LCD_WIDTH].ljust(LCD_WIDTH, BLANK)
+
+    def __get_changed_runs(self, frame, row):
+        if self.__shadow is None:
+            return [(0, LCD_WIDTH)]
+        runs = []
+        for column in range(0, LCD_WIDTH):
+            if frame[row][column] != self.__shadow[row][column]:
+                if runs and column - runs[-1][1] <= MAXIMUM_REWRITTEN_GAP:
+                    runs[-1] = (runs[-1][0], column + 1)
+                else:
+                    runs.append((column, column + 1))
+        return runs
@@ -1,80 +1,293 @@
 # Copyright 2015 Wayne D Grant (www.waynedgrant.com)
 # Licensed under the MIT License
 
-from decimal import *
+import array
+import functools
+import math
+from fractions import Fraction
+from scales import BEAUFORT_SCALE
 from units import PressureUnit
 from units import RainfallUnit
 from units import TemperatureUnit
 from units import WindDirectionUnit
 from units import WindSpeedUnit
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def setup_decimal_context(context):
-    context.prec = 7
+SIGNIFICANT_DIGITS = 7
+SIGNIFICANT_DIGITS_FORMAT = "." + str(SIGNIFICANT_DIGITS) + "g"
+TIE_TOLERANCE = 1e-6
+# Powers of ten up to this are exact as floats, so dividing by one gives the correctly rounded decimal result
+MAXIMUM_EXACT_POWER_OF_TEN = 22
+# Enough distinct readings to cover every field of a few snapshots plus an hour of history
+INTERN_CACHE_SIZE = 1024
+# Stands in for a missing reading in Beaufort int arrays, which have no NaN. No force is negative
+MISSING_BEAUFORT_FORCE = -1
 
 
-class Pressure:
+def round_significant(value):
+    # Conversions are rounded half to even to 7 significant digits, as they were when calculated with 7 digit decimal
+    # arithmetic. None means value lies too close to halfway between two results for float error to be ruled out
+    if value == 0 or not math.isfinite(value):
+        return float(value)
+    exponent = SIGNIFICANT_DIGITS - 1 - math.floor(math.log10(abs(value)))
+    if abs(exponent) > MAXIMUM_EXACT_POWER_OF_TEN:
+        return None
+    scaled = abs(value) * 10.0 ** exponent
+    if not 10 ** (SIGNIFICANT_DIGITS - 1) <= scaled < 10 ** SIGNIFICANT_DIGITS or\
+            abs(scaled % 1 - 0.5) < TIE_TOLERANCE:
+        return None
+    return float(format(value, SIGNIFICANT_DIGITS_FORMAT))
+
+
+def round_significant_exactly(value):
+    if value == 0:
+        return value
+    numerator = abs(value.numerator)
+    denominator = value.denominator
+    exponent = SIGNIFICANT_DIGITS - 1 - (len(str(numerator)) - len(str(denominator)))
+    while True:
+        if exponent >= 0:
+            digits, remainder = divmod(numerator * 10 ** exponent, denominator)
+            divisor = denominator
+        else:
+            divisor = denominator * 10 ** -exponent
+            digits, remainder = divmod(numerator, divisor)
+        if digits >= 10 ** SIGNIFICANT_DIGITS:
+            exponent -= 1
+        elif digits < 10 ** (SIGNIFICANT_DIGITS - 1):
+            exponent += 1
+        else:
+            break
+    if 2 * remainder > divisor or (2 * remainder == divisor and digits % 2 == 1):
+        digits += 1
+    if value < 0:
+        digits = -digits
+    return Fraction(digits) / Fraction(10) ** exponent
+
+
+def round_significant_array(values):
+    # Same as round_significant across a NumPy array, returning the rounded values and a mask of those too close to
+    # call. Dividing by an exact power of ten rounds correctly, just as parsing the formatted digits back does
+    magnitudes = numpy.abs(values)
+    rounded = values.copy()
+    unsure = numpy.zeros(len(values), dtype=bool)
+    convertible = (magnitudes != 0) & numpy.isfinite(values)
+    magnitudes = magnitudes[convertible]
+    exponents = SIGNIFICANT_DIGITS - 1 - numpy.floor(numpy.log10(magnitudes))
+    exact = numpy.abs(exponents) <= MAXIMUM_EXACT_POWER_OF_TEN
+    exponents = numpy.clip(exponents, -MAXIMUM_EXACT_POWER_OF_TEN, MAXIMUM_EXACT_POWER_OF_TEN)
+    powers = 10.0 ** numpy.abs(exponents)
+    with numpy.errstate(over="ignore"):
+        scaled = numpy.where(exponents >= 0, magnitudes * powers, magnitudes / powers)
+    unsure[convertible] = ~exact | (scaled < 10 ** (SIGNIFICANT_DIGITS - 1)) | (scaled >= 10 ** SIGNIFICANT_DIGITS) |\
+        (numpy.abs(scaled % 1 - 0.5) < TIE_TOLERANCE)
+    digits = numpy.rint(scaled)
+    rounded[convertible] = numpy.copysign(numpy.where(exponents >= 0, digits / powers, digits * powers),
+                                          values[convertible])
+    return rounded, unsure
+
+
+class Conversion:
+
+    def __init__(self, factor, offset=0):
+        self.__factor = float(factor)
+        self.__exact_factor = Fraction(factor)
+        self.__offset = offset
+
+    def convert(self, value):
+        # Floats get the right answer unless a result lands within float error of a rounding tie, in which case
+        # the conversion is done again with exact fractions
+        value = float(value)
+        converted = round_significant(value * self.__factor)
+        if converted is not None and self.__offset != 0:
+            converted = round_significant(converted + self.__offset)
+        if converted is None:
+            exact = round_significant_exactly(Fraction(value) * self.__exact_factor)
+            if self.__offset != 0:
+                exact = round_significant_exactly(exact + self.__offset)
+            converted = float(exact)
+        return converted
+
+    def convert_all(self, values):
+        if not is_numpy_array(values):
+            return array.array("d", [self.convert(value) for value in values])
+        values = numpy.asarray(values, dtype=float)
+        converted, unsure = round_significant_array(values * self.__factor)
+        if self.__offset != 0:
+            converted, offset_unsure = round_significant_array(converted + self.__offset)
+            unsure |= offset_unsure
+        for index in numpy.flatnonzero(unsure):
+            converted[index] = self.convert(values[index])
+        return converted
+
+
+def is_numpy_array(values):
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def copy_all(values):
+    if is_numpy_array(values):
+        return values.copy()
+    elif isinstance(values, array.array):
+        return array.array(values.typecode, values)
+    else:
+        return array.array("d", values)
+
+
+def convert_pressures(hectopascals, pressure_unit):
+    if pressure_unit is PressureUnit.HECTOPASCALS or pressure_unit is PressureUnit.MILLIBARS:
+        return copy_all(hectopascals)
+    elif pressure_unit is PressureUnit.KILOPASCALS:
+        return Pressure.KILOPASCALS.convert_all(hectopascals)
+    elif pressure_unit is PressureUnit.INCHES_OF_MERCURY:
+        return Pressure.INCHES_OF_MERCURY.convert_all(hectopascals)
+    else:
+        return Pressure.MILLIMETRES_OF_MERCURY.convert_all(hectopascals)
+
+
+def convert_rainfalls(millimetres, rainfall_unit):
+    if rainfall_unit is RainfallUnit.MILLIMETRES:
+        return copy_all(millimetres)
+    else:
+        return Rainfall.INCHES.convert_all(millimetres)
+
+
+def convert_temperatures(celsius, temperature_unit):
+    if temperature_unit is TemperatureUnit.CELSIUS:
+        return copy_all(celsius)
+    else:
+        return Temperature.FAHRENHEIT.convert_all(celsius)
+
+
+def convert_wind_directions(compass_degrees, wind_direction_unit):
+    if wind_direction_unit is WindDirectionUnit.COMPASS_DEGREES:
+        return copy_all(compass_degrees)
+    elif is_numpy_array(compass_degrees):
+        # Missing readings are NaN and come back masked rather than as a direction
+        compass_degrees = numpy.asarray(compass_degrees, dtype=float)
+        missing = numpy.isnan(compass_degrees)
+        indexes = numpy.trunc((numpy.where(missing, 0.0, compass_degrees) + 11) / 22.5).astype(int) % 16
+        return numpy.ma.masked_array(numpy.array(WindDirection.CARDINAL_DIRECTIONS)[indexes], mask=missing)
+    else:
+        return [None if math.isnan(degrees) else WindDirection(degrees).get_value(wind_direction_unit)
+                for degrees in compass_degrees]
+
+
+def convert_wind_speeds(knots, wind_speed_unit):
+    if wind_speed_unit is WindSpeedUnit.KNOTS:
+        return copy_all(knots)
+    elif wind_speed_unit is WindSpeedUnit.METRES_PER_SECOND:
+        return WindSpeed.METRES_PER_SECOND.convert_all(knots)
+    elif wind_speed_unit is WindSpeedUnit.KILOMETRES_PER_HOUR:
+        return WindSpeed.KILOMETRES_PER_HOUR.convert_all(knots)
+    elif wind_speed_unit is WindSpeedUnit.MILES_PER_HOUR:
+        return WindSpeed.MILES_PER_HOUR.convert_all(knots)
+    elif is_numpy_array(knots):
+        return BEAUFORT_SCALE.classify_all(knots)
+    else:
+        return array.array("q", [MISSING_BEAUFORT_FORCE if force is None else force
+                                 for force in BEAUFORT_SCALE.classify_all(knots)])
+
+
+class Measure:
+
+    # Measures never change once built so one instance can safely stand in for every reading of the same value
+
+    __slots__ = ()
+
+    @classmethod
+    def interned(cls, value):
+        return intern_measure(cls, value)
+
+
+@functools.lru_cache(maxsize=INTERN_CACHE_SIZE, typed=True)
+def intern_measure(measure_class, value):
+    return measure_class(value)
+
+
+class Pressure(Measure):
+
+    __slots__ = ("__hectopascals", "__kilopascals", "__inches_of_mercury", "__millimetres_of_mercury")
+
+    KILOPASCALS = Conversion(Fraction(1, 10))
+    INCHES_OF_MERCURY = Conversion(0.02953)
+    MILLIMETRES_OF_MERCURY = Conversion(0.750062)
 
     def __init__(self, hectopascals):
-        with localcontext() as context:
-            setup_decimal_context(context)
-            self.__hectopascals = hectopascals
-            self.__millibars = hectopascals
-            self.__kilopascals = float(Decimal(hectopascals) / 10)
-            self.__inches_of_mercury = float(Decimal(hectopascals) * Decimal(0.02953))
-            self.__millimeters_of_mercury = float(Decimal(hectopascals) * Decimal(0.750062))
+        self.__hectopascals = hectopascals
+        self.__kilopascals = None
+        self.__inches_of_mercury = None
+        self.__millimetres_of_mercury = None
 
     def get_value(self, pressure_unit):
-        if pressure_unit is PressureUnit.HECTOPASCALS:
+        if pressure_unit is PressureUnit.HECTOPASCALS or pressure_unit is PressureUnit.MILLIBARS:
             return self.__hectopascals
-        elif pressure_unit is PressureUnit.MILLIBARS:
-            return self.__millibars
         elif pressure_unit is PressureUnit.KILOPASCALS:
+            if self.__kilopascals is None:
+                self.__kilopascals = self.KILOPASCALS.convert(self.__hectopascals)
             return self.__kilopascals
         elif pressure_unit is PressureUnit.INCHES_OF_MERCURY:
+            if self.__inches_of_mercury is None:
+                self.__inches_of_mercury = self.INCHES_OF_MERCURY.convert(self.__hectopascals)
             return self.__inches_of_mercury
         else:
-            return self.__millimeters_of_mercury
+            if self.__millimetres_of_mercury is None:
+                self.__millimetres_of_mercury = self.MILLIMETRES_OF_MERCURY.convert(self.__hectopascals)
+            return self.__millimetres_of_mercury
+
+
+class Rainfall(Measure):
 
+    __slots__ = ("__millimetres", "__inches")
 
-class Rainfall:
+    INCHES = Conversion(1 / 25.4)
 
     def __init__(self, millimetres):
-        with localcontext() as context:
-            setup_decimal_context(context)
-            self.__millimetres = millimetres
-            self.__inches = float(Decimal(millimetres) * Decimal(1 / 25.4))
+        self.__millimetres = millimetres
+        self.__inches = None
 
     def get_value(self, rainfall_unit):
         if rainfall_unit is RainfallUnit.MILLIMETRES:
             return self.__millimetres
-        else:
-            return self.__inches
+        if self.__inches is None:
+            self.__inches = self.INCHES.convert(self.__millimetres)
+        return self.__inches
+
+
+class Temperature(Measure):
 
+    __slots__ = ("__celsius", "__fahrenheit")
 
-class Temperature:
+    FAHRENHEIT = Conversion(1.8, 32)
 
     def __init__(self, celsius):
-        with localcontext() as context:
-            setup_decimal_context(context)
-            self.__celsius = celsius
-            self.__fahrenheit = float((Decimal(celsius) * Decimal(1.8)) + 32)
+        self.__celsius = celsius
+        self.__fahrenheit = None
 
     def get_value(self, temperature_unit):
         if temperature_unit is TemperatureUnit.CELSIUS:
             return self.__celsius
-        else:
-            return self.__fahrenheit
+        if self.__fahrenheit is None:
+            self.__fahrenheit = self.FAHRENHEIT.convert(self.__celsius)
+        return self.__fahrenheit
 
 
 class Trend:
 
+    # Plain constants rather than objects, so every trend is already shared
+
     RISING = 1
     FALLING = 2
     STEADY = 3
 
 
-class WindDirection:
+class WindDirection(Measure):
+
+    __slots__ = ("__compass_degrees", "__cardinal_direction")
 
     CARDINAL_DIRECTIONS = ["N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
                            "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW"]
@@ -90,56 +303,37 @@ class WindDirection:
             return self.__cardinal_direction
 
 
-class WindSpeed:
+class WindSpeed(Measure):
+
+    __slots__ = ("__knots", "__metres_per_second", "__kilometres_per_hour", "__miles_per_hour", "__beaufort_scale")
+
+    METRES_PER_SECOND = Conversion(0.514444)
+    KILOMETRES_PER_HOUR = Conversion(1.852)
+    MILES_PER_HOUR = Conversion(1.15078)
 
     def __init__(self, knots):
-        with localcontext() as context:
-            setup_decimal_context(context)
-            self.__knots = knots
-            self.__metres_per_second = float(Decimal(knots) * Decimal(0.514444))
-            self.__kilometres_per_hour = float(Decimal(knots) * Decimal(1.852))
-            self.__miles_per_hour = float(Decimal(knots) * Decimal(1.15078))
-            self.__beaufort_scale = self.__calculate_beaufort_scale()
-
-    def __calculate_beaufort_scale(self):
-        with localcontext() as context:
-            context.rounding = ROUND_HALF_UP
-            rounded_knots = round(Decimal(self.__knots), 0)
-            if rounded_knots < 1:
-                return 0
-            elif 1 <= rounded_knots <= 3:
-                return 1
-            elif 4 <= rounded_knots <= 6:
-                return 2
-            elif 7 <= rounded_knots <= 10:
-                return 3
-            elif 11 <= rounded_knots <= 16:
-                return 4
-            elif 17 <= rounded_knots <= 21:
-                return 5
-            elif 22 <= rounded_knots <= 27:
-                return 6
-            elif 28 <= rounded_knots <= 33:
-                return 7
-            elif 34 <= rounded_knots <= 40:
-                return 8
-            elif 41 <= rounded_knots <= 47:
-                return 9
-            elif 48 <= rounded_knots <= 55:
-                return 10
-            elif 56 <= rounded_knots <= 63:
-                return 11
-            else:
-                return 12
+        self.__knots = knots
+        self.__metres_per_second = None
+        self.__kilometres_per_hour = None
+        self.__miles_per_hour = None
+        self.__beaufort_scale = None
 
     def get_value(self, wind_speed_unit):
         if wind_speed_unit is WindSpeedUnit.KNOTS:
             return self.__knots
         elif wind_speed_unit is WindSpeedUnit.METRES_PER_SECOND:
+            if self.__metres_per_second is None:
+                self.__metres_per_second = self.METRES_PER_SECOND.convert(self.__knots)
             return self.__metres_per_second
         elif wind_speed_unit is WindSpeedUnit.KILOMETRES_PER_HOUR:
+            if self.__kilometres_per_hour is None:
+                self.__kilometres_per_hour = self.KILOMETRES_PER_HOUR.convert(self.__knots)
             return self.__kilometres_per_hour
         elif wind_speed_unit is WindSpeedUnit.MILES_PER_HOUR:
+            if self.__miles_per_hour is None:
+                self.__miles_per_hour = self.MILES_PER_HOUR.convert(self.__knots)
             return self.__miles_per_hour
         else:
+            if self.__beaufort_scale is None:
+                self.__beaufort_scale = BEAUFORT_SCALE.classify(self.__knots)
             return self.__beaufort_scale
@@ -5,18 +5,39 @@ import pifacecad
 import sys
 import threading
 import time
-import urllib.request
-import urllib.error
-from clientraw import ClientRaw
+from display import PiFaceCadDisplay
+from fetcher import ClientRawFileFetcher
+from fetcher import create_fetcher
+from fetcher import get_sibling_source
+from history import CLIENTRAW_DAILY
+from history import CLIENTRAW_EXTRA
+from history import CLIENTRAW_HOUR
+from history import ClientRawDaily
+from history import ClientRawExtra
+from history import ClientRawHour
+from ingest import ClientRawIngestServer
+from ingest import is_ingest_address
+from lcd import GlyphManager
+from lcd import LCD_WIDTH
+from lcd import LcdRenderer
+from scheduler import CircuitBreaker
+from scheduler import IntervalScheduler
+from scheduler import PollScheduler
 from settings import Settings
+from updater import ClientRawUpdater
 from weatheritems import WeatherItemFactory
+from weatheritems import WeatherItemType
 
 UPDATE_TIME_SECS = 60
+LOCAL_UPDATE_TIME_SECS = 2
+HOUR_UPDATE_TIME_SECS = 5 * 60
+EXTRA_UPDATE_TIME_SECS = 15 * 60
+DAILY_UPDATE_TIME_SECS = 60 * 60
+MAXIMUM_BACKOFF_SECS = 15 * 60
+CONNECT_TIMEOUT_SECS = 5
+READ_TIMEOUT_SECS = 10
 
-DEGREE_BITMAP = 0
-RISING_BITMAP = 1
-FALLING_BITMAP = 2
-STEADY_BITMAP = 3
+STALE_INDICATOR = b"!"
 
 BUTTON_1_PRESSED = 0
 BUTTON_2_PRESSED = 1
@@ -27,22 +48,15 @@ TOGGLE_PRESSED = 5
 TOGGLE_LEFT = 6
 TOGGLE_RIGHT = 7
 
-settings = Settings()
-clientraw = None
-
-
-def setup_bitmaps():
-    degree = pifacecad.LCDBitmap([0b01110, 0b01010, 0b01110, 0b00000, 0b00000, 0b00000, 0b00000, 0b00000])
-    cad.lcd.store_custom_bitmap(DEGREE_BITMAP, degree)
-
-    rising = pifacecad.LCDBitmap([0b00000, 0b01111, 0b00011, 0b00101, 0b01001, 0b10000, 0b00000, 0b00000])
-    cad.lcd.store_custom_bitmap(RISING_BITMAP, rising)
+HISTORY_FILES = {ClientRawHour: (CLIENTRAW_HOUR, HOUR_UPDATE_TIME_SECS),
+                 ClientRawExtra: (CLIENTRAW_EXTRA, EXTRA_UPDATE_TIME_SECS),
+                 ClientRawDaily: (CLIENTRAW_DAILY, DAILY_UPDATE_TIME_SECS)}
 
-    falling = pifacecad.LCDBitmap([0b00000, 0b10000, 0b01001, 0b00101, 0b00011, 0b01111, 0b00000, 0b00000])
-    cad.lcd.store_custom_bitmap(FALLING_BITMAP, falling)
-
-    steady = pifacecad.LCDBitmap([0b00000, 0b00100, 0b00010, 0b11111, 0b00010, 0b00100, 0b00000, 0b00000])
-    cad.lcd.store_custom_bitmap(STEADY_BITMAP, steady)
+settings = Settings()
+displayed_clientraw = None
+displayed_stale = False
+history_sources = {}
+history_lock = threading.Lock()
 
 
 def setup_switch_listeners():
@@ -75,10 +89,10 @@ def toggle_backlight(event=None):
     global backlight_on
     if backlight_on:
         backlight_on = False
-        cad.lcd.backlight_off()
+        display.backlight_off()
     else:
         backlight_on = True
-        cad.lcd.backlight_on()
+        display.backlight_on()
 
 
 def previous_weather_item(event):
@@ -116,35 +130,77 @@ def change_rainfall_unit(event):
     update_display()
 
 
-def fetch_clientraw():
-    global clientraw
-    try:
-        response = urllib.request.urlopen(clientraw_url)
-    except urllib.error.URLError:
-        clientraw = None
-    else:
-        content = response.read().decode("UTF-8")
-        clientraw = ClientRaw(content)
+def clientraw_updated(clientraw):
+    global displayed_clientraw
+    # Only redraw when something the visible weather item depends on has changed. The lock is held from comparing to
+    # drawing so a button press can't draw an older snapshot over this one and leave it there
+    with display_lock:
+        if clientraw_source.is_stale() == displayed_stale and is_displayable(displayed_clientraw) and\
+                is_displayable(clientraw) and\
+                not WeatherItemType().is_changed(settings.get_weather_item_type(), displayed_clientraw, clientraw):
+            displayed_clientraw = clientraw
+        else:
+            update_display()
+
+
+def history_updated(history_class):
+    # Only the weather item drawn from this file needs redrawing
+    if WeatherItemType().get_history_class(settings.get_weather_item_type()) is history_class:
+        update_display()
+
+
+def create_history_source(file_name, history_class, update_time_secs):
+    history_fetcher = create_fetcher(get_sibling_source(sys.argv[1], file_name), CONNECT_TIMEOUT_SECS,
+                                     READ_TIMEOUT_SECS, history_class)
+    return ClientRawUpdater(history_fetcher, IntervalScheduler(update_time_secs),
+                            CircuitBreaker(update_time_secs, MAXIMUM_BACKOFF_SECS),
+                            lambda history: history_updated(history_class))
+
+
+def get_history(history_class):
+    # Many hosts never publish the history files, so each one is only polled from the first time a weather item
+    # asks for it. Pushed clientraw has nowhere to fetch history from
+    if is_ingest_address(sys.argv[1]):
+        return None
+    with history_lock:
+        if history_class not in history_sources:
+            file_name, update_time_secs = HISTORY_FILES[history_class]
+            history_sources[history_class] = create_history_source(file_name, history_class, update_time_secs)
+            history_sources[history_class].start()
+        return history_sources[history_class].get_clientraw()
+
+
+def is_displayable(clientraw):
+    return clientraw is not None and clientraw.is_valid()
 
 
 def update_display():
-    if clientraw is None:
-        display_message("CLIENTRAW IS\nUNAVAILABLE")
-    elif clientraw.is_empty():
-        display_message("CLIENTRAW IS\nEMPTY")
-    elif not clientraw.is_valid():
-        display_message("CLIENTRAW IS\nINVALID")
-    else:
-        display_weather_item(WeatherItemFactory(clientraw, settings).get_weather_item())
+    global displayed_clientraw, displayed_stale
+    # Called from both the updater and button presses, so what is drawn always matches what is recorded as shown
+    with display_lock:
+        clientraw = clientraw_source.get_clientraw()
+        displayed_clientraw = clientraw
+        displayed_stale = clientraw_source.is_stale()
+        if clientraw is None:
+            display_message("CLIENTRAW IS\nUNAVAILABLE")
+        elif clientraw.is_empty():
+            display_message("CLIENTRAW IS\nEMPTY")
+        elif not clientraw.is_valid():
+            display_message("CLIENTRAW IS\nINVALID")
+        else:
+            weather_item_factory = WeatherItemFactory(clientraw, settings, lcd=True, get_history=get_history)
+            display_weather_item(weather_item_factory.get_weather_item(), displayed_stale)
 
 
 def setup_display():
-    global cad, backlight_on
+    global cad, display, backlight_on, renderer
     cad = pifacecad.PiFaceCAD()
-    cad.lcd.blink_off()
-    cad.lcd.cursor_off()
-    cad.lcd.backlight_off()
+    display = PiFaceCadDisplay(cad.lcd)
+    display.blink_off()
+    display.cursor_off()
+    display.backlight_off()
     backlight_on = False
+    renderer = LcdRenderer(display, glyph_manager=GlyphManager(display))
 
 
 def display_startup_message():
@@ -154,43 +210,23 @@ def display_startup_message():
     toggle_backlight()
 
 
-def display_weather_item(weather_item):
-    display_lock.acquire()
-    cad.lcd.clear()
-    display_line(weather_item.get_line1())
-    cad.lcd.write("\n")
-    display_line(weather_item.get_line2())
-    display_lock.release()
-
-
-def display_line(line):
-    for c in line:
-        if c == "°":
-            display_bitmap(DEGREE_BITMAP)
-        elif c == "➚":
-            display_bitmap(RISING_BITMAP)
-        elif c == "➙":
-            display_bitmap(STEADY_BITMAP)
-        elif c == "➘":
-            display_bitmap(FALLING_BITMAP)
-        else:
-            cad.lcd.write(c)
-
-
-def display_bitmap(bitmap):
-    cad.lcd.write_custom_bitmap(bitmap)
+def display_weather_item(weather_item, stale):
+    line1 = weather_item.get_line1()
+    if stale:
+        line1 = line1[:LCD_WIDTH-1].ljust(LCD_WIDTH-1) + STALE_INDICATOR
+    with display_lock:
+        renderer.render([line1, weather_item.get_line2()])
 
 
 def display_message(message):
-    display_lock.acquire()
-    cad.lcd.clear()
-    cad.lcd.write(message)
-    display_lock.release()
+    with display_lock:
+        renderer.render(message.split("\n"))
 
 
 if __name__ == '__main__':
 
-    display_lock = threading.Lock()
+    # Re-entrant since redrawing holds it while the display functions take it again
+    display_lock = threading.RLock()
 
     setup_display()
     display_startup_message()
@@ -199,13 +235,21 @@ if __name__ == '__main__':
         display_message("CLIENTRAW URL\nREQUIRED")
         sys.exit(1)
 
-    clientraw_url = sys.argv[1]
-    setup_bitmaps()
+    if is_ingest_address(sys.argv[1]):
+        clientraw_source = ClientRawIngestServer(sys.argv[1], clientraw_updated)
+    else:
+        clientraw_fetcher = create_fetcher(sys.argv[1], CONNECT_TIMEOUT_SECS, READ_TIMEOUT_SECS)
+        if isinstance(clientraw_fetcher, ClientRawFileFetcher):
+            poll_scheduler = PollScheduler(LOCAL_UPDATE_TIME_SECS)
+        else:
+            poll_scheduler = PollScheduler(UPDATE_TIME_SECS)
+        clientraw_source = ClientRawUpdater(clientraw_fetcher, poll_scheduler,
+                                            CircuitBreaker(UPDATE_TIME_SECS, MAXIMUM_BACKOFF_SECS),
+                                            clientraw_updated)
+    display_message("UPDATING...")
+    clientraw_source.start()
     setup_switch_listeners()
     setup_remote_listeners()
 
     while True:
-        display_message("UPDATING...")
-        fetch_clientraw()
-        update_display()
         time.sleep(UPDATE_TIME_SECS)
@@ -0,0 +1,71 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import bisect
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def round_half_up(value):
+    # Halves round away from zero, as Decimal's ROUND_HALF_UP does
+    magnitude = abs(value)
+    whole = math.floor(magnitude)
+    if magnitude - whole >= 0.5:
+        whole += 1
+    return math.copysign(whole, value)
+
+
+def round_half_down(value):
+    # Halves round towards zero, as Decimal's ROUND_HALF_DOWN does
+    magnitude = abs(value)
+    whole = math.floor(magnitude)
+    if magnitude - whole > 0.5:
+        whole += 1
+    return math.copysign(whole, value)
+
+
+class Scale:
+
+    # Places a reading on a scale by rounding it to a whole number and looking up the band it falls in. Each
+    # threshold is the lowest rounded reading of the rating after it, so there is one more rating than thresholds
+
+    def __init__(self, thresholds, ratings, halves_up):
+        self.__thresholds = thresholds
+        self.__ratings = ratings
+        self.__halves_up = halves_up
+
+    def get_thresholds(self):
+        return self.__thresholds
+
+    def classify(self, value):
+        # Missing readings, which archive columns hold as NaN, have no rating
+        if math.isnan(value):
+            return None
+        if self.__halves_up:
+            rounded = round_half_up(value)
+        else:
+            rounded = round_half_down(value)
+        return self.__ratings[bisect.bisect_right(self.__thresholds, rounded)]
+
+    def classify_all(self, values):
+        if numpy is None or not isinstance(values, numpy.ndarray):
+            return [self.classify(value) for value in values]
+        values = numpy.asarray(values, dtype=float)
+        missing = numpy.isnan(values)
+        values = numpy.where(missing, 0.0, values)
+        magnitudes = numpy.abs(values)
+        whole = numpy.floor(magnitudes)
+        if self.__halves_up:
+            whole += magnitudes - whole >= 0.5
+        else:
+            whole += magnitudes - whole > 0.5
+        indexes = numpy.searchsorted(self.__thresholds, numpy.copysign(whole, values), side="right")
+        return numpy.ma.masked_array(numpy.asarray(self.__ratings)[indexes], mask=missing)
+
+
+BEAUFORT_SCALE = Scale([1, 4, 7, 11, 17, 22, 28, 34, 41, 48, 56, 64], list(range(0, 13)), True)
+UV_INDEX_CATEGORIES = Scale([3, 6, 8, 11], ["low", "moderate", "high", "very high", "extreme"], False)
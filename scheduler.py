@@ -0,0 +1,142 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import random
+from collections import deque
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class PollScheduler:
+
+    MARGIN_SECS = 2
+    MINIMUM_DELAY_SECS = 1
+    MINIMUM_OBSERVATIONS = 3
+    MAXIMUM_PERIOD_MINUTES = 60
+    HISTORY_SIZE = 60
+
+    def __init__(self, default_interval_secs):
+        self.__default_interval_secs = default_interval_secs
+        self.__periods = deque(maxlen=self.HISTORY_SIZE)
+        self.__visible_offsets = deque(maxlen=self.HISTORY_SIZE)
+        self.__hidden_offsets = deque(maxlen=self.HISTORY_SIZE)
+        self.__station_time = None
+        self.__last_fetch_changed = False
+
+    def record_fetch(self, clientraw, fetch_time):
+        station_time = self.__get_station_time(clientraw)
+        if station_time is None:
+            return
+
+        # Offsets map the station's clock onto the local one. A fetch that sees a new upload bounds the upload's
+        # local time from above and one that still sees the previous upload bounds the next one from below
+        if station_time == self.__station_time:
+            self.__last_fetch_changed = False
+            period = self.get_period()
+            if period is not None and len(self.__visible_offsets) > 0:
+                hidden = (fetch_time - station_time - period) % SECONDS_PER_DAY
+                if self.__centre(hidden - self.__visible_offsets[-1]) >= self.__get_visible_offset():
+                    # The station now uploads later than it used to so start learning its phase again
+                    self.__visible_offsets.clear()
+                    self.__hidden_offsets.clear()
+                else:
+                    self.__hidden_offsets.append(hidden)
+            return
+
+        if self.__station_time is not None:
+            period_minutes = ((station_time - self.__station_time) % SECONDS_PER_DAY) // SECONDS_PER_MINUTE
+            if 0 < period_minutes <= self.MAXIMUM_PERIOD_MINUTES:
+                self.__periods.append(period_minutes * SECONDS_PER_MINUTE)
+
+        self.__last_fetch_changed = True
+        self.__visible_offsets.append((fetch_time - station_time) % SECONDS_PER_DAY)
+        self.__station_time = station_time
+
+    def get_delay(self, now):
+        period = self.get_period()
+        if period is None or len(self.__visible_offsets) == 0:
+            return self.__default_interval_secs
+
+        reference = self.__visible_offsets[-1]
+        visible = self.__get_visible_offset()
+        hidden = [self.__centre(offset - reference) for offset in self.__hidden_offsets]
+        hidden = max([offset for offset in hidden if offset < visible], default=visible - period)
+
+        # Once an upload has been caught, probe half way into the window the next one can land in, so that the
+        # estimate converges on the real upload time while costing at most one extra poll per upload
+        if self.__last_fetch_changed and visible - hidden > 2 * self.MARGIN_SECS:
+            offset = reference + (hidden + visible) / 2
+        else:
+            offset = reference + visible + self.MARGIN_SECS
+
+        next_fetch = now - self.__centre(now - offset - self.__station_time)
+        while next_fetch <= now:
+            next_fetch += period
+        return max(next_fetch - now, self.MINIMUM_DELAY_SECS)
+
+    def get_period(self):
+        if len(self.__periods) < self.MINIMUM_OBSERVATIONS:
+            return None
+        # Missed uploads show up as multiples of the real period so trust the shortest one, but only once it
+        # has been seen more than once
+        period = min(self.__periods)
+        if self.__periods.count(period) < 2:
+            return None
+        return period
+
+    def __get_visible_offset(self):
+        reference = self.__visible_offsets[-1]
+        return min(self.__centre(offset - reference) for offset in self.__visible_offsets)
+
+    def __centre(self, seconds):
+        return ((seconds + SECONDS_PER_DAY // 2) % SECONDS_PER_DAY) - SECONDS_PER_DAY // 2
+
+    def __get_station_time(self, clientraw):
+        if clientraw is None or not clientraw.is_valid():
+            return None
+        hour = clientraw.get_hour()
+        minute = clientraw.get_minute()
+        if hour is None or minute is None:
+            return None
+        return (hour * 60 + minute) * SECONDS_PER_MINUTE
+
+
+class IntervalScheduler:
+
+    # For files whose upload times can't be learned from their content, e.g. the clientraw history files
+
+    def __init__(self, interval_secs):
+        self.__interval_secs = interval_secs
+
+    def record_fetch(self, clientraw, fetch_time):
+        pass
+
+    def get_delay(self, now):
+        return self.__interval_secs
+
+
+class CircuitBreaker:
+
+    FAILURE_THRESHOLD = 3
+
+    def __init__(self, base_delay_secs, maximum_delay_secs, jitter=random.random):
+        self.__base_delay_secs = base_delay_secs
+        self.__maximum_delay_secs = maximum_delay_secs
+        self.__jitter = jitter
+        self.__failures = 0
+
+    def record_success(self):
+        self.__failures = 0
+
+    def record_failure(self):
+        self.__failures += 1
+
+    def is_open(self):
+        return self.__failures >= self.FAILURE_THRESHOLD
+
+    def get_delay(self):
+        exponent = min(self.__failures - self.FAILURE_THRESHOLD, 32)
+        delay = min(self.__base_delay_secs * 2 ** exponent, self.__maximum_delay_secs)
+        # Jitter spreads retries from many consoles so they do not all land on a recovering host at once
+        return delay / 2 + self.__jitter() * delay / 2
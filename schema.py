@@ -0,0 +1,74 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+MISSING = b"-"
+
+
+class ClientRawField(int):
+
+    # A field is its own position in clientraw so it can be used anywhere a plain field index is expected
+
+    def __new__(cls, index, value_type, measure=None, missing=MISSING):
+        field = int.__new__(cls, index)
+        field.name = None
+        field.value_type = value_type
+        field.measure = measure
+        field.missing = missing
+        return field
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __getnewargs__(self):
+        # Lets fields travel to and from worker processes along with anything keyed by them
+        return int(self), self.value_type, self.measure, self.missing
+
+    def parse(self, raw_field):
+        return parse_value(raw_field, self.value_type, self.measure, self.missing)
+
+    def __repr__(self):
+        return "ClientRawField(" + str(self.name) + "=" + str(int(self)) + ")"
+
+
+class ClientRawSeries:
+
+    # A run of consecutive fields holding readings of the same kind, e.g. one per minute over the last hour
+
+    def __init__(self, start, length, value_type, measure=None, missing=MISSING):
+        self.name = None
+        self.start = start
+        self.length = length
+        self.value_type = value_type
+        self.measure = measure
+        self.missing = missing
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def parse(self, raw_fields):
+        return [parse_value(raw_field, self.value_type, self.measure, self.missing) for raw_field in raw_fields]
+
+    def __repr__(self):
+        return "ClientRawSeries(" + str(self.name) + "=" + str(self.start) + "+" + str(self.length) + ")"
+
+
+def parse_value(raw_field, value_type, measure=None, missing=MISSING):
+    if raw_field is None or raw_field == missing:
+        return None
+    try:
+        value = value_type(raw_field)
+    except ValueError:
+        return None
+    if measure is not None:
+        return measure(value)
+    return value
+
+
+def get_fields(schema):
+    fields = [value for value in vars(schema).values() if isinstance(value, ClientRawField)]
+    return sorted(fields)
+
+
+def get_series(schema):
+    series = [value for value in vars(schema).values() if isinstance(value, ClientRawSeries)]
+    return sorted(series, key=lambda value: value.start)
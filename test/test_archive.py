@@ -0,0 +1,172 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import io
+import math
+import os
+import tempfile
+import unittest
+from archive import ClientRawColumns
+from archive import ProgressReport
+from archive import load_directory
+from archive import load_directory_parallel
+from archive import load_stream
+from clientraw import ClientRaw
+from units import TemperatureUnit
+
+
+class TestClientRawColumns(unittest.TestCase):
+
+    def test_default_fields(self):
+        self.assertEqual(ClientRaw.get_fields(), ClientRawColumns().get_fields())
+
+    def test_add(self):
+        testee = ClientRawColumns()
+        self.assertTrue(testee.add(b"12345 4.3 5.1 180 12.5 85 1012.5 !!C10.37S142!!"))
+        self.assertTrue(testee.add("12345 5.3 - 190.5 -1.5 blah 1013.0 !!C10.37S142!!"))
+        self.assertEqual(2, testee.get_length())
+        self.assertEqual([4.3, 5.3], list(testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS)))
+        self.assertEqual([12.5, -1.5], list(testee.get_column(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS)))
+        self.assertEqual(bytearray([1, 0]), testee.get_mask(ClientRaw.GUST_SPEED_KNOTS))
+        self.assertTrue(math.isnan(testee.get_column(ClientRaw.GUST_SPEED_KNOTS)[1]))
+        self.assertEqual([180, 0], list(testee.get_column(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES)))
+        self.assertEqual(bytearray([1, 0]), testee.get_mask(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES))
+        self.assertEqual(bytearray([1, 0]), testee.get_mask(ClientRaw.OUTDOOR_HUMIDITY))
+
+    def test_typed_columns(self):
+        testee = ClientRawColumns()
+        testee.add(b"12345 4.3 5.1 180")
+        self.assertEqual("d", testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS).typecode)
+        self.assertEqual("q", testee.get_column(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES).typecode)
+
+    def test_short_snapshot(self):
+        testee = ClientRawColumns()
+        testee.add(b"12345 4.3")
+        self.assertEqual(bytearray([0]), testee.get_mask(ClientRaw.YEAR))
+        self.assertEqual(1, len(testee.get_column(ClientRaw.YEAR)))
+
+    def test_out_of_range_values_missing(self):
+        testee = ClientRawColumns()
+        self.assertTrue(testee.add(b"12345 4.3 5.1 99999999999999999999 12.5"))
+        self.assertTrue(testee.add(b"12345 4.3 5.1 180 12.5"))
+        self.assertEqual([0, 180], list(testee.get_column(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES)))
+        self.assertEqual(bytearray([0, 1]), testee.get_mask(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES))
+        for field in testee.get_fields():
+            self.assertEqual(2, len(testee.get_column(field)))
+            self.assertEqual(2, len(testee.get_mask(field)))
+
+    def test_out_of_range_timestamp(self):
+        content = ["12345"] + ["-"] * 140 + ["99999999999"]
+        testee = ClientRawColumns()
+        self.assertTrue(testee.add(" ".join(content)))
+        self.assertEqual([0], list(testee.get_timestamps()))
+
+    def test_invalid_snapshot_rejected(self):
+        testee = ClientRawColumns()
+        self.assertFalse(testee.add(b"54321 4.3 5.1 180"))
+        self.assertFalse(testee.add(b""))
+        self.assertEqual(0, testee.get_length())
+        self.assertEqual(2, testee.get_rejected())
+        self.assertEqual(0, len(testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS)))
+
+    def test_validated_as_clientraw(self):
+        testee = ClientRawColumns()
+        for content in [b"12345 1 2", b" 12345 1 2", b"12345\t1 2", b"123456 1 2", b"12345 1 2\r\n"]:
+            self.assertEqual(ClientRaw(content.rstrip(b"\r\n")).is_valid(), testee.add(content))
+        self.assertEqual(2, testee.get_length())
+        self.assertEqual(3, testee.get_rejected())
+
+    def test_selected_fields(self):
+        testee = ClientRawColumns([ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS])
+        testee.add(b"12345 4.3 5.1 180 12.5")
+        self.assertEqual([ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS], testee.get_fields())
+        self.assertRaises(KeyError, testee.get_column, ClientRaw.AVERAGE_WIND_SPEED_KNOTS)
+
+    def test_matches_clientraw(self):
+        content = b"12345 4.3 5.1 180 12.5 85 1012.5 !!C10.37S142!!"
+        testee = ClientRawColumns()
+        testee.add(content)
+        self.assertEqual(ClientRaw(content).get_outdoor_temperature().get_value(TemperatureUnit.CELSIUS),
+                         testee.get_column(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS)[0])
+
+
+    def test_timestamps(self):
+        testee = ClientRawColumns()
+        testee.add(create_snapshot(4.3, 2015, 6, 21, 13, 5, 9))
+        testee.add(b"12345 4.3")
+        self.assertEqual([20150621130509, 0], list(testee.get_timestamps()))
+
+    def test_extend_and_sort(self):
+        testee = ClientRawColumns()
+        testee.add(create_snapshot(5.3, 2015, 6, 21, 13, 6, 0))
+        testee.add(b"54321")
+        other = ClientRawColumns()
+        other.add(create_snapshot(6.3, 2015, 6, 21, 13, 7, 0))
+        other.add(create_snapshot(4.3, 2015, 6, 21, 13, 5, 0).replace(b" 4.3 ", b" - "))
+        testee.extend(other)
+        testee.sort()
+        self.assertEqual(3, testee.get_length())
+        self.assertEqual(1, testee.get_rejected())
+        self.assertEqual([20150621130500, 20150621130600, 20150621130700], list(testee.get_timestamps()))
+        self.assertEqual(bytearray([0, 1, 1]), testee.get_mask(ClientRaw.AVERAGE_WIND_SPEED_KNOTS))
+        self.assertEqual([5.3, 6.3], list(testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS))[1:])
+
+
+class TestLoad(unittest.TestCase):
+
+    def test_load_stream(self):
+        testee = load_stream(io.BytesIO(b"12345 4.3 5.1 180\n\n54321 1.0\r\n12345 5.3 6.1 190\n"))
+        self.assertEqual(2, testee.get_length())
+        self.assertEqual(1, testee.get_rejected())
+        self.assertEqual([180, 190], list(testee.get_column(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES)))
+
+    def test_load_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name, content in (("b.txt", b"12345 5.3\n12345 6.3"), ("a.txt", b"12345 4.3")):
+                with open(os.path.join(directory, name), "wb") as archive_file:
+                    archive_file.write(content)
+            os.mkdir(os.path.join(directory, "subdirectory"))
+            testee = load_directory(directory)
+        self.assertEqual([4.3, 5.3, 6.3], list(testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS)))
+
+    def test_load_directory_parallel(self):
+        progress = []
+        with tempfile.TemporaryDirectory() as directory:
+            for minute in range(0, 20):
+                # Files named so directory order is the reverse of timestamp order
+                with open(os.path.join(directory, str(100 - minute) + ".txt"), "wb") as archive_file:
+                    archive_file.write(create_snapshot(minute, 2015, 6, 21, 13, minute, 0))
+            with open(os.path.join(directory, "invalid.txt"), "wb") as archive_file:
+                archive_file.write(b"54321")
+            testee = load_directory_parallel(directory, [ClientRaw.AVERAGE_WIND_SPEED_KNOTS], 2,
+                                             lambda loaded, total: progress.append((loaded, total)), 3)
+        self.assertEqual(20, testee.get_length())
+        self.assertEqual(1, testee.get_rejected())
+        self.assertEqual([float(minute) for minute in range(0, 20)],
+                         list(testee.get_column(ClientRaw.AVERAGE_WIND_SPEED_KNOTS)))
+        self.assertEqual((21, 21), progress[-1])
+        self.assertEqual(7, len(progress))
+
+
+class TestProgressReport(unittest.TestCase):
+
+    def test_report(self):
+        output = io.StringIO()
+        times = [100.0, 104.0]
+        testee = ProgressReport(output, lambda: times.pop(0))
+        testee(1000, 4000)
+        self.assertEqual("1000/4000 files, 250 files/s\n", output.getvalue())
+
+
+def create_snapshot(average_wind_speed, year, month, day, hour, minute, second):
+    fields = ["12345", str(average_wind_speed)] + ["-"] * 140
+    fields[ClientRaw.YEAR] = str(year)
+    fields[ClientRaw.MONTH] = str(month)
+    fields[ClientRaw.DAY] = str(day)
+    fields[ClientRaw.HOUR] = str(hour)
+    fields[ClientRaw.MINUTE] = str(minute)
+    fields[ClientRaw.SECOND] = str(second)
+    return " ".join(fields).encode("UTF-8")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,6 +24,12 @@ class TestClientRaw(unittest.TestCase):
         testee = ClientRaw("-")
         self.assertFalse(testee.is_empty())
 
+    def test_raw_field(self):
+        testee = ClientRaw("12345 4.3 - 180")
+        self.assertEqual(b"4.3", testee.get_raw_field(ClientRaw.AVERAGE_WIND_SPEED_KNOTS))
+        self.assertEqual(b"-", testee.get_raw_field(ClientRaw.GUST_SPEED_KNOTS))
+        self.assertIsNone(testee.get_raw_field(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS))
+
     #################################
     # Header Validation
     #################################
@@ -44,6 +50,34 @@ class TestClientRaw(unittest.TestCase):
         testee = ClientRaw(self.__gen_empty_client_raw_str(ClientRaw.HEADER-1))
         self.assertFalse(testee.is_valid())
 
+    #################################
+    # Completeness
+    #################################
+
+    def test_complete(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.HEADER, "12345") + " - !!C10.37S142!!")
+        self.assertTrue(testee.is_complete())
+
+    def test_complete_with_trailing_whitespace(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.HEADER, "12345") + " - !!C10.37S142!!\r\n")
+        self.assertTrue(testee.is_complete())
+
+    def test_truncated(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.HEADER, "12345") + " - !!C10.3")
+        self.assertFalse(testee.is_complete())
+
+    def test_no_trailer(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.HEADER, "12345") + " - -")
+        self.assertFalse(testee.is_complete())
+
+    def test_empty_is_not_complete(self):
+        testee = ClientRaw("")
+        self.assertFalse(testee.is_complete())
+
+    def test_bare_marker_is_not_complete(self):
+        testee = ClientRaw("12345 - !!")
+        self.assertFalse(testee.is_complete())
+
     #################################
     # Average Wind Speed
     #################################
@@ -488,6 +522,104 @@ class TestClientRaw(unittest.TestCase):
         testee = ClientRaw(self.__gen_empty_client_raw_str(ClientRaw.OUTDOOR_HUMIDITY_TREND-1))
         self.assertEqual(None, testee.get_outdoor_humidity_trend())
 
+    #################################
+    # Additional Fields
+    #################################
+
+    def test_additional_fields_populated(self):
+        self.__assert_field(ClientRaw.MONTHLY_RAINFALL_MILLIMETRES, "45.2", lambda testee:
+                            testee.get_monthly_rainfall().get_value(RainfallUnit.MILLIMETRES), 45.2)
+        self.__assert_field(ClientRaw.YEARLY_RAINFALL_MILLIMETRES, "612.4", lambda testee:
+                            testee.get_yearly_rainfall().get_value(RainfallUnit.MILLIMETRES), 612.4)
+        self.__assert_field(ClientRaw.YESTERDAY_RAINFALL_MILLIMETRES, "3.2", lambda testee:
+                            testee.get_yesterday_rainfall().get_value(RainfallUnit.MILLIMETRES), 3.2)
+        self.__assert_field(ClientRaw.MAXIMUM_RAINFALL_RATE_MILLIMETRES_PER_MINUTE, "0.4", lambda testee:
+                            testee.get_maximum_rainfall_rate().get_value(RainfallUnit.MILLIMETRES), 0.4)
+        self.__assert_field(ClientRaw.MAXIMUM_OUTDOOR_TEMPERATURE_CELSIUS, "27.1", lambda testee:
+                            testee.get_maximum_outdoor_temperature().get_value(TemperatureUnit.CELSIUS), 27.1)
+        self.__assert_field(ClientRaw.MINIMUM_OUTDOOR_TEMPERATURE_CELSIUS, "11.9", lambda testee:
+                            testee.get_minimum_outdoor_temperature().get_value(TemperatureUnit.CELSIUS), 11.9)
+        self.__assert_field(ClientRaw.MAXIMUM_GUST_SPEED_KNOTS, "21.3", lambda testee:
+                            testee.get_maximum_gust_speed().get_value(WindSpeedUnit.KNOTS), 21.3)
+        self.__assert_field(ClientRaw.SECOND, "42", lambda testee: testee.get_second(), 42)
+        self.__assert_field(ClientRaw.DAY, "18", lambda testee: testee.get_day(), 18)
+        self.__assert_field(ClientRaw.MONTH, "10", lambda testee: testee.get_month(), 10)
+        self.__assert_field(ClientRaw.YEAR, "2015", lambda testee: testee.get_year(), 2015)
+
+    def test_additional_fields_missing(self):
+        testee = ClientRaw(self.__gen_empty_client_raw_str(ClientRaw.YEAR))
+        self.assertEqual(None, testee.get_monthly_rainfall())
+        self.assertEqual(None, testee.get_yearly_rainfall())
+        self.assertEqual(None, testee.get_yesterday_rainfall())
+        self.assertEqual(None, testee.get_maximum_rainfall_rate())
+        self.assertEqual(None, testee.get_maximum_outdoor_temperature())
+        self.assertEqual(None, testee.get_minimum_outdoor_temperature())
+        self.assertEqual(None, testee.get_maximum_gust_speed())
+        self.assertEqual(None, testee.get_second())
+        self.assertEqual(None, testee.get_day())
+        self.assertEqual(None, testee.get_month())
+        self.assertEqual(None, testee.get_year())
+
+    #################################
+    # Schema
+    #################################
+
+    def test_fields(self):
+        fields = ClientRaw.get_fields()
+        self.assertIn(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS, fields)
+        self.assertNotIn(ClientRaw.HEADER, fields)
+        self.assertEqual(sorted(fields), fields)
+        self.assertEqual("OUTDOOR_TEMPERATURE_CELSIUS", ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS.name)
+
+    def test_get_value(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.OUTDOOR_HUMIDITY, "97"))
+        self.assertEqual(97, testee.get_value(ClientRaw.OUTDOOR_HUMIDITY))
+
+    def test_values_parsed_once(self):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS, "25.4"))
+        self.assertIs(testee.get_outdoor_temperature(), testee.get_outdoor_temperature())
+
+    def test_repeated_readings_shared(self):
+        first = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES, "270"))
+        second = ClientRaw(self.__gen_populated_client_raw_str(ClientRaw.WIND_DIRECTION_COMPASS_DEGREES, "270"))
+        self.assertIs(first.get_wind_direction(), second.get_wind_direction())
+
+    def test_missing_values_parsed_once(self):
+        testee = ClientRaw(self.__gen_empty_client_raw_str(ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS))
+        self.assertIsNone(testee.get_outdoor_temperature())
+        self.assertIsNone(testee.get_outdoor_temperature())
+
+    #################################
+    # Diff
+    #################################
+
+    def test_diff_identical(self):
+        testee = ClientRaw("12345 4.3 5.1 180")
+        self.assertEqual(set(), testee.diff(ClientRaw("12345 4.3 5.1 180")))
+
+    def test_diff_changed_fields(self):
+        testee = ClientRaw("12345 4.3 5.1 180")
+        self.assertEqual({1, 3}, testee.diff(ClientRaw("12345 4.4 5.1 270")))
+
+    def test_diff_different_field_counts(self):
+        testee = ClientRaw("12345 4.3 5.1 180")
+        self.assertEqual({3, 4}, testee.diff(ClientRaw("12345 4.3 5.1 - 25.4")))
+        self.assertEqual({2, 3}, testee.diff(ClientRaw("12345 4.3")))
+
+    def test_diff_empty(self):
+        self.assertEqual({0, 1}, ClientRaw("12345 4.3").diff(ClientRaw("")))
+        self.assertEqual(set(), ClientRaw("").diff(ClientRaw("")))
+
+    def test_diff_restricted_to_fields(self):
+        testee = ClientRaw("12345 4.3 5.1 180")
+        other = ClientRaw("12345 4.4 5.1 270")
+        self.assertEqual({3}, testee.diff(other, [ClientRaw.GUST_SPEED_KNOTS, ClientRaw.WIND_DIRECTION_COMPASS_DEGREES]))
+        self.assertEqual(set(), testee.diff(other, [ClientRaw.GUST_SPEED_KNOTS, ClientRaw.OUTDOOR_HUMIDITY]))
+
+    def __assert_field(self, field, value, get_value, expected):
+        testee = ClientRaw(self.__gen_populated_client_raw_str(field, value))
+        self.assertEqual(expected, get_value(testee))
+
     def __gen_populated_client_raw_str(self, position, value):
         if position > 0:
             return self.__gen_empty_client_raw_str(position-1) + " " + value
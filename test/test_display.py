@@ -0,0 +1,139 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import io
+import unittest
+from display import Display
+from display import PiFaceCadDisplay
+from display import SimulatedDisplay
+from lcd import DEGREE_CODE
+from lcd import GLYPH_BITMAPS
+from lcd import GlyphManager
+from lcd import LcdRenderer
+
+
+class RecordingLcd:
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name,) + args)
+
+
+class IncompleteDisplay(Display):
+
+    def clear(self):
+        pass
+
+
+class TestDisplay(unittest.TestCase):
+
+    def test_incomplete_display_not_created(self):
+        self.assertRaises(TypeError, IncompleteDisplay)
+
+
+class TestPiFaceCadDisplay(unittest.TestCase):
+
+    def test_calls_passed_to_lcd(self):
+        lcd = RecordingLcd()
+        testee = PiFaceCadDisplay(lcd)
+        testee.blink_off()
+        testee.cursor_off()
+        testee.backlight_on()
+        testee.backlight_off()
+        testee.clear()
+        testee.set_cursor(3, 1)
+        testee.write("15.2\x00C")
+        testee.store_custom_bitmap(0, GLYPH_BITMAPS[DEGREE_CODE])
+        self.assertEqual([("blink_off",), ("cursor_off",), ("backlight_on",), ("backlight_off",), ("clear",),
+                          ("set_cursor", 3, 1), ("write", "15.2\x00C"),
+                          ("store_custom_bitmap", 0, GLYPH_BITMAPS[DEGREE_CODE])], lcd.calls)
+
+
+class TestSimulatedDisplay(unittest.TestCase):
+
+    def setUp(self):
+        self.testee = SimulatedDisplay()
+
+    def test_starts_blank(self):
+        self.assertEqual([" " * 16, " " * 16], self.testee.get_lines())
+        self.assertEqual({"clears": 0, "cursor_moves": 0, "byte_writes": 0, "bitmap_uploads": 0},
+                         self.testee.get_counts())
+
+    def test_write_at_cursor(self):
+        self.testee.set_cursor(2, 1)
+        self.testee.write("Hi")
+        self.testee.write("!")
+        self.assertEqual([" " * 16, "  Hi!" + " " * 11], self.testee.get_lines())
+        self.assertEqual({"clears": 0, "cursor_moves": 1, "byte_writes": 3, "bitmap_uploads": 0},
+                         self.testee.get_counts())
+
+    def test_write_beyond_visible_cells(self):
+        self.testee.write("A" * 41)
+        self.assertEqual(["A" * 16, "A" + " " * 15], self.testee.get_lines())
+
+    def test_clear(self):
+        self.testee.set_cursor(5, 1)
+        self.testee.write("Hi")
+        self.testee.clear()
+        self.testee.write("Lo")
+        self.assertEqual(["Lo" + " " * 14, " " * 16], self.testee.get_lines())
+        self.assertEqual(1, self.testee.get_counts()["clears"])
+
+    def test_custom_bitmaps(self):
+        self.testee.store_custom_bitmap(5, GLYPH_BITMAPS[DEGREE_CODE])
+        self.testee.write("15\x05C \x0d \x00")
+        self.assertEqual("15°C ° █" + " " * 8, self.testee.get_lines()[0])
+        self.assertEqual(GLYPH_BITMAPS[DEGREE_CODE], self.testee.get_bitmap(2, 0))
+        self.assertEqual(None, self.testee.get_bitmap(0, 0))
+        self.assertEqual(8, self.testee.get_counts()["byte_writes"])
+        self.assertEqual(1, self.testee.get_counts()["bitmap_uploads"])
+
+    def test_raw_bytes(self):
+        self.testee.write("\x00\x7e")
+        self.assertEqual([b"\x00\x7e" + b" " * 14, b" " * 16], self.testee.get_bytes())
+        self.assertEqual("██", self.testee.get_lines()[0][:2])
+
+    def test_operation_count(self):
+        self.testee.clear()
+        self.testee.set_cursor(0, 0)
+        self.testee.write("abc")
+        self.testee.store_custom_bitmap(0, GLYPH_BITMAPS[DEGREE_CODE])
+        self.assertEqual(1 + 1 + 3 + 9, self.testee.get_operation_count())
+        self.testee.reset_counts()
+        self.assertEqual(0, self.testee.get_operation_count())
+
+    def test_invalid_operations(self):
+        self.assertRaises(RuntimeError, self.testee.set_cursor, 40, 0)
+        self.assertRaises(RuntimeError, self.testee.set_cursor, 0, 2)
+        self.assertRaises(RuntimeError, self.testee.store_custom_bitmap, 8, GLYPH_BITMAPS[DEGREE_CODE])
+        self.assertRaises(RuntimeError, self.testee.write, "➚")
+
+    def test_backlight(self):
+        self.testee.backlight_on()
+        self.assertTrue(self.testee.is_backlight_on())
+        self.testee.backlight_off()
+        self.assertFalse(self.testee.is_backlight_on())
+
+    def test_show(self):
+        self.testee.write("Outdoor Temp")
+        output = io.StringIO()
+        self.testee.show(output)
+        self.assertEqual("+----------------+\n|Outdoor Temp    |\n|                |\n+----------------+\n",
+                         output.getvalue())
+
+    def test_rendering_cost(self):
+        renderer = LcdRenderer(self.testee, glyph_manager=GlyphManager(self.testee))
+        renderer.render(["Temperature", "25.4°C ➘"])
+        self.assertEqual(["Temperature     ", "25.4°C ➘" + " " * 8], self.testee.get_lines())
+        self.assertEqual({"clears": 0, "cursor_moves": 2, "byte_writes": 32, "bitmap_uploads": 2},
+                         self.testee.get_counts())
+        self.testee.reset_counts()
+        renderer.render(["Temperature", "25.6°C ➚"])
+        self.assertEqual(["Temperature     ", "25.6°C ➚" + " " * 8], self.testee.get_lines())
+        self.assertEqual({"clears": 0, "cursor_moves": 2, "byte_writes": 2, "bitmap_uploads": 1},
+                         self.testee.get_counts())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,413 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import http.server
+import gzip
+import os
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+import urllib.parse
+import zlib
+from fetcher import ClientRawFetcher
+from fetcher import ClientRawFileFetcher
+from fetcher import ClientRawParser
+from fetcher import create_fetcher
+from fetcher import get_sibling_source
+from history import ClientRawHour
+from units import WindDirectionUnit
+from units import WindSpeedUnit
+
+
+class ClientRawRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        self.server.paths.append(self.path)
+        time.sleep(self.server.delay)
+        path = urllib.parse.urlsplit(self.path).path
+        if path in self.server.redirects:
+            self.__send(self.server.redirects[path][0], b"", location=self.server.redirects[path][1])
+        elif path != "/clientraw.txt":
+            self.__send(404, b"")
+        elif self.headers.get("If-None-Match") == self.server.etag:
+            self.__send(304, b"")
+        elif self.server.content_encoding is not None:
+            self.__send(200, self.server.encode(self.server.content), self.server.content_encoding)
+        else:
+            self.__send(200, self.server.content)
+
+    def log_message(self, format, *args):
+        pass
+
+    def __send(self, status, body, content_encoding=None, location=None):
+        self.send_response(status)
+        if content_encoding is not None:
+            self.send_header("Content-Encoding", content_encoding)
+        if location is not None:
+            self.send_header("Location", location)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", "Sun, 18 Oct 2015 10:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestClientRawFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.server = self.__start_server()
+        self.url = "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        clientraw = testee.fetch()
+        testee.close()
+        self.assertTrue(clientraw.is_valid())
+        self.assertEqual(180, clientraw.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_first_fetch_is_unconditional(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        testee.fetch()
+        testee.close()
+        self.assertNotIn("If-None-Match", self.server.requests[0])
+        self.assertNotIn("If-Modified-Since", self.server.requests[0])
+
+    def test_not_modified_reuses_clientraw(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        first = testee.fetch()
+        second = testee.fetch()
+        testee.close()
+        self.assertIs(first, second)
+        self.assertEqual('"1"', self.server.requests[1]["If-None-Match"])
+        self.assertEqual("Sun, 18 Oct 2015 10:00:00 GMT", self.server.requests[1]["If-Modified-Since"])
+
+    def test_unconditional_fetch_sends_no_validators(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        testee.fetch()
+        self.server.content = b"12345 4.3 5.1 270"
+        clientraw = testee.fetch(conditional=False)
+        testee.close()
+        self.assertNotIn("If-None-Match", self.server.requests[1])
+        self.assertNotIn("If-Modified-Since", self.server.requests[1])
+        self.assertEqual(270, clientraw.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_modified_replaces_clientraw(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        first = testee.fetch()
+        self.server.etag = '"2"'
+        self.server.content = b"12345 4.3 5.1 270"
+        second = testee.fetch()
+        testee.close()
+        self.assertIsNot(first, second)
+        self.assertEqual(270, second.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_unchanged_content_without_validators_reuses_clientraw(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        first = testee.fetch()
+        self.server.etag = '"2"'
+        second = testee.fetch()
+        testee.close()
+        self.assertIs(first, second)
+
+    def test_connection_kept_alive(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        testee.fetch()
+        testee.fetch()
+        testee.fetch()
+        testee.close()
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(1, self.server.connections)
+
+    def test_not_found(self):
+        testee = ClientRawFetcher(self.url + "/missing.txt")
+        self.assertIsNone(testee.fetch())
+        testee.close()
+
+    def test_unavailable(self):
+        self.server.shutdown()
+        self.server.server_close()
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        self.assertIsNone(testee.fetch())
+    def test_accepts_compression(self):
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        testee.fetch()
+        testee.close()
+        self.assertEqual("gzip, deflate", self.server.requests[0]["Accept-Encoding"])
+
+    def test_gzip(self):
+        self.__assert_decompressed("gzip", gzip.compress)
+
+    def test_zlib_deflate(self):
+        self.__assert_decompressed("deflate", zlib.compress)
+
+    def test_raw_deflate(self):
+        def compress(data):
+            compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+            return compressor.compress(data) + compressor.flush()
+        self.__assert_decompressed("deflate", compress)
+
+    def test_large_compressed_content(self):
+        self.server.content = b"12345 " + b"1.0 " * 10000 + b"!!C10.37S142!!"
+        self.__assert_decompressed("gzip", gzip.compress)
+
+    def test_corrupt_compressed_content(self):
+        self.server.content_encoding = "gzip"
+        self.server.encode = lambda data: b"not gzip"
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        self.assertIsNone(testee.fetch())
+
+    def test_unsupported_content_encoding(self):
+        self.server.content_encoding = "br"
+        self.server.encode = lambda data: data
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        self.assertIsNone(testee.fetch())
+
+    def test_read_timeout(self):
+        self.server.delay = 0.5
+        testee = ClientRawFetcher(self.url + "/clientraw.txt", read_timeout_secs=0.05)
+        self.assertIsNone(testee.fetch())
+
+    def test_recovers_after_timeout(self):
+        self.server.delay = 0.5
+        testee = ClientRawFetcher(self.url + "/clientraw.txt", read_timeout_secs=0.05)
+        testee.fetch()
+        self.server.delay = 0
+        self.server.content_encoding = None
+        self.assertTrue(testee.fetch().is_valid())
+        testee.close()
+    def test_follows_permanent_redirect(self):
+        self.server.redirects["/moved.txt"] = (301, "/clientraw.txt")
+        testee = ClientRawFetcher(self.url + "/moved.txt")
+        self.assertTrue(testee.fetch().is_valid())
+        self.assertTrue(testee.fetch().is_valid())
+        testee.close()
+        self.assertEqual(["/moved.txt", "/clientraw.txt", "/clientraw.txt"], self.server.paths)
+        self.assertEqual(1, self.server.connections)
+
+    def test_follows_temporary_redirect_every_time(self):
+        self.server.redirects["/latest.txt"] = (302, "/clientraw.txt")
+        testee = ClientRawFetcher(self.url + "/latest.txt")
+        self.assertTrue(testee.fetch().is_valid())
+        self.assertTrue(testee.fetch().is_valid())
+        testee.close()
+        self.assertEqual(["/latest.txt", "/clientraw.txt", "/latest.txt", "/clientraw.txt"], self.server.paths)
+
+    def test_redirect_to_another_host_reconnects(self):
+        other_server = self.__start_server()
+        other_server.content = b"12345 4.3 5.1 270"
+        self.server.redirects["/moved.txt"] = (307, "http://127.0.0.1:" + str(other_server.server_address[1]) +
+                                               "/clientraw.txt")
+        testee = ClientRawFetcher(self.url + "/moved.txt")
+        clientraw = testee.fetch()
+        testee.close()
+        other_server.shutdown()
+        other_server.server_close()
+        self.assertEqual(270, clientraw.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+        self.assertEqual(1, other_server.connections)
+
+    def test_redirect_loop(self):
+        self.server.redirects["/loop.txt"] = (302, "/loop.txt")
+        testee = ClientRawFetcher(self.url + "/loop.txt")
+        self.assertIsNone(testee.fetch())
+        testee.close()
+        self.assertEqual(ClientRawFetcher.MAXIMUM_REDIRECTS + 1, len(self.server.paths))
+
+    def test_http_proxy(self):
+        with unittest.mock.patch.dict(os.environ, {"http_proxy": "http://user:secret@" + self.url[7:]}, clear=True):
+            testee = ClientRawFetcher("http://weather.example/clientraw.txt")
+            clientraw = testee.fetch()
+            testee.close()
+        self.assertTrue(clientraw.is_valid())
+        self.assertEqual(["http://weather.example/clientraw.txt"], self.server.paths)
+        self.assertEqual("Basic dXNlcjpzZWNyZXQ=", self.server.requests[0]["Proxy-Authorization"])
+
+    def test_no_proxy(self):
+        with unittest.mock.patch.dict(os.environ, {"http_proxy": "http://proxy.invalid:3128",
+                                                   "no_proxy": "127.0.0.1"}, clear=True):
+            testee = ClientRawFetcher(self.url + "/clientraw.txt")
+            self.assertTrue(testee.fetch().is_valid())
+            testee.close()
+
+    def __start_server(self):
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ClientRawRequestHandler)
+        server.connections = 0
+        server.requests = []
+        server.paths = []
+        server.redirects = {}
+        server.etag = '"1"'
+        server.content = b"12345 4.3 5.1 180"
+        server.delay = 0
+        server.content_encoding = None
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        return server
+
+    def __assert_decompressed(self, content_encoding, compress):
+        self.server.content_encoding = content_encoding
+        self.server.encode = compress
+        testee = ClientRawFetcher(self.url + "/clientraw.txt")
+        clientraw = testee.fetch()
+        self.server.etag = '"2"'
+        clientraw_over_same_connection = testee.fetch()
+        testee.close()
+        self.assertTrue(clientraw.is_valid())
+        self.assertEqual(float(self.server.content.split(b" ")[1]),
+                         clientraw.get_average_wind_speed().get_value(WindSpeedUnit.KNOTS))
+        self.assertTrue(clientraw_over_same_connection.is_valid())
+        self.assertEqual(1, self.server.connections)
+
+
+class TestClientRawFileFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "clientraw.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fetch(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        clientraw = ClientRawFileFetcher(self.path).fetch()
+        self.assertTrue(clientraw.is_valid())
+        self.assertEqual(180, clientraw.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_unchanged_file_reuses_clientraw(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        testee = ClientRawFileFetcher(self.path)
+        self.assertIs(testee.fetch(), testee.fetch())
+
+    def test_changed_file_replaces_clientraw(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        testee = ClientRawFileFetcher(self.path)
+        first = testee.fetch()
+        self.__write(b"12345 4.3 5.1 270", 1060)
+        second = testee.fetch()
+        self.assertIsNot(first, second)
+        self.assertEqual(270, second.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_rewritten_unchanged_file_reuses_clientraw(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        testee = ClientRawFileFetcher(self.path)
+        first = testee.fetch()
+        self.__write(b"12345 4.3 5.1 180", 1060)
+        self.assertIs(first, testee.fetch())
+
+    def test_file_emptied_while_read_is_empty(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        with unittest.mock.patch("mmap.mmap", side_effect=ValueError("cannot mmap an empty file")):
+            clientraw = ClientRawFileFetcher(self.path).fetch()
+        self.assertTrue(clientraw.is_empty())
+
+    def test_unconditional_fetch_rereads_file(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        testee = ClientRawFileFetcher(self.path)
+        first = testee.fetch()
+        self.__write(b"12345 4.3 5.1 270", 1000)
+        self.assertIs(first, testee.fetch())
+        second = testee.fetch(conditional=False)
+        self.assertEqual(270, second.get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_empty_file(self):
+        self.__write(b"", 1000)
+        self.assertTrue(ClientRawFileFetcher(self.path).fetch().is_empty())
+
+    def test_missing_file(self):
+        self.assertIsNone(ClientRawFileFetcher(self.path).fetch())
+
+    def test_file_removed(self):
+        self.__write(b"12345 4.3 5.1 180", 1000)
+        testee = ClientRawFileFetcher(self.path)
+        testee.fetch()
+        os.remove(self.path)
+        self.assertIsNone(testee.fetch())
+
+    def __write(self, content, mtime):
+        with open(self.path, "wb") as clientraw_file:
+            clientraw_file.write(content)
+        os.utime(self.path, (mtime, mtime))
+
+
+class TestClientRawParser(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertTrue(ClientRawParser().parse(b"12345").is_valid())
+
+    def test_identical_content_reuses_clientraw(self):
+        testee = ClientRawParser()
+        self.assertIs(testee.parse(b"12345 4.3"), testee.parse(b"12345 4.3"))
+
+    def test_different_content_parsed(self):
+        testee = ClientRawParser()
+        first = testee.parse(b"12345 4.3")
+        second = testee.parse(b"12345 4.4")
+        self.assertIsNot(first, second)
+        self.assertEqual(4.4, second.get_average_wind_speed().get_value(WindSpeedUnit.KNOTS))
+
+    def test_reverting_content_parsed(self):
+        testee = ClientRawParser()
+        first = testee.parse(b"12345 4.3")
+        testee.parse(b"12345 4.4")
+        self.assertIsNot(first, testee.parse(b"12345 4.3"))
+
+
+class TestCreateFetcher(unittest.TestCase):
+
+    def test_http(self):
+        self.assertIsInstance(create_fetcher("http://waynedgrant.com/clientraw.txt"), ClientRawFetcher)
+
+    def test_https(self):
+        self.assertIsInstance(create_fetcher("https://waynedgrant.com/clientraw.txt", 1, 2), ClientRawFetcher)
+
+    def test_file_url(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clientraw.txt")
+            with open(path, "wb") as clientraw_file:
+                clientraw_file.write(b"12345")
+            testee = create_fetcher("file://" + path)
+            self.assertIsInstance(testee, ClientRawFileFetcher)
+            self.assertTrue(testee.fetch().is_valid())
+
+    def test_path(self):
+        self.assertIsInstance(create_fetcher("/var/www/clientraw.txt"), ClientRawFileFetcher)
+
+    def test_history_class(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clientrawhour.txt")
+            with open(path, "wb") as clientraw_file:
+                clientraw_file.write(b"12345 4.3")
+            self.assertIsInstance(create_fetcher(path, clientraw_class=ClientRawHour).fetch(), ClientRawHour)
+
+
+class TestGetSiblingSource(unittest.TestCase):
+
+    def test_http(self):
+        self.assertEqual("http://waynedgrant.com/weather/clientrawhour.txt",
+                         get_sibling_source("http://waynedgrant.com/weather/clientraw.txt", "clientrawhour.txt"))
+
+    def test_http_query(self):
+        self.assertEqual("https://waynedgrant.com/clientrawdaily.txt?nocache=1",
+                         get_sibling_source("https://waynedgrant.com/clientraw.txt?nocache=1", "clientrawdaily.txt"))
+
+    def test_file_url(self):
+        self.assertEqual("file:///var/www/clientrawextra.txt",
+                         get_sibling_source("file:///var/www/clientraw.txt", "clientrawextra.txt"))
+
+    def test_path(self):
+        self.assertEqual(os.path.join("/var/www", "clientrawextra.txt"),
+                         get_sibling_source("/var/www/clientraw.txt", "clientrawextra.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,10 @@ class TestForecastFormatter(unittest.TestCase):
         testee = ForecastFormatter(None)
         self.assertEqual("-----", testee.format())
 
+    def test_forecast_encoded_for_lcd(self):
+        self.assertEqual(b"Sunny", ForecastFormatter("Sunny").format_lcd())
+        self.assertEqual(b"-----", ForecastFormatter(None).format_lcd())
+
     def test_non_none_forecast(self):
         testee = ForecastFormatter("Clear Night")
         self.assertEqual("Clear Night", testee.format())
@@ -165,6 +169,12 @@ class TestTemperatureFormatter(unittest.TestCase):
         testee = TemperatureFormatter(Temperature(-9.072))  # == 15.6704°F
         self.assertEqual("15.7°F", testee.format(TemperatureUnit.FAHRENHEIT))
 
+    def test_temperature_encoded_for_lcd(self):
+        testee = TemperatureFormatter(Temperature(15.66))
+        self.assertEqual(b"15.7\x00C", testee.format_lcd(TemperatureUnit.CELSIUS))
+        testee = TemperatureFormatter(None)
+        self.assertEqual(b"--.-\x00F", testee.format_lcd(TemperatureUnit.FAHRENHEIT))
+
 
 class TestTimeFormatter(unittest.TestCase):
 
@@ -199,6 +209,12 @@ class TestTrendFormatter(unittest.TestCase):
         testee = TrendFormatter(Trend.FALLING)
         self.assertEqual("➘", testee.format())
 
+    def test_trends_encoded_for_lcd(self):
+        self.assertEqual(b"\x01", TrendFormatter(Trend.RISING).format_lcd())
+        self.assertEqual(b"\x02", TrendFormatter(Trend.FALLING).format_lcd())
+        self.assertEqual(b"\x03", TrendFormatter(Trend.STEADY).format_lcd())
+        self.assertEqual(b"-", TrendFormatter(None).format_lcd())
+
 
 class TestUvIndexFormatter(unittest.TestCase):
 
@@ -249,6 +265,11 @@ class TestWindDirectionFormatter(unittest.TestCase):
         testee = WindDirectionFormatter(WindDirection(338))
         self.assertEqual("NNW", testee.format(WindDirectionUnit.CARDINAL_DIRECTION))
 
+    def test_wind_direction_encoded_for_lcd(self):
+        testee = WindDirectionFormatter(WindDirection(338))
+        self.assertEqual(b"338\x00", testee.format_lcd(WindDirectionUnit.COMPASS_DEGREES))
+        self.assertEqual(b"NNW", testee.format_lcd(WindDirectionUnit.CARDINAL_DIRECTION))
+
 
 class TestWindSpeedFormatter(unittest.TestCase):
 
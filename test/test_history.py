@@ -0,0 +1,88 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import unittest
+from history import ClientRawDaily
+from history import ClientRawExtra
+from history import ClientRawHour
+from units import PressureUnit
+from units import RainfallUnit
+from units import TemperatureUnit
+from units import WindDirectionUnit
+from units import WindSpeedUnit
+
+
+def create_history(history_class, values, total_fields):
+    fields = ["12345"] + values + ["0"] * (total_fields - len(values) - 1) + ["!!C10.37S142!!"]
+    return history_class(" ".join(fields))
+
+
+class TestClientRawExtra(unittest.TestCase):
+
+    def test_hourly_series(self):
+        testee = create_history(ClientRawExtra, [str(value) for value in range(0, 20)] +
+                                [str(value) for value in range(-10, 10)], 41)
+        self.assertTrue(testee.is_valid())
+        self.assertTrue(testee.is_complete())
+        speeds = testee.get_hourly_average_wind_speeds()
+        self.assertEqual(20, len(speeds))
+        self.assertEqual(19.0, speeds[19].get_value(WindSpeedUnit.KNOTS))
+        temperatures = testee.get_hourly_outdoor_temperatures()
+        self.assertEqual(20, len(temperatures))
+        self.assertEqual(-10.0, temperatures[0].get_value(TemperatureUnit.CELSIUS))
+        self.assertEqual(9.0, temperatures[19].get_value(TemperatureUnit.CELSIUS))
+
+
+class TestClientRawDaily(unittest.TestCase):
+
+    def test_daily_series(self):
+        testee = create_history(ClientRawDaily, ["21.5"] * 31 + ["8.2"] * 31 + ["2.4"] + ["-"] * 30, 94)
+        self.assertEqual(21.5, testee.get_daily_maximum_outdoor_temperatures()[30].get_value(TemperatureUnit.CELSIUS))
+        self.assertEqual(8.2, testee.get_daily_minimum_outdoor_temperatures()[0].get_value(TemperatureUnit.CELSIUS))
+        rainfalls = testee.get_daily_rainfalls()
+        self.assertEqual(2.4, rainfalls[0].get_value(RainfallUnit.MILLIMETRES))
+        self.assertIsNone(rainfalls[1])
+
+    def test_truncated(self):
+        testee = ClientRawDaily("12345 21.5 22.0")
+        self.assertTrue(testee.is_valid())
+        self.assertFalse(testee.is_complete())
+        self.assertEqual(2, len(testee.get_daily_maximum_outdoor_temperatures()))
+        self.assertEqual([], testee.get_daily_minimum_outdoor_temperatures())
+
+
+class TestClientRawHour(unittest.TestCase):
+
+    def setUp(self):
+        self.testee = create_history(ClientRawHour, ["4.3"] * 60 + ["7.2"] * 60 + ["270"] * 60 + ["15.2"] * 60 +
+                                     ["85"] * 60 + ["1012.5"] * 60 + ["1.2"] * 60, 421)
+
+    def test_wind(self):
+        self.assertEqual(60, len(self.testee.get_average_wind_speeds()))
+        self.assertEqual(4.3, self.testee.get_average_wind_speeds()[0].get_value(WindSpeedUnit.KNOTS))
+        self.assertEqual(7.2, self.testee.get_gust_speeds()[59].get_value(WindSpeedUnit.KNOTS))
+        self.assertEqual(270, self.testee.get_wind_directions()[30].get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_temperature_and_humidity(self):
+        self.assertEqual(15.2, self.testee.get_outdoor_temperatures()[0].get_value(TemperatureUnit.CELSIUS))
+        self.assertEqual([85] * 60, self.testee.get_outdoor_humidities())
+
+    def test_pressure_and_rainfall(self):
+        self.assertEqual(1012.5, self.testee.get_surface_pressures()[0].get_value(PressureUnit.HECTOPASCALS))
+        self.assertEqual(1.2, self.testee.get_daily_rainfalls()[59].get_value(RainfallUnit.MILLIMETRES))
+
+    def test_series_parsed_once(self):
+        self.assertIs(self.testee.get_outdoor_temperatures(), self.testee.get_outdoor_temperatures())
+
+    def test_get_series(self):
+        self.assertEqual([ClientRawHour.AVERAGE_WIND_SPEED_KNOTS, ClientRawHour.GUST_SPEED_KNOTS,
+                          ClientRawHour.WIND_DIRECTION_COMPASS_DEGREES, ClientRawHour.OUTDOOR_TEMPERATURE_CELSIUS,
+                          ClientRawHour.OUTDOOR_HUMIDITY, ClientRawHour.SURFACE_PRESSURE_HECTOPASCALS,
+                          ClientRawHour.DAILY_RAINFALL_MILLIMETRES], ClientRawHour.get_series())
+
+    def test_invalid(self):
+        self.assertFalse(ClientRawHour("54321 4.3").is_valid())
+        self.assertTrue(ClientRawHour("").is_empty())
+
+if __name__ == '__main__':
+    unittest.main()
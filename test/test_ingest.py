@@ -0,0 +1,141 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from ingest import ClientRawIngestServer
+from ingest import MAXIMUM_PAYLOAD_SIZE
+from ingest import is_ingest_address
+from ingest import send_clientraw
+from units import WindDirectionUnit
+
+
+class TestClientRawIngestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        self.testee = None
+
+    def tearDown(self):
+        if self.testee is not None:
+            self.testee.stop()
+
+    def test_tcp_push(self):
+        self.__start("tcp://127.0.0.1:0")
+        self.assertTrue(send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180"))
+        self.assertEqual(1, len(self.received))
+        self.assertIs(self.received[0], self.testee.get_clientraw())
+        self.assertEqual(180, self.received[0].get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_unix_push(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.__start("unix://" + os.path.join(directory, "wdlive.sock"))
+            self.assertTrue(send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180"))
+            self.testee.stop()
+            self.testee = None
+            self.assertFalse(os.path.exists(os.path.join(directory, "wdlive.sock")))
+        self.assertEqual(1, len(self.received))
+
+    def test_stale_unix_socket_replaced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "wdlive.sock")
+            stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale_socket.bind(path)
+            stale_socket.close()
+            self.__start("unix://" + path)
+            self.assertTrue(send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180"))
+            self.testee.stop()
+            self.testee = None
+
+    def test_existing_file_not_replaced_by_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "clientraw.txt")
+            with open(path, "wb") as clientraw_file:
+                clientraw_file.write(b"12345 4.3 5.1 180")
+            self.assertRaises(RuntimeError, ClientRawIngestServer, "unix://" + path, self.received.append)
+            with open(path, "rb") as clientraw_file:
+                self.assertEqual(b"12345 4.3 5.1 180", clientraw_file.read())
+
+    def test_latest_push_replaces_previous(self):
+        self.__start("tcp://127.0.0.1:0")
+        send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180")
+        send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 270")
+        self.assertEqual(270, self.testee.get_clientraw().get_wind_direction().get_value(
+            WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_identical_push_not_redisplayed(self):
+        self.__start("tcp://127.0.0.1:0")
+        self.assertTrue(send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180"))
+        self.assertTrue(send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180"))
+        self.assertEqual(1, len(self.received))
+
+    def test_overlapping_pushes_taken_in_turn(self):
+        first_received = threading.Event()
+        release_first = threading.Event()
+
+        def listener(clientraw):
+            self.received.append(clientraw)
+            if len(self.received) == 1:
+                first_received.set()
+                release_first.wait(5)
+
+        self.testee = ClientRawIngestServer("tcp://127.0.0.1:0", listener)
+        self.testee.start()
+        first = threading.Thread(target=self.testee.receive, args=(b"12345 4.3 5.1 180",))
+        first.start()
+        first_received.wait(5)
+        second = threading.Thread(target=self.testee.receive, args=(b"12345 4.3 5.1 270",))
+        second.start()
+        second.join(0.2)
+        self.assertEqual(1, len(self.received))
+        release_first.set()
+        first.join()
+        second.join()
+        self.assertEqual(2, len(self.received))
+        self.assertIs(self.received[1], self.testee.get_clientraw())
+        self.assertEqual(270, self.received[1].get_wind_direction().get_value(WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_invalid_push_rejected(self):
+        self.__start("tcp://127.0.0.1:0")
+        send_clientraw(self.testee.get_address(), b"12345 4.3 5.1 180")
+        self.assertFalse(send_clientraw(self.testee.get_address(), b"54321 4.3 5.1 270"))
+        self.assertFalse(send_clientraw(self.testee.get_address(), b""))
+        self.assertFalse(send_clientraw(self.testee.get_address(), b"\xff\xfe"))
+        self.assertEqual(1, len(self.received))
+        self.assertEqual(180, self.testee.get_clientraw().get_wind_direction().get_value(
+            WindDirectionUnit.COMPASS_DEGREES))
+
+    def test_oversized_push_rejected(self):
+        self.__start("tcp://127.0.0.1:0")
+        self.assertFalse(send_clientraw(self.testee.get_address(), b"12345 " + b"-" * MAXIMUM_PAYLOAD_SIZE))
+        self.assertEqual(0, len(self.received))
+
+    def test_never_stale(self):
+        self.__start("tcp://127.0.0.1:0")
+        self.assertFalse(self.testee.is_stale())
+        self.assertIsNone(self.testee.get_clientraw())
+
+    def test_unsupported_address(self):
+        self.assertRaises(RuntimeError, ClientRawIngestServer, "http://127.0.0.1:0", self.received.append)
+
+    def __start(self, address):
+        self.testee = ClientRawIngestServer(address, self.received.append)
+        self.testee.start()
+
+
+class TestIsIngestAddress(unittest.TestCase):
+
+    def test_ingest_addresses(self):
+        self.assertTrue(is_ingest_address("tcp://0.0.0.0:5555"))
+        self.assertTrue(is_ingest_address("unix:///tmp/wdlive.sock"))
+
+    def test_fetch_sources(self):
+        self.assertFalse(is_ingest_address("http://waynedgrant.com/clientraw.txt"))
+        self.assertFalse(is_ingest_address("file:///tmp/clientraw.txt"))
+        self.assertFalse(is_ingest_address("/tmp/clientraw.txt"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import unittest
+from lcd import GlyphManager
+from lcd import LcdRenderer
+from lcd import encode
+
+
+class RecordingLcd:
+
+    def __init__(self):
+        self.calls = []
+
+    def clear(self):
+        self.calls.append(("clear",))
+
+    def set_cursor(self, column, row):
+        self.calls.append(("set_cursor", column, row))
+
+    def write(self, text):
+        self.calls.append(("write", text))
+
+    def store_custom_bitmap(self, slot, bitmap):
+        self.calls.append(("store_custom_bitmap", slot, bitmap))
+
+
+class TestEncode(unittest.TestCase):
+
+    def test_ascii(self):
+        self.assertEqual(b"1017.7 hPa", encode("1017.7 hPa"))
+
+    def test_glyphs(self):
+        self.assertEqual(b"15.2\x00C \x01 \x02 \x03", encode("15.2°C ➚ ➘ ➙"))
+
+    def test_unknown_characters(self):
+        self.assertEqual(b"caf?", encode("café"))
+
+
+class TestLcdRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.lcd = RecordingLcd()
+        self.testee = LcdRenderer(self.lcd)
+
+    def test_first_render_writes_every_cell(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.assertEqual([("set_cursor", 0, 0), ("write", "Outdoor Temp    "),
+                          ("set_cursor", 0, 1), ("write", "15.2\x00C" + " " * 10)], self.lcd.calls)
+        self.assertEqual([b"Outdoor Temp    ", b"15.2\x00C" + b" " * 10], self.testee.get_lines())
+
+    def test_encoded_lines_sent_as_they_are(self):
+        self.testee.render([b"Outdoor Temp", b"15.2\x00C \x01"])
+        self.assertEqual([("set_cursor", 0, 0), ("write", "Outdoor Temp    "),
+                          ("set_cursor", 0, 1), ("write", "15.2\x00C \x01" + " " * 8)], self.lcd.calls)
+
+    def test_encoded_and_text_lines_equivalent(self):
+        self.testee.render(["15.2°C ➚"])
+        self.lcd.calls = []
+        self.testee.render([b"15.2\x00C \x01"])
+        self.assertEqual([], self.lcd.calls)
+
+    def test_custom_glyph_codes(self):
+        testee = LcdRenderer(self.lcd, {"°": 5})
+        testee.render(["°"])
+        self.assertEqual(b"\x05", testee.get_lines()[0][:1])
+
+    def test_unchanged_render_writes_nothing(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.lcd.calls = []
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.assertEqual([], self.lcd.calls)
+
+    def test_only_changed_cells_written(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.lcd.calls = []
+        self.testee.render(["Outdoor Temp", "15.7°C"])
+        self.assertEqual([("set_cursor", 3, 1), ("write", "7")], self.lcd.calls)
+
+    def test_nearby_changes_written_as_one_run(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.lcd.calls = []
+        self.testee.render(["Outdoor Temp", "16.7°C"])
+        self.assertEqual([("set_cursor", 1, 1), ("write", "6.7")], self.lcd.calls)
+
+    def test_distant_changes_written_separately(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.lcd.calls = []
+        self.testee.render(["Outdoor Temp!", "25.2°C"])
+        self.assertEqual([("set_cursor", 12, 0), ("write", "!"), ("set_cursor", 0, 1), ("write", "2")], self.lcd.calls)
+
+    def test_shorter_line_blanks_old_cells(self):
+        self.testee.render(["CLIENTRAW IS", "UNAVAILABLE"])
+        self.lcd.calls = []
+        self.testee.render(["CLIENTRAW IS", "EMPTY"])
+        self.assertEqual([("set_cursor", 0, 1), ("write", "EMPTY      ")], self.lcd.calls)
+
+    def test_long_line_truncated(self):
+        self.testee.render(["A" * 20])
+        self.assertEqual([b"A" * 16, b" " * 16], self.testee.get_lines())
+
+    def test_invalidate(self):
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.testee.invalidate()
+        self.lcd.calls = []
+        self.testee.render(["Outdoor Temp", "15.2°C"])
+        self.assertEqual(4, len(self.lcd.calls))
+
+    def test_never_clears(self):
+        for lines in (["** PIFACECAD **", "**  WDLIVE   **"], ["UPDATING..."], ["Outdoor Temp", "15.2°C"]):
+            self.testee.render(lines)
+        self.assertNotIn(("clear",), self.lcd.calls)
+
+
+class TestGlyphManager(unittest.TestCase):
+
+    def setUp(self):
+        self.lcd = RecordingLcd()
+        self.bitmaps = {code: "bitmap" + str(code) for code in range(0, 12)}
+        self.testee = GlyphManager(self.lcd, self.bitmaps)
+
+    def __get_uploads(self):
+        return [call for call in self.lcd.calls if call[0] == "store_custom_bitmap"]
+
+    def test_glyphs_uploaded_on_first_use(self):
+        frame = self.testee.translate([b"15.2\x00C", b"\x01"])
+        self.assertEqual([("store_custom_bitmap", 0, "bitmap0"), ("store_custom_bitmap", 1, "bitmap1")],
+                         self.__get_uploads())
+        self.assertEqual([b"15.2\x00C", b"\x01"], frame)
+
+    def test_nothing_uploaded_for_glyphs_already_loaded(self):
+        self.testee.translate([b"\x00\x01"])
+        self.lcd.calls = []
+        self.testee.translate([b"\x01", b"\x00"])
+        self.assertEqual([], self.__get_uploads())
+
+    def test_codes_beyond_slots_translated(self):
+        frame = self.testee.translate([b"A\x0a"])
+        self.assertEqual([b"A\x00"], frame)
+        self.assertEqual({10: 0}, self.testee.get_slots())
+
+    def test_least_recently_used_glyph_evicted(self):
+        self.testee.translate([bytes(range(0, 8))])
+        self.testee.translate([bytes(range(1, 8))])
+        self.lcd.calls = []
+        frame = self.testee.translate([bytes(range(1, 8)) + b"\x08"])
+        self.assertEqual([("store_custom_bitmap", 0, "bitmap8")], self.__get_uploads())
+        self.assertEqual([bytes(range(1, 8)) + b"\x00"], frame)
+
+    def test_glyphs_in_frame_never_evicted(self):
+        self.testee.translate([bytes(range(0, 8))])
+        self.testee.translate([b"\x01\x02\x03\x04\x05\x06\x07"])
+        self.testee.translate([b"\x00"])
+        self.testee.translate([b"\x09\x00"])
+        self.assertEqual(0, self.testee.get_slots()[0])
+        self.assertEqual(1, self.testee.get_slots()[9])
+
+    def test_identical_bitmap_not_reuploaded(self):
+        testee = GlyphManager(self.lcd, {0: "same", 1: "same"}, slots=1)
+        testee.translate([b"\x00"])
+        testee.translate([b"\x01"])
+        self.assertEqual([("store_custom_bitmap", 0, "same")], self.__get_uploads())
+
+    def test_too_many_glyphs(self):
+        self.assertRaises(RuntimeError, self.testee.translate, [bytes(range(0, 9))])
+
+    def test_invalid_glyph_code(self):
+        self.assertRaises(RuntimeError, GlyphManager, self.lcd, {0x20: "bitmap"})
+
+    def test_renderer_writes_slots(self):
+        renderer = LcdRenderer(self.lcd, {"°": 0x0b}, self.testee)
+        renderer.render(["15.2°C"])
+        self.assertIn(("store_custom_bitmap", 0, "bitmap11"), self.lcd.calls)
+        self.assertEqual(b"15.2\x00C", renderer.get_lines()[0][:6])
+
+if __name__ == '__main__':
+    unittest.main()
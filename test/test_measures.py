@@ -1,12 +1,27 @@
 # Copyright 2015 Wayne D Grant (www.waynedgrant.com)
 # Licensed under the MIT License
 
+import array
+import decimal
 import unittest
+from fractions import Fraction
+from measures import Conversion
 from measures import Pressure
 from measures import Rainfall
 from measures import Temperature
 from measures import WindDirection
 from measures import WindSpeed
+from measures import INTERN_CACHE_SIZE
+from measures import MISSING_BEAUFORT_FORCE
+from measures import convert_pressures
+from measures import convert_rainfalls
+from measures import convert_temperatures
+from measures import convert_wind_directions
+from measures import convert_wind_speeds
+from measures import intern_measure
+from measures import numpy
+from measures import round_significant
+from measures import round_significant_exactly
 from units import PressureUnit
 from units import RainfallUnit
 from units import TemperatureUnit
@@ -177,5 +192,132 @@ class TestWindSpeed(unittest.TestCase):
         self.assertEqual(11, WindSpeed(63.4).get_value(WindSpeedUnit.BEAUFORT_SCALE))
         self.assertEqual(12, WindSpeed(63.5).get_value(WindSpeedUnit.BEAUFORT_SCALE))
 
+    def test_memoized(self):
+        testee = WindSpeed(5)
+        self.assertIs(testee.get_value(WindSpeedUnit.MILES_PER_HOUR), testee.get_value(WindSpeedUnit.MILES_PER_HOUR))
+
+
+class TestMeasure(unittest.TestCase):
+
+    def test_slots(self):
+        for measure in (Pressure(1017.7), Rainfall(2.5), Temperature(25.5), WindDirection(270), WindSpeed(5)):
+            self.assertFalse(hasattr(measure, "__dict__"))
+            with self.assertRaises(AttributeError):
+                measure.value = 0
+
+    def test_interned(self):
+        self.assertIs(WindDirection.interned(270), WindDirection.interned(270))
+        self.assertIsNot(WindDirection.interned(270), WindDirection.interned(90))
+        self.assertIsInstance(Temperature.interned(25.5), Temperature)
+        self.assertEqual(77.9, Temperature.interned(25.5).get_value(TemperatureUnit.FAHRENHEIT))
+
+    def test_interned_by_class_and_type(self):
+        self.assertIsNot(Temperature.interned(0), Temperature.interned(0.0))
+        self.assertIsNot(Temperature.interned(5.0), WindSpeed.interned(5.0))
+        self.assertIsInstance(Temperature.interned(0).get_value(TemperatureUnit.CELSIUS), int)
+
+    def test_interned_bounded(self):
+        self.assertEqual(INTERN_CACHE_SIZE, intern_measure.cache_info().maxsize)
+
+
+class TestConversion(unittest.TestCase):
+
+    def test_round_significant(self):
+        self.assertEqual(30.05268, round_significant(30.052681))
+        self.assertEqual(-0.001234568, round_significant(-0.0012345678))
+        self.assertIsNone(round_significant(1.0000005))
+        self.assertEqual(0, round_significant(0))
+
+    def test_round_significant_exactly(self):
+        self.assertEqual(Fraction(1000000, 1000000), round_significant_exactly(Fraction(10000005, 10000000)))
+        self.assertEqual(Fraction(1000002, 1000000), round_significant_exactly(Fraction(10000015, 10000000)))
+        self.assertEqual(Fraction(-5904523, 100000), round_significant_exactly(Fraction(-590452345, 10000000)))
+        self.assertEqual(Fraction(10), round_significant_exactly(Fraction(99999995, 10000000)))
+        self.assertEqual(0, round_significant_exactly(Fraction(0)))
+
+    def test_tie(self):
+        # Floats land the product on the wrong side of the halfway point between 7 digit results
+        self.assertEqual(-59.04524, Conversion(0.02953).convert(-1999.5))
+        self.assertEqual(-5.90157, Conversion(0.02953).convert(-199.85))
+
+    def test_matches_decimal_conversions(self):
+        # Cross-checks against the 7 digit decimal arithmetic the measures originally converted with
+        conversions = [(Fraction(1, 10), 0), (0.02953, 0), (0.750062, 0), (1 / 25.4, 0), (1.8, 32), (0.514444, 0),
+                       (1.852, 0), (1.15078, 0)]
+        values = [hundredths / 100 for hundredths in range(-20000, 20000, 3)] +\
+                 [tenths / 10 for tenths in range(-20000, 20000, 7)] + [0.5e-9, 123456789.5, 1e15]
+        for factor, offset in conversions:
+            testee = Conversion(factor, offset)
+            for value in values:
+                self.assertEqual(convert_with_decimal(value, factor, offset), testee.convert(value), (factor, value))
+
+
+class TestConvertArrays(unittest.TestCase):
+
+    VALUES = [0, 0.5, 3.45, -1999.5, -199.85, 10.4, 55.5, 63.5, 1017.7, 25.5, -50.5, 1e-30, 1e30]
+    COMPASS_DEGREES = [0, 11, 22, 45, 180, 348, 349, 359, 360, -10]
+
+    def test_pressures(self):
+        for pressure_unit in PressureUnit().get_all():
+            self.__assert_matches(convert_pressures, Pressure, pressure_unit, self.VALUES)
+
+    def test_rainfalls(self):
+        for rainfall_unit in RainfallUnit().get_all():
+            self.__assert_matches(convert_rainfalls, Rainfall, rainfall_unit, self.VALUES)
+
+    def test_temperatures(self):
+        for temperature_unit in TemperatureUnit().get_all():
+            self.__assert_matches(convert_temperatures, Temperature, temperature_unit, self.VALUES)
+
+    def test_wind_speeds(self):
+        for wind_speed_unit in WindSpeedUnit().get_all():
+            self.__assert_matches(convert_wind_speeds, WindSpeed, wind_speed_unit,
+                                  self.VALUES[:-1] + [knots / 2 for knots in range(0, 140)])
+
+    def test_wind_directions(self):
+        for wind_direction_unit in WindDirectionUnit().get_all():
+            self.__assert_matches(convert_wind_directions, WindDirection, wind_direction_unit, self.COMPASS_DEGREES)
+
+    def test_array_types(self):
+        self.assertEqual("d", convert_temperatures(array.array("d", [25.5]), TemperatureUnit.FAHRENHEIT).typecode)
+        self.assertEqual("q", convert_wind_speeds(array.array("d", [25.5]), WindSpeedUnit.BEAUFORT_SCALE).typecode)
+        self.assertEqual("q", convert_wind_directions(array.array("q", [180]),
+                                                      WindDirectionUnit.COMPASS_DEGREES).typecode)
+        self.assertEqual(["S"], convert_wind_directions(array.array("q", [180]), WindDirectionUnit.CARDINAL_DIRECTION))
+
+    def test_missing_readings(self):
+        nan = float("nan")
+        forces = convert_wind_speeds(array.array("d", [nan, 7.5]), WindSpeedUnit.BEAUFORT_SCALE)
+        self.assertEqual([MISSING_BEAUFORT_FORCE, 3], list(forces))
+        self.assertEqual([None, "S"], convert_wind_directions(array.array("d", [nan, 180]),
+                                                              WindDirectionUnit.CARDINAL_DIRECTION))
+        if numpy is not None:
+            self.assertEqual([None, 3], convert_wind_speeds(numpy.array([nan, 7.5]),
+                                                            WindSpeedUnit.BEAUFORT_SCALE).tolist())
+            self.assertEqual([None, "S"], convert_wind_directions(numpy.array([nan, 180]),
+                                                                  WindDirectionUnit.CARDINAL_DIRECTION).tolist())
+
+    def test_base_unit_copied(self):
+        celsius = array.array("d", [25.5])
+        self.assertIsNot(celsius, convert_temperatures(celsius, TemperatureUnit.CELSIUS))
+
+    def __assert_matches(self, convert, measure_class, unit, values):
+        expected = [measure_class(value).get_value(unit) for value in values]
+        self.assertEqual(expected, list(convert(array.array("d", values), unit)), unit)
+        if numpy is not None:
+            self.assertEqual(expected, convert(numpy.array(values, dtype=float), unit).tolist(), unit)
+
+
+def convert_with_decimal(value, factor, offset):
+    with decimal.localcontext() as context:
+        context.prec = 7
+        if isinstance(factor, Fraction):
+            converted = decimal.Decimal(value) / factor.denominator
+        else:
+            converted = decimal.Decimal(value) * decimal.Decimal(factor)
+        if offset != 0:
+            converted = converted + offset
+        return float(converted)
+
 if __name__ == '__main__':
     unittest.main()
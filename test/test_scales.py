@@ -0,0 +1,75 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import unittest
+from scales import BEAUFORT_SCALE
+from scales import Scale
+from scales import UV_INDEX_CATEGORIES
+from scales import numpy
+from scales import round_half_down
+from scales import round_half_up
+
+
+class TestRounding(unittest.TestCase):
+
+    def test_round_half_up(self):
+        self.assertEqual(0, round_half_up(0.4))
+        self.assertEqual(1, round_half_up(0.5))
+        self.assertEqual(3, round_half_up(2.5))
+        self.assertEqual(-3, round_half_up(-2.5))
+        self.assertEqual(0, round_half_up(0.49999999999999994))
+
+    def test_round_half_down(self):
+        self.assertEqual(0, round_half_down(0.5))
+        self.assertEqual(1, round_half_down(0.6))
+        self.assertEqual(2, round_half_down(2.5))
+        self.assertEqual(-2, round_half_down(-2.5))
+        self.assertEqual(3, round_half_down(2.5000000000000004))
+
+
+class TestScale(unittest.TestCase):
+
+    def test_classify(self):
+        testee = Scale([10, 20], ["a", "b", "c"], True)
+        self.assertEqual("a", testee.classify(-5))
+        self.assertEqual("a", testee.classify(9.4))
+        self.assertEqual("b", testee.classify(9.5))
+        self.assertEqual("b", testee.classify(19))
+        self.assertEqual("c", testee.classify(20))
+
+    def test_beaufort_scale(self):
+        self.assertEqual(0, BEAUFORT_SCALE.classify(0.4))
+        self.assertEqual(1, BEAUFORT_SCALE.classify(0.5))
+        self.assertEqual(6, BEAUFORT_SCALE.classify(27.4))
+        self.assertEqual(7, BEAUFORT_SCALE.classify(27.5))
+        self.assertEqual(12, BEAUFORT_SCALE.classify(63.5))
+        self.assertEqual(12, BEAUFORT_SCALE.classify(150))
+
+    def test_uv_index_categories(self):
+        self.assertEqual("low", UV_INDEX_CATEGORIES.classify(2.5))
+        self.assertEqual("moderate", UV_INDEX_CATEGORIES.classify(2.6))
+        self.assertEqual("moderate", UV_INDEX_CATEGORIES.classify(5.5))
+        self.assertEqual("high", UV_INDEX_CATEGORIES.classify(5.6))
+        self.assertEqual("very high", UV_INDEX_CATEGORIES.classify(10.5))
+        self.assertEqual("extreme", UV_INDEX_CATEGORIES.classify(10.6))
+
+    def test_classify_all(self):
+        values = [0, 0.5, 2.5, 2.6, 5.5, 5.6, 7.5, 7.6, 10.5, 10.6, 27.5, 63.5, -3]
+        for testee in (BEAUFORT_SCALE, UV_INDEX_CATEGORIES):
+            expected = [testee.classify(value) for value in values]
+            self.assertEqual(expected, testee.classify_all(values))
+            if numpy is not None:
+                self.assertEqual(expected, testee.classify_all(numpy.array(values, dtype=float)).tolist())
+
+    def test_missing_readings(self):
+        nan = float("nan")
+        self.assertIsNone(BEAUFORT_SCALE.classify(nan))
+        self.assertEqual([None, 3, None], BEAUFORT_SCALE.classify_all([nan, 7.5, nan]))
+        if numpy is not None:
+            classified = BEAUFORT_SCALE.classify_all(numpy.array([nan, 7.5, nan]))
+            self.assertEqual([True, False, True], numpy.ma.getmaskarray(classified).tolist())
+            self.assertEqual([None, 3, None], classified.tolist())
+            self.assertEqual([None, "low"], UV_INDEX_CATEGORIES.classify_all(numpy.array([nan, 1.0])).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import unittest
+from clientraw import ClientRaw
+from scheduler import CircuitBreaker
+from scheduler import IntervalScheduler
+from scheduler import PollScheduler
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    # 2015-10-18 10:00:00 UTC
+    START = 1445162400
+
+    def test_default_interval_when_nothing_recorded(self):
+        testee = PollScheduler(60)
+        self.assertEqual(60, testee.get_delay(self.START))
+        self.assertIsNone(testee.get_period())
+
+    def test_default_interval_when_too_few_observations(self):
+        testee = PollScheduler(60)
+        testee.record_fetch(self.__gen_clientraw(10, 0), self.START)
+        testee.record_fetch(self.__gen_clientraw(10, 1), self.START + 60)
+        self.assertEqual(60, testee.get_delay(self.START + 60))
+
+    def test_default_interval_for_invalid_clientraw(self):
+        testee = PollScheduler(60)
+        for i in range(0, 10):
+            testee.record_fetch(None, self.START + i * 60)
+            testee.record_fetch(ClientRaw(""), self.START + i * 60)
+            testee.record_fetch(ClientRaw("54321"), self.START + i * 60)
+        self.assertEqual(60, testee.get_delay(self.START + 600))
+
+    def test_learns_period_and_phase(self):
+        # Station clock is an hour ahead and uploads at 40 seconds past each minute
+        testee = PollScheduler(60)
+        fetches = self.__simulate(testee, period=60, phase=40, duration=1800)
+        self.assertEqual(60, testee.get_period())
+        self.__assert_converged(fetches, period=60, phase=40)
+
+    def test_learns_longer_period(self):
+        testee = PollScheduler(60)
+        fetches = self.__simulate(testee, period=300, phase=15, duration=7200)
+        self.assertEqual(300, testee.get_period())
+        self.__assert_converged(fetches, period=300, phase=15)
+
+    def test_adds_few_polls(self):
+        testee = PollScheduler(60)
+        fetches = self.__simulate(testee, period=60, phase=40, duration=3600)
+        self.assertTrue(len(fetches) <= 66, len(fetches))
+
+    def test_across_midnight(self):
+        testee = PollScheduler(60)
+        start = self.START + 13 * 60 * 60 + 30 * 60
+        fetches = self.__simulate(testee, period=60, phase=30, duration=3600, start=start)
+        self.__assert_converged(fetches, period=60, phase=30)
+
+    def test_relearns_when_station_uploads_later(self):
+        testee = PollScheduler(60)
+        self.__simulate(testee, period=60, phase=10, duration=1800)
+        fetches = self.__simulate(testee, period=60, phase=45, duration=1800, start=self.START + 1800)
+        self.__assert_converged(fetches, period=60, phase=45)
+
+    def test_tolerates_missed_uploads(self):
+        testee = PollScheduler(60)
+        for minute in [0, 1, 2, 4, 5, 6, 8, 9]:
+            testee.record_fetch(self.__gen_clientraw(11, minute), self.START + minute * 60 + 30)
+        self.assertEqual(60, testee.get_period())
+
+    def __simulate(self, testee, period, phase, duration, start=START):
+        fetches = []
+        now = start + 1
+        while now < start + duration:
+            upload = now - ((now - start - phase) % period)
+            station_seconds = (int(upload) + 60 * 60) % (24 * 60 * 60)
+            testee.record_fetch(self.__gen_clientraw(station_seconds // 3600, (station_seconds // 60) % 60), now)
+            fetches.append(now)
+            now += testee.get_delay(now)
+        return fetches
+
+    def __assert_converged(self, fetches, period, phase):
+        for fetch in fetches[-5:]:
+            lateness = (fetch - fetches[0] + 1 - phase) % period
+            self.assertTrue(0 <= lateness <= 3 * PollScheduler.MARGIN_SECS, lateness)
+
+    def __gen_clientraw(self, hour, minute):
+        fields = ["-"] * 31
+        fields[ClientRaw.HEADER] = "12345"
+        fields[ClientRaw.HOUR] = str(hour)
+        fields[ClientRaw.MINUTE] = str(minute)
+        return ClientRaw(' '.join(fields))
+
+
+class TestIntervalScheduler(unittest.TestCase):
+
+    def test_fixed_delay(self):
+        testee = IntervalScheduler(300)
+        testee.record_fetch(ClientRaw("12345"), 1000)
+        self.assertEqual(300, testee.get_delay(1000))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_closed_until_threshold_reached(self):
+        testee = CircuitBreaker(60, 900)
+        self.assertFalse(testee.is_open())
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD - 1):
+            testee.record_failure()
+        self.assertFalse(testee.is_open())
+        testee.record_failure()
+        self.assertTrue(testee.is_open())
+
+    def test_success_closes(self):
+        testee = CircuitBreaker(60, 900)
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD):
+            testee.record_failure()
+        testee.record_success()
+        self.assertFalse(testee.is_open())
+
+    def test_exponential_backoff(self):
+        testee = CircuitBreaker(60, 900, jitter=lambda: 1.0)
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD):
+            testee.record_failure()
+        delays = []
+        for i in range(0, 6):
+            delays.append(testee.get_delay())
+            testee.record_failure()
+        self.assertEqual([60, 120, 240, 480, 900, 900], delays)
+
+    def test_jitter(self):
+        testee = CircuitBreaker(60, 900, jitter=lambda: 0.0)
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD + 1):
+            testee.record_failure()
+        self.assertEqual(60, testee.get_delay())
+
+    def test_jitter_bounds(self):
+        testee = CircuitBreaker(60, 900)
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD):
+            testee.record_failure()
+        for i in range(0, 100):
+            self.assertTrue(30 <= testee.get_delay() <= 60)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import pickle
+import unittest
+from measures import Temperature
+from schema import ClientRawField
+from schema import ClientRawSeries
+from schema import get_fields
+from schema import get_series
+from units import TemperatureUnit
+
+
+class Schema:
+
+    SECOND = ClientRawField(2, int)
+    FIRST = ClientRawField(1, float, Temperature)
+    NOT_A_FIELD = 3
+    LATER = ClientRawSeries(6, 2, int)
+    EARLIER = ClientRawSeries(3, 3, float, Temperature)
+
+
+class TestClientRawField(unittest.TestCase):
+
+    def test_index(self):
+        self.assertEqual(1, Schema.FIRST)
+        self.assertEqual(2, Schema.SECOND + 0)
+        self.assertEqual("FIRST", Schema.FIRST.name)
+
+    def test_parse_value(self):
+        self.assertEqual(42, Schema.SECOND.parse(b"42"))
+        self.assertEqual(42, Schema.SECOND.parse(memoryview(b"42")))
+
+    def test_parse_measure(self):
+        self.assertEqual(25.4, Schema.FIRST.parse(b"25.4").get_value(TemperatureUnit.CELSIUS))
+
+    def test_parse_missing(self):
+        self.assertIsNone(Schema.FIRST.parse(None))
+        self.assertIsNone(Schema.FIRST.parse(b"-"))
+        self.assertIsNone(Schema.FIRST.parse(memoryview(b"-")))
+
+    def test_parse_invalid(self):
+        self.assertIsNone(Schema.FIRST.parse(b"blah"))
+        self.assertIsNone(Schema.SECOND.parse(b"4.2"))
+
+    def test_parse_custom_missing(self):
+        field = ClientRawField(1, float, missing=b"-100")
+        self.assertIsNone(field.parse(b"-100"))
+        self.assertEqual(-99.0, field.parse(b"-99"))
+
+    def test_pickle(self):
+        field = pickle.loads(pickle.dumps(Schema.FIRST))
+        self.assertEqual(Schema.FIRST, field)
+        self.assertEqual("FIRST", field.name)
+        self.assertEqual(25.4, field.parse(b"25.4").get_value(TemperatureUnit.CELSIUS))
+
+    def test_get_fields(self):
+        self.assertEqual([Schema.FIRST, Schema.SECOND], get_fields(Schema))
+
+
+class TestClientRawSeries(unittest.TestCase):
+
+    def test_name(self):
+        self.assertEqual("EARLIER", Schema.EARLIER.name)
+        self.assertEqual(3, Schema.EARLIER.start)
+        self.assertEqual(3, Schema.EARLIER.length)
+
+    def test_parse(self):
+        self.assertEqual([1, None, None], Schema.LATER.parse([b"1", b"-", b"blah"]))
+
+    def test_parse_measure(self):
+        values = Schema.EARLIER.parse([b"25.4", memoryview(b"-1.5")])
+        self.assertEqual([25.4, -1.5], [value.get_value(TemperatureUnit.CELSIUS) for value in values])
+
+    def test_get_series(self):
+        self.assertEqual([Schema.EARLIER, Schema.LATER], get_series(Schema))
+
+if __name__ == '__main__':
+    unittest.main()
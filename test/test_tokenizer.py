@@ -0,0 +1,71 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import unittest
+from tokenizer import ClientRawTokenizer
+
+
+class TestClientRawTokenizer(unittest.TestCase):
+
+    def test_empty(self):
+        testee = ClientRawTokenizer(b"")
+        self.assertFalse(testee.has_field(0))
+        self.assertEqual(0, testee.get_field_count())
+        self.assertIsNone(testee.get_raw_field(0))
+        self.assertIsNone(testee.get_last_raw_field())
+
+    def test_fields(self):
+        testee = ClientRawTokenizer(b"12345 4.3 5.1 180")
+        self.assertEqual(b"12345", testee.get_raw_field(0))
+        self.assertEqual(b"4.3", testee.get_raw_field(1))
+        self.assertEqual(b"5.1", testee.get_raw_field(2))
+        self.assertEqual(b"180", testee.get_raw_field(3))
+        self.assertIsNone(testee.get_raw_field(4))
+        self.assertEqual(4, testee.get_field_count())
+
+    def test_fields_out_of_order(self):
+        testee = ClientRawTokenizer(b"12345 4.3 5.1 180")
+        self.assertEqual(b"5.1", testee.get_raw_field(2))
+        self.assertEqual(b"12345", testee.get_raw_field(0))
+        self.assertEqual(b"180", testee.get_raw_field(3))
+        self.assertEqual(b"4.3", testee.get_raw_field(1))
+
+    def test_str_content(self):
+        testee = ClientRawTokenizer("12345 25.4°")
+        self.assertEqual("25.4°", testee.get_field(1))
+
+    def test_field_decoded(self):
+        testee = ClientRawTokenizer(b"12345 Station\xff")
+        self.assertEqual("12345", testee.get_field(0))
+        self.assertEqual("Station�", testee.get_field(1))
+        self.assertIsNone(testee.get_field(2))
+
+    def test_matches_split(self):
+        for content in ["-", " ", "  ", "a ", " a", "a  b", "12345 1 2 3 !!C10.37S142!!", "12345 1\n2 3\r\n"]:
+            fields = content.split(" ")
+            testee = ClientRawTokenizer(content.encode("UTF-8"))
+            for position in range(0, len(fields) + 2):
+                if position < len(fields):
+                    self.assertEqual(fields[position].encode("UTF-8"), testee.get_raw_field(position), content)
+                else:
+                    self.assertIsNone(testee.get_raw_field(position), content)
+            self.assertEqual(len(fields), testee.get_field_count(), content)
+            self.assertEqual(fields[-1].encode("UTF-8"), testee.get_last_raw_field(), content)
+
+    def test_last_field_without_full_scan(self):
+        testee = ClientRawTokenizer(b"12345 4.3 !!C10.37S142!!")
+        self.assertEqual(b"!!C10.37S142!!", testee.get_last_raw_field())
+
+    def test_raw_fields_are_views(self):
+        testee = ClientRawTokenizer(b"12345 4.3")
+        self.assertIsInstance(testee.get_raw_field(1), memoryview)
+        self.assertEqual(4.3, float(testee.get_raw_field(1)))
+
+    def test_iter_raw_fields(self):
+        testee = ClientRawTokenizer(b"12345 4.3 5.1 180")
+        self.assertEqual([b"4.3", b"5.1"], list(testee.iter_raw_fields(1, 2)))
+        self.assertEqual([b"5.1", b"180"], list(testee.iter_raw_fields(2, 5)))
+        self.assertEqual([], list(testee.iter_raw_fields(4, 2)))
+
+if __name__ == '__main__':
+    unittest.main()
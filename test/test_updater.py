@@ -0,0 +1,289 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import threading
+import unittest
+from clientraw import ClientRaw
+from scheduler import CircuitBreaker
+from updater import ClientRawUpdater
+
+
+class StubFetcher:
+
+    def __init__(self, clientraws):
+        self.clientraws = clientraws
+        self.fetches = 0
+        self.conditionals = []
+
+    def fetch(self, conditional=True):
+        self.fetches += 1
+        self.conditionals.append(conditional)
+        if len(self.clientraws) > 1:
+            return self.clientraws.pop(0)
+        return self.clientraws[0]
+
+
+class StubScheduler:
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.recorded = []
+
+    def record_fetch(self, clientraw, fetch_time):
+        self.recorded.append(clientraw)
+
+    def get_delay(self, now):
+        return self.delay
+
+
+class TestClientRawUpdater(unittest.TestCase):
+
+    def test_no_clientraw_before_first_update(self):
+        testee = self.__create_testee([None])
+        self.assertIsNone(testee.get_clientraw())
+        self.assertFalse(testee.is_stale())
+
+    def test_update_swaps_in_new_clientraw(self):
+        first = ClientRaw("12345")
+        second = ClientRaw("12345")
+        scheduler = StubScheduler(60)
+        notified = []
+        testee = self.__create_testee([first, second], scheduler=scheduler, listener=notified.append)
+
+        testee.update()
+        self.assertIs(first, testee.get_clientraw())
+        testee.update()
+        self.assertIs(second, testee.get_clientraw())
+
+        self.assertEqual([first, second], notified)
+        self.assertEqual([first, second], scheduler.recorded)
+
+    def test_first_update_notifies_unavailable(self):
+        notified = []
+        testee = self.__create_testee([None], listener=notified.append)
+        testee.update()
+        testee.update()
+        self.assertEqual([None], notified)
+
+    def test_unchanged_clientraw_not_notified(self):
+        clientraw = ClientRaw("12345")
+        notified = []
+        testee = self.__create_testee([clientraw], listener=notified.append)
+        testee.update()
+        testee.update()
+        self.assertEqual([clientraw], notified)
+
+    def test_becoming_stale_notified(self):
+        clientraw = ClientRaw("12345")
+        notified = []
+        testee = self.__create_testee([clientraw, None, None, clientraw], listener=notified.append)
+        for i in range(0, 4):
+            testee.update()
+        self.assertEqual([clientraw, clientraw, clientraw], notified)
+
+    def test_listener_sees_new_clientraw_swapped_in(self):
+        testee = None
+        seen = []
+        clientraw = ClientRaw("12345")
+
+        def listener(new_clientraw):
+            seen.append(testee.get_clientraw() is new_clientraw)
+
+        testee = self.__create_testee([clientraw], listener=listener)
+        testee.update()
+        self.assertEqual([True], seen)
+
+    def test_errors_shown_until_first_valid_clientraw(self):
+        empty = ClientRaw("")
+        invalid = ClientRaw("54321")
+        testee = self.__create_testee([None, empty, empty, empty, empty, invalid])
+        testee.update()
+        self.assertIsNone(testee.get_clientraw())
+        testee.update()
+        self.assertIs(empty, testee.get_clientraw())
+        testee.update()
+        self.assertIs(invalid, testee.get_clientraw())
+        self.assertFalse(testee.is_stale())
+
+    def test_retries_empty_clientraw(self):
+        valid = ClientRaw("12345")
+        fetcher = StubFetcher([ClientRaw(""), ClientRaw(""), valid])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        self.assertIs(valid, testee.get_clientraw())
+        self.assertEqual(3, fetcher.fetches)
+
+    def test_retries_invalid_clientraw(self):
+        valid = ClientRaw("12345")
+        fetcher = StubFetcher([ClientRaw("123"), valid])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        self.assertIs(valid, testee.get_clientraw())
+        self.assertEqual(2, fetcher.fetches)
+
+    def test_retries_truncated_clientraw_once_trailer_seen(self):
+        complete = ClientRaw("12345 - !!C10.37S142!!")
+        truncated = ClientRaw("12345 - !!C10")
+        fetcher = StubFetcher([complete, truncated, complete])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        testee.update()
+        self.assertIs(complete, testee.get_clientraw())
+        self.assertEqual(3, fetcher.fetches)
+
+    def test_retries_are_unconditional(self):
+        fetcher = StubFetcher([ClientRaw("12345 - !!C10.37S142!!"), ClientRaw("12345 - !!C10"),
+                               ClientRaw("12345 - !!C10.37S142!!")])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        testee.update()
+        testee.update()
+        self.assertEqual([True, True, False, True], fetcher.conditionals)
+
+    def test_truncated_clientraw_not_served(self):
+        complete = ClientRaw("12345 - !!C10.37S142!!")
+        fetcher = StubFetcher([complete, ClientRaw("12345 - !!C10")])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        testee.update()
+        self.assertIs(complete, testee.get_clientraw())
+        self.assertTrue(testee.is_stale())
+        testee.update()
+        self.assertEqual([True, True, False, False, False, False, False, False, False], fetcher.conditionals)
+
+    def test_does_not_retry_station_without_trailer(self):
+        fetcher = StubFetcher([ClientRaw("12345 -")])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        testee.update()
+        self.assertEqual(2, fetcher.fetches)
+
+    def test_does_not_retry_unavailable(self):
+        fetcher = StubFetcher([None])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        self.assertEqual(1, fetcher.fetches)
+
+    def test_gives_up_retrying(self):
+        empty = ClientRaw("")
+        fetcher = StubFetcher([empty])
+        testee = self.__create_testee(fetcher=fetcher)
+        testee.update()
+        self.assertIs(empty, testee.get_clientraw())
+        self.assertEqual(4, fetcher.fetches)
+
+    def test_last_valid_clientraw_served_while_failing(self):
+        valid = ClientRaw("12345")
+        testee = self.__create_testee([valid, None, ClientRaw("54321")])
+        testee.update()
+        testee.update()
+        self.assertIs(valid, testee.get_clientraw())
+        self.assertTrue(testee.is_stale())
+        stale_since = testee.get_stale_since()
+        testee.update()
+        self.assertIs(valid, testee.get_clientraw())
+        self.assertEqual(stale_since, testee.get_stale_since())
+
+    def test_recovers_from_staleness(self):
+        recovered = ClientRaw("12345")
+        testee = self.__create_testee([ClientRaw("12345"), None, recovered])
+        testee.update()
+        testee.update()
+        testee.update()
+        self.assertIs(recovered, testee.get_clientraw())
+        self.assertFalse(testee.is_stale())
+        self.assertIsNone(testee.get_stale_since())
+
+    def test_backs_off_while_failing(self):
+        testee = self.__create_testee([None], scheduler=StubScheduler(60))
+        for i in range(0, CircuitBreaker.FAILURE_THRESHOLD - 1):
+            testee.update()
+        self.assertEqual(60, testee.get_delay())
+        testee.update()
+        self.assertEqual(120, testee.get_delay())
+        testee.update()
+        self.assertEqual(240, testee.get_delay())
+
+    def test_background_updates(self):
+        updated = threading.Event()
+        clientraws = [ClientRaw("12345") for i in range(0, 3)]
+        notified = []
+
+        def listener(clientraw):
+            notified.append(clientraw)
+            if len(notified) == 3:
+                updated.set()
+
+        testee = self.__create_testee(clientraws[:], scheduler=StubScheduler(0.01), listener=listener)
+        testee.start()
+        self.assertTrue(updated.wait(5))
+        testee.stop()
+        self.assertEqual(clientraws, notified[:3])
+        self.assertIs(clientraws[2], testee.get_clientraw())
+
+    def test_background_updates_survive_errors(self):
+        valid = ClientRaw("12345")
+        recovered = ClientRaw("12345 1")
+        fetcher = StubFetcher([valid, RuntimeError("fetch failed"), recovered])
+        updated = threading.Event()
+        notified = []
+
+        def fetch(conditional=True):
+            clientraw = StubFetcher.fetch(fetcher, conditional)
+            if isinstance(clientraw, Exception):
+                raise clientraw
+            return clientraw
+
+        def listener(clientraw):
+            notified.append(clientraw)
+            if len(notified) == 2:
+                raise OSError("display failed")
+            if len(notified) == 3:
+                updated.set()
+
+        fetcher.fetch = fetch
+        circuit_breaker = CircuitBreaker(0.01, 0.01, jitter=lambda: 1.0)
+        testee = ClientRawUpdater(fetcher, StubScheduler(0.01), circuit_breaker, listener, retry_delays_secs=[])
+        with self.assertLogs("updater") as logs:
+            testee.start()
+            self.assertTrue(updated.wait(5))
+            testee.stop()
+        self.assertEqual(2, len(logs.records))
+        # The render that failed is retried once the next poll clears the stale marker it left
+        self.assertEqual([valid, recovered, recovered], notified[:3])
+        self.assertFalse(testee.is_stale())
+
+    def test_error_waits_normal_interval_until_breaker_opens(self):
+        recovered = ClientRaw("12345")
+        fetcher = StubFetcher([RuntimeError("fetch failed"), recovered])
+        updated = threading.Event()
+
+        def fetch(conditional=True):
+            clientraw = StubFetcher.fetch(fetcher, conditional)
+            if isinstance(clientraw, Exception):
+                raise clientraw
+            return clientraw
+
+        fetcher.fetch = fetch
+        # A backoff from the breaker would wait a quarter of its 60 second base here
+        circuit_breaker = CircuitBreaker(60, 900, jitter=lambda: 1.0)
+        testee = ClientRawUpdater(fetcher, StubScheduler(0.01), circuit_breaker,
+                                  lambda clientraw: updated.set(), retry_delays_secs=[])
+        with self.assertLogs("updater"):
+            testee.start()
+            self.assertTrue(updated.wait(5))
+            testee.stop()
+        self.assertIs(recovered, testee.get_clientraw())
+
+    def __create_testee(self, clientraws=None, fetcher=None, scheduler=None, listener=None):
+        if fetcher is None:
+            fetcher = StubFetcher(clientraws)
+        if scheduler is None:
+            scheduler = StubScheduler(60)
+        if listener is None:
+            listener = lambda clientraw: None
+        circuit_breaker = CircuitBreaker(120, 900, jitter=lambda: 1.0)
+        return ClientRawUpdater(fetcher, scheduler, circuit_breaker, listener, retry_delays_secs=[0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
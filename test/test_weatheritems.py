@@ -3,18 +3,38 @@
 
 import unittest
 from clientraw import ClientRaw
+from history import ClientRawDaily
+from history import ClientRawExtra
+from history import ClientRawHour
+from lcd import encode
 from settings import Settings
 from weatheritems import WeatherItemFactory
 from weatheritems import WeatherItemType
 
 
+def create_history(history_class, values_by_start):
+    fields = ["12345"] + ["-"] * 420
+    for start, values in values_by_start.items():
+        fields[start:start + len(values)] = values
+    return history_class(" ".join(fields))
+
+
+def create_histories():
+    return {ClientRawHour: create_history(ClientRawHour, {181: ["12.1", "-", "14.6", "9.8"]}),
+            ClientRawExtra: create_history(ClientRawExtra, {21: ["-3.2", "5.5", "-"]}),
+            ClientRawDaily: create_history(ClientRawDaily, {1: ["20.1", "22.5", "19.0", "30.0"],
+                                                            32: ["5.0", "3.5", "-", "-10.0"]})}
+
+
 class TestWeatherItems(unittest.TestCase):
 
-    def __get_weather_item(self, weather_item_type):
+    def __get_weather_item(self, weather_item_type, lcd=False, get_history=None, day="-"):
         settings = Settings()
         while settings.get_weather_item_type() != weather_item_type:
             settings.next_weather_item_type()
-        return WeatherItemFactory(ClientRaw(self.__gen_populated_client_raw_str()), settings).get_weather_item()
+        fields = self.__gen_populated_client_raw_str().split(" ")
+        fields[ClientRaw.DAY] = day
+        return WeatherItemFactory(ClientRaw(" ".join(fields)), settings, lcd, get_history).get_weather_item()
 
     def __gen_populated_client_raw_str(self):
         return\
@@ -97,6 +117,48 @@ class TestWeatherItems(unittest.TestCase):
         self.assertEqual("Temperature", weather_item.get_line1())
         self.assertEqual("25.4°C ➘", weather_item.get_line2())
 
+    def test_lcd_lines(self):
+        weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE, lcd=True)
+        self.assertEqual(b"Temperature", weather_item.get_line1())
+        self.assertEqual(b"25.4\x00C \x02", weather_item.get_line2())
+
+    def test_lcd_lines_match_encoded_text(self):
+        for weather_item_type in WeatherItemType().get_all():
+            weather_item = self.__get_weather_item(weather_item_type)
+            lcd_weather_item = self.__get_weather_item(weather_item_type, lcd=True)
+            self.assertEqual(encode(weather_item.get_line1()), lcd_weather_item.get_line1())
+            self.assertEqual(encode(weather_item.get_line2()), lcd_weather_item.get_line2())
+
+    def test_temperature_last_hour(self):
+        weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE_LAST_HOUR,
+                                               get_history=create_histories().get)
+        self.assertEqual("Temp Hi/Lo 1h", weather_item.get_line1())
+        self.assertEqual("14.6°C 9.8°C", weather_item.get_line2())
+
+    def test_temperature_last_20_hours(self):
+        weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE_LAST_20_HOURS,
+                                               get_history=create_histories().get)
+        self.assertEqual("Temp Hi/Lo 20h", weather_item.get_line1())
+        self.assertEqual("5.5°C -3.2°C", weather_item.get_line2())
+
+    def test_temperature_this_month(self):
+        # Only the days of the month so far count
+        weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE_THIS_MONTH,
+                                               get_history=create_histories().get, day="3")
+        self.assertEqual("Temp Hi/Lo Month", weather_item.get_line1())
+        self.assertEqual("22.5°C 3.5°C", weather_item.get_line2())
+
+    def test_temperature_this_month_unknown_day(self):
+        weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE_THIS_MONTH,
+                                               get_history=create_histories().get)
+        self.assertEqual("--.-°C --.-°C", weather_item.get_line2())
+
+    def test_history_unavailable(self):
+        for get_history in [None, lambda history_class: None,
+                            lambda history_class: history_class("54321")]:
+            weather_item = self.__get_weather_item(WeatherItemType.TEMPERATURE_LAST_HOUR, get_history=get_history)
+            self.assertEqual("--.-°C --.-°C", weather_item.get_line2())
+
     def test_uv_index(self):
         weather_item = self.__get_weather_item(WeatherItemType.UV_INDEX)
         self.assertEqual("UV Index", weather_item.get_line1())
@@ -107,5 +169,44 @@ class TestWeatherItems(unittest.TestCase):
         self.assertEqual("Wind Chill", weather_item.get_line1())
         self.assertEqual("23.2°C", weather_item.get_line2())
 
+
+class TestWeatherItemType(unittest.TestCase):
+
+    def test_all_types_declare_fields_or_history(self):
+        for weather_item_type in WeatherItemType().get_all():
+            self.assertTrue(len(WeatherItemType().get_fields(weather_item_type)) > 0 or
+                            WeatherItemType().get_history_class(weather_item_type) is not None)
+
+    def test_history_class(self):
+        self.assertIs(ClientRawHour, WeatherItemType().get_history_class(WeatherItemType.TEMPERATURE_LAST_HOUR))
+        self.assertIs(ClientRawExtra, WeatherItemType().get_history_class(WeatherItemType.TEMPERATURE_LAST_20_HOURS))
+        self.assertIs(ClientRawDaily, WeatherItemType().get_history_class(WeatherItemType.TEMPERATURE_THIS_MONTH))
+        self.assertIsNone(WeatherItemType().get_history_class(WeatherItemType.TEMPERATURE))
+
+    def test_declared_fields_match_rendered_fields(self):
+        base = ["0"] * 150
+        for weather_item_type in WeatherItemType().get_all():
+            settings = Settings()
+            while settings.get_weather_item_type() != weather_item_type:
+                settings.next_weather_item_type()
+            rendered = self.__render(base, settings)
+            fields = WeatherItemType().get_fields(weather_item_type)
+            for position in range(0, len(base)):
+                changed = base[:]
+                changed[position] = "97"
+                is_rendered = self.__render(changed, settings) != rendered
+                self.assertEqual(position in fields, is_rendered, (weather_item_type, position))
+
+    def test_is_changed(self):
+        previous = ClientRaw("12345 4.3 5.1 180 25.4")
+        clientraw = ClientRaw("12345 4.3 5.2 180 25.4")
+        self.assertFalse(WeatherItemType().is_changed(WeatherItemType.AVERAGE_WIND, previous, clientraw))
+        self.assertTrue(WeatherItemType().is_changed(WeatherItemType.GUST_SPEED, previous, clientraw))
+
+    def __render(self, fields, settings):
+        weather_item = WeatherItemFactory(ClientRaw(' '.join(fields)), settings,
+                                          get_history=create_histories().get).get_weather_item()
+        return weather_item.get_line1(), weather_item.get_line2()
+
 if __name__ == '__main__':
     unittest.main()
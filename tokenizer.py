@@ -0,0 +1,62 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+SEPARATOR = b" "
+
+
+class ClientRawTokenizer:
+
+    def __init__(self, content):
+        if isinstance(content, str):
+            content = content.encode("UTF-8")
+        self.__content = content
+        self.__view = memoryview(content)
+        # Start offsets of the fields found so far. Content is only scanned as far as the highest field asked for
+        self.__starts = [0]
+        self.__scanned = len(content) == 0
+        if self.__scanned:
+            self.__starts = []
+
+    def has_field(self, position):
+        self.__scan_to(position)
+        return position < len(self.__starts)
+
+    def get_field_count(self):
+        self.__scan_to(None)
+        return len(self.__starts)
+
+    def get_raw_field(self, position):
+        if not self.has_field(position):
+            return None
+        start = self.__starts[position]
+        if position + 1 < len(self.__starts):
+            return self.__view[start:self.__starts[position + 1] - 1]
+        else:
+            end = self.__content.find(SEPARATOR, start)
+            if end == -1:
+                end = len(self.__content)
+            return self.__view[start:end]
+
+    def iter_raw_fields(self, position, count):
+        # Walks a run of consecutive fields in a single pass, as the history files hold long series of readings
+        self.__scan_to(position + count)
+        for current in range(position, min(position + count, len(self.__starts))):
+            yield self.get_raw_field(current)
+
+    def get_field(self, position):
+        raw_field = self.get_raw_field(position)
+        if raw_field is not None:
+            return str(raw_field, "UTF-8", "replace")
+
+    def get_last_raw_field(self):
+        if len(self.__content) == 0:
+            return None
+        return self.__view[self.__content.rfind(SEPARATOR) + 1:]
+
+    def __scan_to(self, position):
+        while not self.__scanned and (position is None or len(self.__starts) <= position):
+            separator = self.__content.find(SEPARATOR, self.__starts[-1])
+            if separator == -1:
+                self.__scanned = True
+            else:
+                self.__starts.append(separator + 1)
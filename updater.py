@@ -0,0 +1,134 @@
+# Copyright 2015 Wayne D Grant (www.waynedgrant.com)
+# Licensed under the MIT License
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ClientRawUpdater:
+
+    RETRY_DELAYS_SECS = [0.5, 1, 2]
+
+    def __init__(self, fetcher, scheduler, circuit_breaker, listener, retry_delays_secs=RETRY_DELAYS_SECS):
+        self.__fetcher = fetcher
+        self.__scheduler = scheduler
+        self.__circuit_breaker = circuit_breaker
+        self.__listener = listener
+        self.__retry_delays_secs = retry_delays_secs
+        self.__clientraw = None
+        self.__stale_since = None
+        self.__expect_complete = False
+        self.__refetch = False
+        self.__notified = False
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name="clientraw-updater", daemon=True)
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopped.set()
+        self.__thread.join()
+
+    def get_clientraw(self):
+        with self.__lock:
+            return self.__clientraw
+
+    def is_stale(self):
+        with self.__lock:
+            return self.__stale_since is not None
+
+    def get_stale_since(self):
+        with self.__lock:
+            return self.__stale_since
+
+    def update(self):
+        # The next ClientRaw is fetched and parsed off to the side so readers keep seeing the current one until
+        # it is swapped in
+        clientraw = self.__fetch()
+        fetch_time = time.time()
+        with self.__lock:
+            previous = (self.__clientraw, self.__stale_since is not None)
+
+        if self.__is_usable(clientraw) and not self.__is_truncated(clientraw):
+            if clientraw.is_complete():
+                self.__expect_complete = True
+            self.__circuit_breaker.record_success()
+            self.__scheduler.record_fetch(clientraw, fetch_time)
+            with self.__lock:
+                self.__clientraw = clientraw
+                self.__stale_since = None
+        else:
+            self.__circuit_breaker.record_failure()
+            with self.__lock:
+                # Keep serving the last good data while upstream is failing, or sending files cut short, rather
+                # than an error message
+                if self.__is_usable(self.__clientraw):
+                    if self.__stale_since is None:
+                        self.__stale_since = fetch_time
+                else:
+                    self.__clientraw = clientraw
+
+        # Fetchers hand back the same ClientRaw for unchanged content so there is nothing new to display
+        with self.__lock:
+            current = (self.__clientraw, self.__stale_since is not None)
+        if not self.__notified or current[0] is not previous[0] or current[1] != previous[1]:
+            self.__notified = True
+            self.__listener(current[0])
+
+    def get_delay(self):
+        if self.__circuit_breaker.is_open():
+            return self.__circuit_breaker.get_delay()
+        else:
+            return self.__scheduler.get_delay(time.time())
+
+    def __fetch(self):
+        clientraw = self.__fetcher.fetch(conditional=not self.__refetch)
+        # A poll that races Weather Display rewriting the file sees it empty or cut short, so try again shortly
+        # rather than showing that for a whole interval. The retries must not revalidate what was just fetched
+        # since the fixed file can look unmodified to the server
+        for delay in self.__retry_delays_secs:
+            if not self.__is_partial(clientraw) or self.__stopped.wait(delay):
+                break
+            clientraw = self.__fetcher.fetch(conditional=False)
+        self.__refetch = self.__is_partial(clientraw)
+        return clientraw
+
+    def __is_partial(self, clientraw):
+        if clientraw is None:
+            return False
+        elif clientraw.is_empty() or not clientraw.is_valid():
+            return True
+        else:
+            return self.__is_truncated(clientraw)
+
+    def __is_truncated(self, clientraw):
+        # Only stations that have been seen to write the trailer can be judged to have been cut short
+        return self.__expect_complete and not clientraw.is_complete()
+
+    def __is_usable(self, clientraw):
+        return clientraw is not None and clientraw.is_valid()
+
+    def __run(self):
+        while not self.__stopped.is_set():
+            try:
+                self.update()
+                delay = self.get_delay()
+            except Exception:
+                # Nothing may stop the worker, or the display would freeze on old data with no sign of it. Treat
+                # the error like a failed fetch and keep polling
+                logger.exception("clientraw update failed")
+                delay = self.__record_error()
+            self.__stopped.wait(delay)
+
+    def __record_error(self):
+        self.__circuit_breaker.record_failure()
+        with self.__lock:
+            if self.__stale_since is None and self.__is_usable(self.__clientraw):
+                self.__stale_since = time.time()
+        # Below the breaker's threshold an error waits the usual interval rather than polling sooner
+        return self.get_delay()
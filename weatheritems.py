@@ -1,6 +1,7 @@
 # Copyright 2015 Wayne D Grant (www.waynedgrant.com)
 # Licensed under the MIT License
 
+from clientraw import ClientRaw
 from formatters import ForecastFormatter
 from formatters import HumidityFormatter
 from formatters import PressureFormatter
@@ -12,6 +13,15 @@ from formatters import TrendFormatter
 from formatters import WindDirectionFormatter
 from formatters import WindSpeedFormatter
 from formatters import UvIndexFormatter
+from formatters import to_lcd
+from history import ClientRawDaily
+from history import ClientRawExtra
+from history import ClientRawHour
+from units import TemperatureUnit
+
+
+def to_celsius(temperature):
+    return temperature.get_value(TemperatureUnit.CELSIUS)
 
 
 class WeatherItemType:
@@ -32,12 +42,56 @@ class WeatherItemType:
     TEMPERATURE = 13
     UV_INDEX = 14
     WIND_CHILL = 15
+    TEMPERATURE_LAST_HOUR = 16
+    TEMPERATURE_LAST_20_HOURS = 17
+    TEMPERATURE_THIS_MONTH = 18
+
+    FIELDS = {
+        SUMMARY: [ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS, ClientRaw.OUTDOOR_TEMPERATURE_TREND, ClientRaw.OUTDOOR_HUMIDITY,
+                  ClientRaw.OUTDOOR_HUMIDITY_TREND, ClientRaw.SURFACE_PRESSURE_HECTOPASCALS,
+                  ClientRaw.SURFACE_PRESSURE_TREND],
+        AVERAGE_WIND: [ClientRaw.AVERAGE_WIND_SPEED_KNOTS, ClientRaw.WIND_DIRECTION_COMPASS_DEGREES],
+        DAILY_RAINFALL: [ClientRaw.DAILY_RAINFALL_MILLIMETRES],
+        DEW_POINT: [ClientRaw.DEW_POINT_CELSIUS],
+        FORECAST: [ClientRaw.FORECAST],
+        GUST_SPEED: [ClientRaw.GUST_SPEED_KNOTS],
+        HEAT_INDEX: [ClientRaw.HEAT_INDEX_CELSIUS],
+        HUMIDEX: [ClientRaw.HUMIDEX_CELSIUS],
+        HUMIDITY: [ClientRaw.OUTDOOR_HUMIDITY, ClientRaw.OUTDOOR_HUMIDITY_TREND],
+        INDOOR: [ClientRaw.INDOOR_TEMPERATURE_CELSIUS, ClientRaw.INDOOR_HUMIDITY],
+        LAST_UPDATE: [ClientRaw.HOUR, ClientRaw.MINUTE],
+        RAINFALL_RATE: [ClientRaw.RAINFALL_RATE_MILLIMETRES_PER_MINUTE],
+        SURFACE_PRESSURE: [ClientRaw.SURFACE_PRESSURE_HECTOPASCALS, ClientRaw.SURFACE_PRESSURE_TREND],
+        TEMPERATURE: [ClientRaw.OUTDOOR_TEMPERATURE_CELSIUS, ClientRaw.OUTDOOR_TEMPERATURE_TREND],
+        UV_INDEX: [ClientRaw.UV_INDEX],
+        WIND_CHILL: [ClientRaw.WIND_CHILL_CELSIUS],
+        TEMPERATURE_LAST_HOUR: [],
+        TEMPERATURE_LAST_20_HOURS: [],
+        TEMPERATURE_THIS_MONTH: [ClientRaw.DAY]
+    }
+
+    # Items drawn from one of the history files, which are redrawn when that file is updated rather than clientraw
+    HISTORY = {
+        TEMPERATURE_LAST_HOUR: ClientRawHour,
+        TEMPERATURE_LAST_20_HOURS: ClientRawExtra,
+        TEMPERATURE_THIS_MONTH: ClientRawDaily
+    }
 
     def get_all(self):
-        return [self.SUMMARY, self.FORECAST, self.TEMPERATURE, self.SURFACE_PRESSURE, self.HUMIDITY,
+        return [self.SUMMARY, self.FORECAST, self.TEMPERATURE, self.TEMPERATURE_LAST_HOUR,
+                self.TEMPERATURE_LAST_20_HOURS, self.TEMPERATURE_THIS_MONTH, self.SURFACE_PRESSURE, self.HUMIDITY,
                 self.AVERAGE_WIND, self.GUST_SPEED, self.DAILY_RAINFALL, self.RAINFALL_RATE, self.DEW_POINT,
                 self.WIND_CHILL, self.HEAT_INDEX, self.HUMIDEX, self.UV_INDEX, self.INDOOR, self.LAST_UPDATE]
 
+    def get_fields(self, weather_item_type):
+        return self.FIELDS[weather_item_type]
+
+    def get_history_class(self, weather_item_type):
+        return self.HISTORY.get(weather_item_type)
+
+    def is_changed(self, weather_item_type, previous_clientraw, clientraw):
+        return len(clientraw.diff(previous_clientraw, self.get_fields(weather_item_type))) > 0
+
 
 class WeatherItem:
 
@@ -54,8 +108,12 @@ class WeatherItem:
 
 class WeatherItemFactory:
 
-    def __init__(self, clientraw, settings):
+    def __init__(self, clientraw, settings, lcd=False, get_history=None):
+        # With lcd set the lines are bytes built from the formatters' display encoded output, glyph codes and all.
+        # get_history is called with a history file's class and returns its latest contents, or None if there are none
         self.__clientraw = clientraw
+        self.__lcd = lcd
+        self.__get_history = get_history
         self.__weather_item_type = settings.get_weather_item_type()
         self.__pressure_unit = settings.get_pressure_unit()
         self.__rainfall_unit = settings.get_rainfall_unit()
@@ -66,76 +124,136 @@ class WeatherItemFactory:
     def get_weather_item(self):
 
         if self.__weather_item_type is WeatherItemType.SUMMARY:
-            line1 = TemperatureFormatter(self.__clientraw.get_outdoor_temperature()).format(self.__temperature_unit) +\
-                " " + TrendFormatter(self.__clientraw.get_outdoor_temperature_trend()).format() +\
-                " " + HumidityFormatter(self.__clientraw.get_outdoor_humidity()).format() +\
-                " " + TrendFormatter(self.__clientraw.get_outdoor_humidity_trend()).format()
-            line2 = PressureFormatter(self.__clientraw.get_surface_pressure()).format(self.__pressure_unit) +\
-                " " + TrendFormatter(self.__clientraw.get_surface_pressure_trend()).format()
+            line1 = self.__join(
+                self.__format(TemperatureFormatter(self.__clientraw.get_outdoor_temperature()),
+                              self.__temperature_unit),
+                self.__format(TrendFormatter(self.__clientraw.get_outdoor_temperature_trend())),
+                self.__format(HumidityFormatter(self.__clientraw.get_outdoor_humidity())),
+                self.__format(TrendFormatter(self.__clientraw.get_outdoor_humidity_trend())))
+            line2 = self.__join(
+                self.__format(PressureFormatter(self.__clientraw.get_surface_pressure()), self.__pressure_unit),
+                self.__format(TrendFormatter(self.__clientraw.get_surface_pressure_trend())))
 
         elif self.__weather_item_type is WeatherItemType.AVERAGE_WIND:
-            line1 = "Average Wind"
-            line2 = WindSpeedFormatter(self.__clientraw.get_average_wind_speed()).format(self.__wind_speed_unit) +\
-                " " + WindDirectionFormatter(self.__clientraw.get_wind_direction()).format(self.__wind_direction_unit)
+            line1 = self.__text("Average Wind")
+            line2 = self.__join(
+                self.__format(WindSpeedFormatter(self.__clientraw.get_average_wind_speed()), self.__wind_speed_unit),
+                self.__format(WindDirectionFormatter(self.__clientraw.get_wind_direction()),
+                              self.__wind_direction_unit))
 
         elif self.__weather_item_type is WeatherItemType.DAILY_RAINFALL:
-            line1 = "Daily Rainfall"
-            line2 = RainfallFormatter(self.__clientraw.get_daily_rainfall()).format(self.__rainfall_unit)
+            line1 = self.__text("Daily Rainfall")
+            line2 = self.__format(RainfallFormatter(self.__clientraw.get_daily_rainfall()), self.__rainfall_unit)
 
         elif self.__weather_item_type is WeatherItemType.DEW_POINT:
-            line1 = "Dew Point"
-            line2 = TemperatureFormatter(self.__clientraw.get_dew_point()).format(self.__temperature_unit)
+            line1 = self.__text("Dew Point")
+            line2 = self.__format(TemperatureFormatter(self.__clientraw.get_dew_point()), self.__temperature_unit)
 
         elif self.__weather_item_type is WeatherItemType.FORECAST:
-            line1 = "Forecast"
-            line2 = ForecastFormatter(self.__clientraw.get_forecast()).format()
+            line1 = self.__text("Forecast")
+            line2 = self.__format(ForecastFormatter(self.__clientraw.get_forecast()))
 
         elif self.__weather_item_type is WeatherItemType.GUST_SPEED:
-            line1 = "Gust Speed"
-            line2 = WindSpeedFormatter(self.__clientraw.get_gust_speed()).format(self.__wind_speed_unit)
+            line1 = self.__text("Gust Speed")
+            line2 = self.__format(WindSpeedFormatter(self.__clientraw.get_gust_speed()), self.__wind_speed_unit)
 
         elif self.__weather_item_type is WeatherItemType.HEAT_INDEX:
-            line1 = "Heat Index"
-            line2 = TemperatureFormatter(self.__clientraw.get_heat_index()).format(self.__temperature_unit)
+            line1 = self.__text("Heat Index")
+            line2 = self.__format(TemperatureFormatter(self.__clientraw.get_heat_index()), self.__temperature_unit)
 
         elif self.__weather_item_type is WeatherItemType.HUMIDEX:
-            line1 = "Humidex"
-            line2 = TemperatureFormatter(self.__clientraw.get_humidex()).format(self.__temperature_unit)
+            line1 = self.__text("Humidex")
+            line2 = self.__format(TemperatureFormatter(self.__clientraw.get_humidex()), self.__temperature_unit)
 
         elif self.__weather_item_type is WeatherItemType.HUMIDITY:
-            line1 = "Humidity"
-            line2 = HumidityFormatter(self.__clientraw.get_outdoor_humidity()).format() +\
-                " " + TrendFormatter(self.__clientraw.get_outdoor_humidity_trend()).format()
+            line1 = self.__text("Humidity")
+            line2 = self.__join(
+                self.__format(HumidityFormatter(self.__clientraw.get_outdoor_humidity())),
+                self.__format(TrendFormatter(self.__clientraw.get_outdoor_humidity_trend())))
 
         elif self.__weather_item_type is WeatherItemType.INDOOR:
-            line1 = "Indoor"
-            line2 = TemperatureFormatter(self.__clientraw.get_indoor_temperature()).format(self.__temperature_unit) +\
-                " " + HumidityFormatter(self.__clientraw.get_indoor_humidity()).format()
+            line1 = self.__text("Indoor")
+            line2 = self.__join(
+                self.__format(TemperatureFormatter(self.__clientraw.get_indoor_temperature()), self.__temperature_unit),
+                self.__format(HumidityFormatter(self.__clientraw.get_indoor_humidity())))
 
         elif self.__weather_item_type is WeatherItemType.LAST_UPDATE:
-            line1 = "Last Update"
-            line2 = TimeFormatter(self.__clientraw.get_hour(), self.__clientraw.get_minute()).format()
+            line1 = self.__text("Last Update")
+            line2 = self.__format(TimeFormatter(self.__clientraw.get_hour(), self.__clientraw.get_minute()))
 
         elif self.__weather_item_type is WeatherItemType.RAINFALL_RATE:
-            line1 = "Rainfall Rate"
-            line2 = RainfallRateFormatter(self.__clientraw.get_rainfall_rate()).format(self.__rainfall_unit)
+            line1 = self.__text("Rainfall Rate")
+            line2 = self.__format(RainfallRateFormatter(self.__clientraw.get_rainfall_rate()), self.__rainfall_unit)
 
         elif self.__weather_item_type is WeatherItemType.SURFACE_PRESSURE:
-            line1 = "Surface Pressure"
-            line2 = PressureFormatter(self.__clientraw.get_surface_pressure()).format(self.__pressure_unit) +\
-                " " + TrendFormatter(self.__clientraw.get_surface_pressure_trend()).format()
+            line1 = self.__text("Surface Pressure")
+            line2 = self.__join(
+                self.__format(PressureFormatter(self.__clientraw.get_surface_pressure()), self.__pressure_unit),
+                self.__format(TrendFormatter(self.__clientraw.get_surface_pressure_trend())))
 
         elif self.__weather_item_type is WeatherItemType.TEMPERATURE:
-            line1 = "Temperature"
-            line2 = TemperatureFormatter(self.__clientraw.get_outdoor_temperature()).format(self.__temperature_unit) +\
-                " " + TrendFormatter(self.__clientraw.get_outdoor_temperature_trend()).format()
+            line1 = self.__text("Temperature")
+            line2 = self.__join(
+                self.__format(TemperatureFormatter(self.__clientraw.get_outdoor_temperature()),
+                              self.__temperature_unit),
+                self.__format(TrendFormatter(self.__clientraw.get_outdoor_temperature_trend())))
+
+        elif self.__weather_item_type is WeatherItemType.TEMPERATURE_LAST_HOUR:
+            line1 = self.__text("Temp Hi/Lo 1h")
+            history = self.__history(ClientRawHour)
+            temperatures = history.get_outdoor_temperatures() if history is not None else []
+            line2 = self.__temperature_range(temperatures, temperatures)
+
+        elif self.__weather_item_type is WeatherItemType.TEMPERATURE_LAST_20_HOURS:
+            line1 = self.__text("Temp Hi/Lo 20h")
+            history = self.__history(ClientRawExtra)
+            temperatures = history.get_hourly_outdoor_temperatures() if history is not None else []
+            line2 = self.__temperature_range(temperatures, temperatures)
+
+        elif self.__weather_item_type is WeatherItemType.TEMPERATURE_THIS_MONTH:
+            line1 = self.__text("Temp Hi/Lo Month")
+            history = self.__history(ClientRawDaily)
+            # Days still to come this month hold whatever was left from earlier months
+            day = self.__clientraw.get_day()
+            if history is not None and day is not None:
+                maxima = history.get_daily_maximum_outdoor_temperatures()[:day]
+                minima = history.get_daily_minimum_outdoor_temperatures()[:day]
+            else:
+                maxima = minima = []
+            line2 = self.__temperature_range(maxima, minima)
 
         elif self.__weather_item_type is WeatherItemType.UV_INDEX:
-            line1 = "UV Index"
-            line2 = UvIndexFormatter(self.__clientraw.get_uv_index()).format()
+            line1 = self.__text("UV Index")
+            line2 = self.__format(UvIndexFormatter(self.__clientraw.get_uv_index()))
 
         else:
-            line1 = "Wind Chill"
-            line2 = TemperatureFormatter(self.__clientraw.get_wind_chill()).format(self.__temperature_unit)
+            line1 = self.__text("Wind Chill")
+            line2 = self.__format(TemperatureFormatter(self.__clientraw.get_wind_chill()), self.__temperature_unit)
 
         return WeatherItem(line1, line2)
+
+    def __history(self, history_class):
+        if self.__get_history is not None:
+            history = self.__get_history(history_class)
+            if history is not None and history.is_valid():
+                return history
+        return None
+
+    def __temperature_range(self, maxima, minima):
+        high = max([temperature for temperature in maxima if temperature is not None], key=to_celsius, default=None)
+        low = min([temperature for temperature in minima if temperature is not None], key=to_celsius, default=None)
+        return self.__join(self.__format(TemperatureFormatter(high), self.__temperature_unit),
+                           self.__format(TemperatureFormatter(low), self.__temperature_unit))
+
+    def __format(self, formatter, *units):
+        if self.__lcd:
+            return formatter.format_lcd(*units)
+        return formatter.format(*units)
+
+    def __text(self, text):
+        if self.__lcd:
+            return to_lcd(text)
+        return text
+
+    def __join(self, *parts):
+        return self.__text(" ").join(parts)